@@ -0,0 +1,193 @@
+###################################
+# Script:  AdjacencyBenchmark.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Times the adjacency pipeline on the synthetic maps of SyntheticMapGenerator, stage by stage: generating
+#           the features, building first level adjacency, computing SecondLevelAdjacency, and writing both fields back
+#           through a FieldWriterClass writer. Each stage reports wall time, features per second and peak memory. Wall
+#           time is the best of --repeat untraced runs. Peak memory comes from one extra run under tracemalloc, which
+#           would otherwise slow the timed runs. With --workers above 1 the adjacency stage runs in worker processes,
+#           which tracemalloc cannot see. Results are saved as JSON. --compare reads an earlier results file and
+#           reports each stage that got slower by more than --threshold.
+# Inputs:  Command line. --maps and --sizes choose the maps, --output and --compare name JSON files.
+# Outputs:  A table printed to the console, and optionally a JSON results file. Exits with 1 when --compare finds a
+#           regression.
+# Modifications:
+###################################
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import AdjacencyEngineClass
+import FieldWriterClass
+import ParallelAdjacencyClass
+import SecondaryAdjacencyClass
+import SyntheticMapGenerator
+
+lsStages = ["generate", "adjacency", "secondary", "writeback"]
+lsWriters = ["gpkg", "csv"]
+
+
+def _prepareTarget(strDirectory, strWriter, lsOIDs):
+    #An attribute table holding only the OIDs, built outside the timed stage, so the write-back edits existing rows
+    if strWriter == "csv":
+        strTarget = os.path.join(strDirectory, "benchmark.csv")
+        with open(strTarget, "w") as fileCSV:
+            fileCSV.write("OBJECTID\n")
+            fileCSV.writelines(str(intOID) + "\n" for intOID in lsOIDs)
+        return FieldWriterClass.CSVFieldWriter(strTarget)
+    strTarget = os.path.join(strDirectory, "benchmark.gpkg")
+    if os.path.exists(strTarget):
+        os.remove(strTarget)
+    connection = sqlite3.connect(strTarget)
+    with connection:
+        connection.execute('CREATE TABLE "benchmark" ("fid" INTEGER PRIMARY KEY)')
+        connection.executemany('INSERT INTO "benchmark" ("fid") VALUES (?)', ((intOID,) for intOID in lsOIDs))
+    connection.close()
+    return FieldWriterClass.GeoPackageFieldWriter(strTarget, "benchmark")
+
+
+def runPipeline(strMap, intFeatures, args, strDirectory, blnTraceMemory=False):
+    '''Run every stage once on one map. Return {stage: (seconds, peak traced bytes or None)}.'''
+    dictStages = {}
+
+    def startStage():
+        if blnTraceMemory:
+            tracemalloc.start()
+        return time.perf_counter()
+
+    def stopStage(strStage, fltStart):
+        fltSeconds = time.perf_counter() - fltStart
+        intPeakBytes = None
+        if blnTraceMemory:
+            intPeakBytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        dictStages[strStage] = (fltSeconds, intPeakBytes)
+
+    fltStart = startStage()
+    lsFeatures = list(SyntheticMapGenerator.dictGenerators[strMap](intFeatures, args.seed))
+    stopStage("generate", fltStart)
+
+    fltStart = startStage()
+    if args.workers > 1:
+        objParallel = ParallelAdjacencyClass.ParallelAdjacencyClass(intWorkers=args.workers, fltTolerance=args.tolerance)
+        dictAdjacency = objParallel.buildAdjacency(lsFeatures)
+    else:
+        objEngine = AdjacencyEngineClass.AdjacencyEngineClass(fltTolerance=args.tolerance)
+        objEngine.addFeatures(lsFeatures)
+        dictAdjacency = objEngine.buildAdjacency()
+        del objEngine
+    stopStage("adjacency", fltStart)
+    del lsFeatures
+
+    fltStart = startStage()
+    dictFirstLevelAdjacency = dict((intOID, len(lsNeighbors)) for intOID, lsNeighbors in dictAdjacency.items())
+    dictSecondLevelAdjacency = SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictAdjacency).secondLevelAdjacency()
+    stopStage("secondary", fltStart)
+
+    objFieldWriter = _prepareTarget(strDirectory, args.writer, sorted(dictAdjacency))
+    fltStart = startStage()
+    objFieldWriter.ensureFields({"FirstLevelAdjacency": "SHORT", "SecondLevelAdjacency": "SHORT"})
+    intRowsWritten = objFieldWriter.writeFields({"FirstLevelAdjacency": dictFirstLevelAdjacency,
+                                                 "SecondLevelAdjacency": dictSecondLevelAdjacency})
+    stopStage("writeback", fltStart)
+    if intRowsWritten != len(dictAdjacency):
+        raise RuntimeError("Wrote " + str(intRowsWritten) + " of " + str(len(dictAdjacency)) + " rows")
+    return dictStages
+
+
+def runBenchmark(args):
+    '''Run every map and size. Return a list of result dictionaries, one per map, size and stage.'''
+    lsResults = []
+    strDirectory = tempfile.mkdtemp(prefix="adjacency_benchmark_")
+    try:
+        for strMap in args.maps:
+            for intFeatures in args.sizes:
+                lsRuns = [runPipeline(strMap, intFeatures, args, strDirectory) for intRun in range(args.repeat)]
+                dictMemory = {} if args.skip_memory else runPipeline(strMap, intFeatures, args, strDirectory, True)
+                for strStage in lsStages:
+                    fltSeconds = min(dictRun[strStage][0] for dictRun in lsRuns)
+                    dictResult = {"map": strMap, "features": intFeatures, "stage": strStage, "seconds": round(fltSeconds, 6),
+                                  "features_per_second": round(intFeatures / fltSeconds, 1) if fltSeconds else None,
+                                  "peak_bytes": dictMemory[strStage][1] if strStage in dictMemory else None}
+                    lsResults.append(dictResult)
+                    printResult(dictResult)
+    finally:
+        shutil.rmtree(strDirectory, ignore_errors=True)
+    return lsResults
+
+
+def printResult(dictResult):
+    strPeak = "-" if dictResult["peak_bytes"] is None else "{:.1f}".format(dictResult["peak_bytes"] / 1048576.0)
+    print("{:>8} {:>9} {:>10} {:>10.3f} {:>12.0f} {:>9}".format(dictResult["map"], dictResult["features"],
+                                                               dictResult["stage"], dictResult["seconds"],
+                                                               dictResult["features_per_second"] or 0, strPeak))
+
+
+def compareResults(lsPrevious, lsCurrent, fltThreshold):
+    '''Print the change in wall time for each stage found in both runs. Return the number of regressions.'''
+    dictPrevious = dict(((dictResult["map"], dictResult["features"], dictResult["stage"]), dictResult)
+                        for dictResult in lsPrevious)
+    intRegressions = 0
+    print("")
+    print("{:>8} {:>9} {:>10} {:>10} {:>10} {:>8}".format("map", "features", "stage", "before s", "after s", "change"))
+    for dictResult in lsCurrent:
+        dictBefore = dictPrevious.get((dictResult["map"], dictResult["features"], dictResult["stage"]))
+        if dictBefore is None or not dictBefore["seconds"]:
+            continue
+        fltChange = dictResult["seconds"] / dictBefore["seconds"] - 1.0
+        strFlag = ""
+        if fltChange > fltThreshold:
+            strFlag = "  slower"
+            intRegressions += 1
+        print("{:>8} {:>9} {:>10} {:>10.3f} {:>10.3f} {:>+7.0%}{}".format(dictResult["map"], dictResult["features"],
+                                                                         dictResult["stage"], dictBefore["seconds"],
+                                                                         dictResult["seconds"], fltChange, strFlag))
+    return intRegressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the adjacency stages on synthetic polygon maps")
+    parser.add_argument("--maps", nargs="+", default=sorted(SyntheticMapGenerator.dictGenerators),
+                        choices=sorted(SyntheticMapGenerator.dictGenerators))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance", type=float, default=0.0, help="snapping tolerance for the adjacency engine")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for the adjacency stage")
+    parser.add_argument("--writer", default="gpkg", choices=lsWriters)
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per map, keeping the fastest")
+    parser.add_argument("--skip-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="compare against a results file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    print("{:>8} {:>9} {:>10} {:>10} {:>12} {:>9}".format("map", "features", "stage", "seconds", "features/s", "peak MB"))
+    lsResults = runBenchmark(args)
+
+    if args.output:
+        dictSettings = dict((strName, getattr(args, strName)) for strName in ("seed", "tolerance", "workers", "writer", "repeat"))
+        with open(args.output, "w") as fileJSON:
+            json.dump({"created": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "settings": dictSettings, "results": lsResults}, fileJSON, indent=2)
+    if args.compare:
+        with open(args.compare) as fileJSON:
+            dictPrevious = json.load(fileJSON)
+        for strName, value in dictPrevious.get("settings", {}).items():
+            if getattr(args, strName, value) != value:
+                print("Note: " + args.compare + " was run with " + strName + "=" + str(value))
+        if compareResults(dictPrevious["results"], lsResults, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+###################################
+# Script:  AdjacencyEngineClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Builds the shared-edge adjacency graph for an entire polygon layer in a single pass, without arcpy. Every
+#           geometry is read once and each boundary segment is hashed as a normalized edge. Two polygons that hash the
+#           same edge share a line segment. Segments that find no exact partner (T-junctions, unequal vertex spacing)
+#           are bucketed in a uniform grid over their envelopes and tested for collinear overlap. The result is an
+#           adjacency list keyed by OBJECTID, so the primary (first level) adjacency is just the degree of each node.
+#           With a snapping tolerance, vertices are quantized to a grid of that spacing before hashing, so slivers and
+#           digitizing noise below the tolerance still share edges. Only the edge table is kept, never the geometries,
+#           so features can be streamed through addFeatures() from a generator.
+# Inputs:  Polygon geometries as coordinate arrays, WKT strings, GeoJSON geometries/features, or Esri JSON (rings)
+# Outputs:  Dictionary of OBJECTID to sorted list of adjacent OBJECTIDs
+# Modifications: 10/18/2026 - Rings given without a repeated first point are closed when their segments are hashed.
+###################################
+import json
+import math
+import re
+
+#Matches the innermost parenthesized coordinate lists of a WKT polygon/multipolygon, one per ring
+reWKTRing = re.compile(r"\(([^()]+)\)")
+
+
+def _ringsFromWKT(strWKT):
+    lsRings = []
+    if strWKT.strip().upper().endswith("EMPTY"):
+        return lsRings
+    for strRing in reWKTRing.findall(strWKT):
+        lsRing = []
+        for strPoint in strRing.split(","):
+            lsValues = strPoint.split()
+            lsRing.append((float(lsValues[0]), float(lsValues[1])))
+        lsRings.append(lsRing)
+    return lsRings
+
+
+def _ringsFromCoordinates(lsCoordinates):
+    #A ring is a list of points, a polygon is a list of rings, a multipolygon is a list of polygons
+    if not lsCoordinates:
+        return []
+    intDepth = 0
+    objProbe = lsCoordinates
+    while isinstance(objProbe, (list, tuple)):
+        intDepth += 1
+        objProbe = objProbe[0] if objProbe else None
+    if intDepth == 2:
+        return [[(float(point[0]), float(point[1])) for point in lsCoordinates]]
+    if intDepth == 3:
+        return [[(float(point[0]), float(point[1])) for point in ring] for ring in lsCoordinates]
+    if intDepth == 4:
+        return [[(float(point[0]), float(point[1])) for point in ring] for polygon in lsCoordinates for ring in polygon]
+    raise ValueError("Unrecognized coordinate array nesting depth: " + str(intDepth))
+
+
+def ringsFromGeometry(geometry):
+    '''Normalize a polygon geometry in any supported input form to a list of rings of (x, y) tuples'''
+    if isinstance(geometry, str):
+        strGeometry = geometry.lstrip()
+        if strGeometry.startswith("{"):
+            return ringsFromGeometry(json.loads(strGeometry))
+        return _ringsFromWKT(strGeometry)
+    if isinstance(geometry, dict):
+        if geometry.get("type") == "Feature":
+            return ringsFromGeometry(geometry.get("geometry"))
+        if "rings" in geometry:
+            #Esri JSON, as returned by the SHAPE@JSON cursor token
+            return _ringsFromCoordinates(geometry["rings"])
+        if geometry.get("type") in ("Polygon", "MultiPolygon"):
+            return _ringsFromCoordinates(geometry["coordinates"])
+        raise ValueError("Unsupported geometry type: " + str(geometry.get("type")))
+    if geometry is None:
+        return []
+    return _ringsFromCoordinates(geometry)
+
+
+def segmentsFromRings(lsRings):
+    '''Yield every non-degenerate ring segment as a normalized edge, with the lesser endpoint first. A ring whose last
+    point is not its first is closed, so its closing edge is not lost.'''
+    for lsRing in lsRings:
+        intStart = 1
+        if len(lsRing) > 2 and lsRing[0] != lsRing[-1]:
+            intStart = 0
+        for intIndex in range(intStart, len(lsRing)):
+            tupStart = lsRing[intIndex - 1]
+            tupEnd = lsRing[intIndex]
+            if tupStart == tupEnd:
+                continue
+            if tupEnd < tupStart:
+                yield (tupEnd, tupStart)
+            else:
+                yield (tupStart, tupEnd)
+
+
+def quantizeRings(lsRings, fltTolerance):
+    '''Snap every vertex to a grid of fltTolerance spacing, as integer grid coordinates. Vertices closer together than
+    the tolerance collapse onto the same grid point, and the repeated vertices this creates are dropped.'''
+    lsQuantized = []
+    for lsRing in lsRings:
+        lsSnapped = []
+        for fltX, fltY in lsRing:
+            tupPoint = (int(round(fltX / fltTolerance)), int(round(fltY / fltTolerance)))
+            if not lsSnapped or lsSnapped[-1] != tupPoint:
+                lsSnapped.append(tupPoint)
+        lsQuantized.append(lsSnapped)
+    return lsQuantized
+
+
+#Snapped edges are packed into one integer, four 64-bit fields, which takes far less memory than nested tuples
+intPackOffset = 1 << 63
+intPackMask = (1 << 64) - 1
+
+
+def packEdge(tupEdge):
+    (intX1, intY1), (intX2, intY2) = tupEdge
+    return ((((((intX1 + intPackOffset) << 64) | (intY1 + intPackOffset)) << 64) | (intX2 + intPackOffset)) << 64) | (intY2 + intPackOffset)
+
+
+def unpackEdge(intKey):
+    intY2 = (intKey & intPackMask) - intPackOffset
+    intX2 = ((intKey >> 64) & intPackMask) - intPackOffset
+    intY1 = ((intKey >> 128) & intPackMask) - intPackOffset
+    intX1 = (intKey >> 192) - intPackOffset
+    return ((intX1, intY1), (intX2, intY2))
+
+
+def segmentsOverlap(tupSegmentA, tupSegmentB, fltEpsilon=1e-9, fltDistance=0.0):
+    '''Return True when two segments are collinear and overlap along a stretch of positive length. fltDistance widens
+    "collinear" to segments within that perpendicular distance of each other, and "positive" to longer than it.'''
+    (fltAX1, fltAY1), (fltAX2, fltAY2) = tupSegmentA
+    (fltBX1, fltBY1), (fltBX2, fltBY2) = tupSegmentB
+    fltDX = fltAX2 - fltAX1
+    fltDY = fltAY2 - fltAY1
+    fltLengthSquared = fltDX * fltDX + fltDY * fltDY
+    fltLength = math.sqrt(fltLengthSquared)
+    fltTolerance = max(fltEpsilon * max(1.0, fltLength, abs(fltAX1), abs(fltAY1)), fltDistance)
+
+    #Perpendicular distance of each end of B from the line through A, scaled by |A|
+    fltCross1 = fltDX * (fltBY1 - fltAY1) - fltDY * (fltBX1 - fltAX1)
+    fltCross2 = fltDX * (fltBY2 - fltAY1) - fltDY * (fltBX2 - fltAX1)
+    if abs(fltCross1) > fltTolerance * fltLength or abs(fltCross2) > fltTolerance * fltLength:
+        return False
+
+    #Project B onto A and measure the shared stretch
+    fltT1 = (fltDX * (fltBX1 - fltAX1) + fltDY * (fltBY1 - fltAY1)) / fltLengthSquared
+    fltT2 = (fltDX * (fltBX2 - fltAX1) + fltDY * (fltBY2 - fltAY1)) / fltLengthSquared
+    fltOverlap = min(1.0, max(fltT1, fltT2)) - max(0.0, min(fltT1, fltT2))
+    return fltOverlap * fltLength > fltTolerance
+
+
+class AdjacencyEngineClass(object):
+    '''Builds the shared-edge adjacency graph of a whole polygon layer in one pass over its geometries'''
+    def __init__(self, blnCollinearOverlap=True, fltEpsilon=1e-9, fltTolerance=0.0):
+        self.blnCollinearOverlap = blnCollinearOverlap
+        self.fltEpsilon = fltEpsilon
+        #With a snapping tolerance, vertices are quantized and edges are stored packed. See quantizeRings().
+        self.fltTolerance = fltTolerance
+        #Normalized edge -> OBJECTID of the first feature that used it, or a list once it is shared
+        self.dictEdgeOwners = {}
+        self.setPairs = set()
+        self.lsOIDs = []
+        self.dictAdjacency = None
+
+    def addFeature(self, intOID, geometry):
+        self.lsOIDs.append(intOID)
+        self.dictAdjacency = None
+        dictEdgeOwners = self.dictEdgeOwners
+        lsRings = ringsFromGeometry(geometry)
+        if self.fltTolerance:
+            iterEdges = (packEdge(tupEdge) for tupEdge in segmentsFromRings(quantizeRings(lsRings, self.fltTolerance)))
+        else:
+            iterEdges = segmentsFromRings(lsRings)
+        for tupEdge in iterEdges:
+            owner = dictEdgeOwners.get(tupEdge)
+            if owner is None:
+                dictEdgeOwners[tupEdge] = intOID
+                continue
+            if not isinstance(owner, list):
+                if owner == intOID:
+                    continue
+                owner = dictEdgeOwners[tupEdge] = [owner]
+            elif intOID in owner:
+                continue
+            for intOtherOID in owner:
+                self.setPairs.add((intOtherOID, intOID) if intOtherOID < intOID else (intOID, intOtherOID))
+            owner.append(intOID)
+
+    def addFeatures(self, iterFeatures):
+        '''Add (OBJECTID, geometry) pairs from any iterable, such as a cursor'''
+        for intOID, geometry in iterFeatures:
+            self.addFeature(intOID, geometry)
+
+    def _collinearPairs(self, tupEnvelope=None):
+        #Only edges that found no exact partner can still share a segment with a feature that split it differently
+        lsSegments = [(tupEdge, owner) for tupEdge, owner in self.dictEdgeOwners.items() if not isinstance(owner, list)]
+        fltDistance = 0.0
+        if self.fltTolerance:
+            #Work in grid units. Segments within one grid step of each other are a sliver or digitizing noise.
+            lsSegments = [(unpackEdge(intKey), owner) for intKey, owner in lsSegments]
+            fltDistance = 1.0
+            if tupEnvelope is not None:
+                tupEnvelope = tuple(fltValue / self.fltTolerance for fltValue in tupEnvelope)
+        if tupEnvelope is not None:
+            fltXMin, fltYMin, fltXMax, fltYMax = tupEnvelope
+            lsSegments = [(tupEdge, owner) for tupEdge, owner in lsSegments
+                          if tupEdge[0][0] <= fltXMax and tupEdge[1][0] >= fltXMin and
+                          min(tupEdge[0][1], tupEdge[1][1]) <= fltYMax and max(tupEdge[0][1], tupEdge[1][1]) >= fltYMin]
+        if len(lsSegments) < 2:
+            return set()
+
+        #Size grid cells from the mean segment length so most segments fall in one or two cells
+        fltTotalLength = 0.0
+        for ((fltX1, fltY1), (fltX2, fltY2)), owner in lsSegments:
+            fltTotalLength += math.hypot(fltX2 - fltX1, fltY2 - fltY1)
+        fltCellSize = (fltTotalLength / len(lsSegments)) or 1.0
+
+        dictCells = {}
+        for intIndex, (((fltX1, fltY1), (fltX2, fltY2)), owner) in enumerate(lsSegments):
+            #Envelopes grow by the snapping distance so near-collinear neighbors across a cell line still meet
+            intColumnMin = int(math.floor((min(fltX1, fltX2) - fltDistance) / fltCellSize))
+            intColumnMax = int(math.floor((max(fltX1, fltX2) + fltDistance) / fltCellSize))
+            intRowMin = int(math.floor((min(fltY1, fltY2) - fltDistance) / fltCellSize))
+            intRowMax = int(math.floor((max(fltY1, fltY2) + fltDistance) / fltCellSize))
+            for intColumn in range(intColumnMin, intColumnMax + 1):
+                for intRow in range(intRowMin, intRowMax + 1):
+                    dictCells.setdefault((intColumn, intRow), []).append(intIndex)
+
+        setFound = set()
+        for lsCell in dictCells.values():
+            for intPosition in range(len(lsCell)):
+                tupEdgeA, intOIDA = lsSegments[lsCell[intPosition]]
+                for intIndexB in lsCell[intPosition + 1:]:
+                    tupEdgeB, intOIDB = lsSegments[intIndexB]
+                    if intOIDA == intOIDB:
+                        continue
+                    tupPair = (intOIDA, intOIDB) if intOIDA < intOIDB else (intOIDB, intOIDA)
+                    if tupPair in self.setPairs or tupPair in setFound:
+                        continue
+                    if segmentsOverlap(tupEdgeA, tupEdgeB, self.fltEpsilon, fltDistance):
+                        setFound.add(tupPair)
+        return setFound
+
+    def adjacentPairs(self, tupEnvelope=None):
+        '''Return the set of adjacent (lesser OBJECTID, greater OBJECTID) pairs. With tupEnvelope, given as
+        (xmin, ymin, xmax, ymax), the collinear overlap search only looks at segments touching that envelope.'''
+        if self.blnCollinearOverlap:
+            return self.setPairs | self._collinearPairs(tupEnvelope)
+        return set(self.setPairs)
+
+    def buildAdjacency(self):
+        '''Return a dictionary of OBJECTID to the sorted list of OBJECTIDs sharing a line segment with it'''
+        if self.dictAdjacency is not None:
+            return self.dictAdjacency
+        self.dictAdjacency = self.adjacencyFromPairs(self.lsOIDs, self.adjacentPairs())
+        return self.dictAdjacency
+
+    @staticmethod
+    def adjacencyFromPairs(lsOIDs, setPairs):
+        '''Expand adjacent pairs into a dictionary of OBJECTID to sorted neighbor list, keyed in lsOIDs order'''
+        dictAdjacency = dict((intOID, []) for intOID in lsOIDs)
+        for intOIDA, intOIDB in setPairs:
+            dictAdjacency[intOIDA].append(intOIDB)
+            dictAdjacency[intOIDB].append(intOIDA)
+        for lsNeighbors in dictAdjacency.values():
+            lsNeighbors.sort()
+        return dictAdjacency
+
+    def firstLevelAdjacency(self):
+        '''Return a dictionary of OBJECTID to the count of primary adjacent features'''
+        return dict((intOID, len(lsNeighbors)) for intOID, lsNeighbors in self.buildAdjacency().items())
@@ -5,17 +5,67 @@
 # Purpose:  This class gets imported into the main script. It defines a method that returns a layer with adjacent polygons selected.
 # Inputs:  
 # Outputs:  
-# Modifications: 
+# Modifications: 10/18/2026 - Now a thin adapter around AdjacencyEngineClass. buildAdjacencyEngine() reads every
+#                   geometry once and builds the whole adjacency graph. When an engine is supplied, selectAdjacent()
+#                   selects the known neighbors by attribute instead of issuing two spatial queries per feature.
+#                   candidateFetcher() reads the features near an edit for IncrementalAdjacencyClass. Both take an
+#                   optional InstrumentationClass to report progress and count cursor rows and spatial queries.
+#                   Rows with a null shape are kept as features with no geometry instead of stopping the run.
 ###################################
+import json
+import AdjacencyEngineClass
+
+
+def geometryFromShapeJSON(strShapeJSON):
+    '''Decode a SHAPE@JSON value. A null shape becomes None, which the engine treats as an empty geometry.'''
+    if strShapeJSON is None:
+        return None
+    return json.loads(strShapeJSON)
+
 class AdjacentSelectionClass(object):
     '''This class contains a function to be reused by the main script'''
-    def __init__(self, masterFeatureLayer, duplicateFeatureLayer, fieldName):
+    def __init__(self, masterFeatureLayer, duplicateFeatureLayer, fieldName, adjacencyEngine=None):
         self.masterFeatureLayer = masterFeatureLayer
         self.duplicateFeatureLayer = duplicateFeatureLayer
         self.fieldName = fieldName
+        self.adjacencyEngine = adjacencyEngine
+
+    @staticmethod
+    def buildAdjacencyEngine(featureLayer, fltTolerance=0.0, objInstrumentation=None):
+        '''Read every geometry in the layer once and return an AdjacencyEngineClass holding the full graph'''
+        import arcpy, arcpy.da
+        objEngine = AdjacencyEngineClass.AdjacencyEngineClass(fltTolerance=fltTolerance)
+        with arcpy.da.SearchCursor(featureLayer, ["OID@", "SHAPE@JSON"]) as cursor:
+            iterRows = cursor
+            if objInstrumentation is not None:
+                intTotal = int(arcpy.GetCount_management(featureLayer)[0])
+                iterRows = objInstrumentation.track(cursor, "Reading geometries", intTotal, "cursor rows read")
+            for row in iterRows:
+                #A null shape keeps its OBJECTID in the graph with no neighbors
+                objEngine.addFeature(row[0], geometryFromShapeJSON(row[1]))
+        objEngine.buildAdjacency()
+        return objEngine
+
+    @staticmethod
+    def candidateFetcher(featureLayer, objInstrumentation=None):
+        '''Return a function that reads the features whose envelope touches an envelope, for IncrementalAdjacencyClass'''
+        def fetchCandidates(tupEnvelope):
+            import arcpy, arcpy.da
+            extent = arcpy.Extent(*tupEnvelope)
+            if objInstrumentation is not None:
+                objInstrumentation.count("spatial queries")
+            with arcpy.da.SearchCursor(featureLayer, ["OID@", "SHAPE@JSON"], spatial_filter=extent,
+                                       spatial_relationship="ENVELOPE_INTERSECTS") as cursor:
+                for row in cursor:
+                    if objInstrumentation is not None:
+                        objInstrumentation.count("cursor rows read")
+                    yield row[0], geometryFromShapeJSON(row[1])
+        return fetchCandidates
 
     def selectAdjacent(self):
         import arcpy.management
+        if self.adjacencyEngine is not None:
+            return self._selectAdjacentFromGraph()
         #For each feature, select all adjacent features in duplicate that share a line segment
         selection = arcpy.SelectLayerByLocation_management(in_layer=self.duplicateFeatureLayer,
                                                overlap_type="SHARE_A_LINE_SEGMENT_WITH",
@@ -30,3 +80,24 @@ class AdjacentSelectionClass(object):
                                                invert_spatial_relationship=None)
 
         return selection
+
+    def _selectAdjacentFromGraph(self):
+        import arcpy.da, arcpy.management
+        dictAdjacency = self.adjacencyEngine.buildAdjacency()
+        #Gather the neighbors of every selected feature of focus, excluding the focus features themselves
+        with arcpy.da.SearchCursor(self.masterFeatureLayer, ["OID@"]) as cursor:
+            setFocusIDs = set(row[0] for row in cursor)
+        setAdjacentIDs = set()
+        for ID in setFocusIDs:
+            setAdjacentIDs.update(dictAdjacency.get(ID, []))
+        setAdjacentIDs.difference_update(setFocusIDs)
+
+        strOIDField = arcpy.Describe(self.duplicateFeatureLayer).OIDFieldName
+        if setAdjacentIDs:
+            strWhereClause = strOIDField + " IN (" + ",".join(str(ID) for ID in sorted(setAdjacentIDs)) + ")"
+        else:
+            strWhereClause = strOIDField + " IS NULL"
+        selection = arcpy.SelectLayerByAttribute_management(in_layer_or_view=self.duplicateFeatureLayer,
+                                                            selection_type="NEW_SELECTION",
+                                                            where_clause=strWhereClause)
+        return selection
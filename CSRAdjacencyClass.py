@@ -0,0 +1,186 @@
+###################################
+# Script:  CSRAdjacencyClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  A compressed sparse row (CSR) representation of the adjacency graph. Nodes are kept in ascending OBJECTID
+#           order. The neighbors of the node at index I are the node indexes neighbors[offsets[I]:offsets[I + 1]].
+#           The graph is saved to a small binary file that loads with a memory map, so the arrays are used in place
+#           without being copied or parsed. The class behaves as a read-only dictionary of OBJECTID to the list of
+#           adjacent OBJECTIDs, so it can be handed to anything that accepts AdjacencyEngineClass.buildAdjacency().
+# Inputs:  Dictionary of OBJECTID to list of adjacent OBJECTIDs, or a file written by save()
+# Outputs:  Binary graph file. Layout, all little-endian:
+#               header    magic "FCTCSR01", uint32 version, uint32 reserved, uint64 node count, uint64 entry count,
+#                         float64 snapping tolerance the graph was built with (version 2 and later)
+#               oids      int64 x node count
+#               offsets   int32 x (node count + 1)
+#               neighbors int32 x entry count
+# Modifications: 10/18/2026 - Version 2 records the snapping tolerance, so an incremental update patches the graph with
+#                   the same tolerance it was built with. Version 1 files still load, with a tolerance of 0.
+###################################
+import array
+import bisect
+import mmap
+import struct
+import sys
+from collections.abc import Mapping
+
+strMagic = b"FCTCSR01"
+intVersion = 2
+structHeader = struct.Struct("<8sIIQQd")
+#Version 1 files have no tolerance
+structHeaderVersion1 = struct.Struct("<8sIIQQ")
+
+
+#Typecodes for the on-disk integer widths, shared by array.array and memoryview.cast
+strInt32 = "i"
+strInt64 = "q"
+
+
+def _castView(viewFile, intStart, intEnd, strTypeCode):
+    #Release the intermediate slice so only the typed view holds the memory map open
+    viewSlice = viewFile[intStart:intEnd]
+    viewTyped = viewSlice.cast(strTypeCode)
+    viewSlice.release()
+    return viewTyped
+
+
+class CSRAdjacencyClass(Mapping):
+    '''Array-backed adjacency graph that can be saved to disk and memory-mapped back'''
+    def __init__(self, oids, offsets, neighbors, mmapFile=None, fltTolerance=0.0):
+        self.oids = oids
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.mmapFile = mmapFile
+        self.fltTolerance = fltTolerance
+
+    @classmethod
+    def fromAdjacencyDict(cls, dictAdjacency, fltTolerance=0.0):
+        '''Build the arrays from a dictionary of OBJECTID to list of adjacent OBJECTIDs. fltTolerance is the snapping
+        tolerance the graph was built with. It is saved with the graph.'''
+        lsOIDs = sorted(dictAdjacency)
+        dictIndex = dict((intOID, intIndex) for intIndex, intOID in enumerate(lsOIDs))
+        oids = array.array(strInt64, lsOIDs)
+        offsets = array.array(strInt32, [0])
+        neighbors = array.array(strInt32)
+        for intOID in lsOIDs:
+            neighbors.extend(sorted(dictIndex[intNeighborOID] for intNeighborOID in dictAdjacency[intOID]))
+            offsets.append(len(neighbors))
+        return cls(oids, offsets, neighbors, fltTolerance=fltTolerance)
+
+    @classmethod
+    def load(cls, strPath, blnMemoryMap=True):
+        '''Open a graph written by save(). With blnMemoryMap the arrays are views onto the mapped file.'''
+        with open(strPath, "rb") as fileHandle:
+            bytesHeader = fileHandle.read(structHeaderVersion1.size)
+            if len(bytesHeader) < structHeaderVersion1.size:
+                raise ValueError(strPath + " is not a CSR adjacency file")
+            strFileMagic, intFileVersion, intReserved, intNodes, intEntries = structHeaderVersion1.unpack(bytesHeader)
+            if strFileMagic != strMagic:
+                raise ValueError(strPath + " is not a CSR adjacency file")
+            if intFileVersion not in (1, intVersion):
+                raise ValueError("Unsupported CSR adjacency file version " + str(intFileVersion))
+            fltTolerance = 0.0
+            if intFileVersion == intVersion:
+                bytesHeader += fileHandle.read(structHeader.size - structHeaderVersion1.size)
+                if len(bytesHeader) < structHeader.size:
+                    raise ValueError(strPath + " is truncated")
+                fltTolerance = structHeader.unpack(bytesHeader)[5]
+            intOIDsStart = len(bytesHeader)
+            intOffsetsStart = intOIDsStart + 8 * intNodes
+            intNeighborsStart = intOffsetsStart + 4 * (intNodes + 1)
+            intEnd = intNeighborsStart + 4 * intEntries
+
+            #Zero-copy views need the file's byte order to match the machine's
+            if blnMemoryMap and sys.byteorder == "little":
+                mmapFile = mmap.mmap(fileHandle.fileno(), 0, access=mmap.ACCESS_READ)
+                if len(mmapFile) < intEnd:
+                    mmapFile.close()
+                    raise ValueError(strPath + " is truncated")
+                viewFile = memoryview(mmapFile)
+                oids = _castView(viewFile, intOIDsStart, intOffsetsStart, strInt64)
+                offsets = _castView(viewFile, intOffsetsStart, intNeighborsStart, strInt32)
+                neighbors = _castView(viewFile, intNeighborsStart, intEnd, strInt32)
+                viewFile.release()
+                return cls(oids, offsets, neighbors, mmapFile, fltTolerance)
+
+            lsArrays = []
+            for strTypeCode, intCount in ((strInt64, intNodes), (strInt32, intNodes + 1), (strInt32, intEntries)):
+                arrayValues = array.array(strTypeCode)
+                try:
+                    arrayValues.fromfile(fileHandle, intCount)
+                except EOFError:
+                    raise ValueError(strPath + " is truncated")
+                if sys.byteorder != "little":
+                    arrayValues.byteswap()
+                lsArrays.append(arrayValues)
+        return cls(*lsArrays, fltTolerance=fltTolerance)
+
+    def save(self, strPath):
+        '''Write the graph in the binary layout described in the module header'''
+        with open(strPath, "wb") as fileHandle:
+            fileHandle.write(structHeader.pack(strMagic, intVersion, 0, len(self.oids), len(self.neighbors),
+                                               self.fltTolerance))
+            for values in (self.oids, self.offsets, self.neighbors):
+                arrayValues = array.array(values.format if isinstance(values, memoryview) else values.typecode, values)
+                if sys.byteorder != "little":
+                    arrayValues.byteswap()
+                arrayValues.tofile(fileHandle)
+
+    def close(self):
+        '''Release the memory map, if the graph was loaded with one. The graph is unusable afterwards.'''
+        if self.mmapFile is None:
+            return
+        for view in (self.oids, self.offsets, self.neighbors):
+            view.release()
+        self.mmapFile.close()
+        self.mmapFile = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def nodeCount(self):
+        return len(self.oids)
+
+    def edgeCount(self):
+        '''Every undirected edge is stored once from each end'''
+        return len(self.neighbors) // 2
+
+    def indexOf(self, intOID):
+        '''Return the node index of an OBJECTID, raising KeyError when it is not in the graph'''
+        intIndex = bisect.bisect_left(self.oids, intOID)
+        if intIndex == len(self.oids) or self.oids[intIndex] != intOID:
+            raise KeyError(intOID)
+        return intIndex
+
+    def neighborIndexes(self, intIndex):
+        '''Return the node indexes adjacent to the node at intIndex, as a slice of the neighbor array'''
+        return self.neighbors[self.offsets[intIndex]:self.offsets[intIndex + 1]]
+
+    def degree(self, intOID):
+        intIndex = self.indexOf(intOID)
+        return self.offsets[intIndex + 1] - self.offsets[intIndex]
+
+    def degrees(self):
+        '''Return a dictionary of OBJECTID to the count of primary adjacent features'''
+        offsets = self.offsets
+        return dict((self.oids[intIndex], offsets[intIndex + 1] - offsets[intIndex]) for intIndex in range(len(self.oids)))
+
+    def toAdjacencyDict(self):
+        return dict((intOID, self[intOID]) for intOID in self)
+
+    def __getitem__(self, intOID):
+        oids = self.oids
+        return [oids[intNeighborIndex] for intNeighborIndex in self.neighborIndexes(self.indexOf(intOID))]
+
+    def __iter__(self):
+        return iter(self.oids)
+
+    def __len__(self):
+        return len(self.oids)
+
+    def __contains__(self, intOID):
+        intIndex = bisect.bisect_left(self.oids, intOID)
+        return intIndex < len(self.oids) and self.oids[intIndex] == intOID
@@ -0,0 +1,313 @@
+###################################
+# Script:  ComputeAdjacency.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Library entry point and command line for the whole adjacency run outside an ArcGIS session. compute_adjacency()
+#           reads the polygons, builds the shared-edge graph, computes FirstLevelAdjacency, SecondLevelAdjacency and
+#           optionally ColorIndex, saves the graph and writes the fields back. The backend is picked from the source:
+#           GeoJSON, newline-delimited GeoJSON, GeoPackage and Shapefile paths are read by StreamingGeometryReader.
+#           Anything else, such as a geodatabase feature class, is read through arcpy. arcpy is imported only when that
+#           backend runs, so file jobs start without it. The arcpy backend imports whatever module is installed as arcpy,
+#           so it can run against a stand-in module on a machine without ArcGIS. With a k-hop level, the reach, max
+#           common neighbor count and clique size of NeighborhoodMetricsClass are added as Reach<k>, MaxCommon<k> and
+#           Clique<k>. An http or https source is read as an ArcGIS feature service layer by FeatureServiceFetcherClass,
+#           in OBJECTID batches over a few reused connections. A service cannot be written back, so its fields go to a file.
+#           update_adjacency() applies a changeset to a graph saved earlier instead of recomputing the layer. Candidates
+#           near each edit come from an EnvelopeIndexClass over the current file, and only the affected rows are written.
+# Inputs:  Source path or feature class, optional target for the fields, and options. See main() for the command line.
+# Outputs:  Dictionary of results, an optional CSR graph file, edited fields and an optional JSON run summary
+# Modifications:
+###################################
+import argparse
+import os
+
+import AdjacencyEngineClass
+import AdjacentSelectionClass
+import CSRAdjacencyClass
+import FeatureServiceFetcherClass
+import FieldWriterClass
+import IncrementalAdjacencyClass
+import InstrumentationClass
+import MapColoringClass
+import NeighborhoodMetricsClass
+import ParallelAdjacencyClass
+import SecondaryAdjacencyClass
+import StreamingGeometryReader
+
+lsBackends = ["auto", "local", "arcpy", "service"]
+lsLocalExtensions = [".geojson", ".json", ".ndjson", ".geojsonl", ".jsonl", ".gpkg", ".shp"]
+strFirstLevelAdjacencyFieldName = "FirstLevelAdjacency"
+strSecondLevelAdjacencyFieldName = "SecondLevelAdjacency"
+strColorIndexFieldName = "ColorIndex"
+
+
+def _extension(strPath):
+    return os.path.splitext(str(strPath))[1].lower()
+
+
+def selectBackend(strSource, strBackend="auto"):
+    '''Return "service" for an http or https URL, "local" for a file the standard library can read and "arcpy" for
+    anything else'''
+    if strBackend != "auto":
+        if strBackend not in lsBackends:
+            raise ValueError("Unknown backend: " + str(strBackend))
+        return strBackend
+    if str(strSource).lower().startswith(("http://", "https://")):
+        return "service"
+    return "local" if _extension(strSource) in lsLocalExtensions else "arcpy"
+
+
+def _arcpyFeatureCount(strSource):
+    import arcpy
+    return int(arcpy.GetCount_management(strSource)[0])
+
+
+def _arcpyFeatures(strSource):
+    import arcpy.da
+    with arcpy.da.SearchCursor(strSource, ["OID@", "SHAPE@JSON"]) as cursor:
+        for row in cursor:
+            yield row[0], AdjacentSelectionClass.geometryFromShapeJSON(row[1])
+
+
+def _readerOptions(strSource, strTable, strOIDField):
+    #Only GeoPackage readers take a table. Shapefiles number their records themselves.
+    strExtension = _extension(strSource)
+    dictOptions = {}
+    if strExtension == ".gpkg":
+        if not strTable:
+            raise ValueError("A GeoPackage source needs a table name")
+        dictOptions["strTable"] = strTable
+    if strOIDField and strExtension != ".shp":
+        dictOptions["strOIDField"] = strOIDField
+    return dictOptions
+
+
+def createTargetWriter(strTarget, strBackend, strTable=None, strOIDField=None):
+    '''Return the FieldWriterClass for a target. Paths without a file extension need the arcpy backend.'''
+    strExtension = _extension(strTarget)
+    if strExtension == ".shp":
+        if strBackend != "arcpy":
+            raise ValueError("Shapefile attributes can only be written with the arcpy backend. Write to a .csv instead.")
+        return FieldWriterClass.ArcpyFieldWriter(strTarget)
+    if strExtension == ".gpkg":
+        if not strTable:
+            raise ValueError("A GeoPackage target needs a table name")
+        if not os.path.exists(strTarget):
+            raise ValueError("GeoPackage target not found: " + str(strTarget))
+        return FieldWriterClass.GeoPackageFieldWriter(strTarget, strTable, strOIDField or "fid")
+    if strExtension in (".csv", ".geojson", ".json"):
+        return FieldWriterClass.createFieldWriter(strTarget, strOIDField=strOIDField or "OBJECTID")
+    if strBackend == "service" or str(strTarget).lower().startswith(("http://", "https://")):
+        raise ValueError("Fields cannot be written to a feature service. Write to a .csv instead.")
+    if strBackend != "arcpy":
+        raise ValueError("Cannot write fields to " + str(strTarget) + " without arcpy")
+    return FieldWriterClass.ArcpyFieldWriter(strTarget)
+
+
+def compute_adjacency(strSource, strTarget=None, strBackend="auto", strTable=None, strOIDField=None,
+                      fltTolerance=0.0, intWorkers=1, blnColor=False, strGraphFile=None, objInstrumentation=None,
+                      intKHops=None, intBatchSize=1000, intConnections=4):
+    '''Compute FirstLevelAdjacency and SecondLevelAdjacency, ColorIndex when blnColor is set, and the k-hop metrics when
+    intKHops is set, for every polygon in strSource. strTable and strOIDField name the GeoPackage table and the OBJECTID
+    column or property. A feature service is read intBatchSize OBJECTIDs per query over intConnections connections.
+    With strTarget the fields are written there. Pass the source itself to edit it in place. Return a dictionary with
+    the adjacency graph and {OBJECTID: value} for each field.'''
+    strBackend = selectBackend(strSource, strBackend)
+    if objInstrumentation is None:
+        objInstrumentation = InstrumentationClass.InstrumentationClass(fnMessage=lambda strMessage: None)
+    #Check the target before the expensive part of the run
+    objFieldWriter = createTargetWriter(strTarget, strBackend, strTable, strOIDField) if strTarget else None
+
+    objFetcher = None
+    if strBackend == "arcpy":
+        iterFeatures = objInstrumentation.track(_arcpyFeatures(strSource), "Reading geometries",
+                                                _arcpyFeatureCount(strSource), "cursor rows read")
+    elif strBackend == "service":
+        objFetcher = FeatureServiceFetcherClass.FeatureServiceFetcherClass(strSource, intBatchSize=intBatchSize,
+                                                                           intConnections=intConnections)
+        #Listing the OBJECTIDs first gives the progress messages a total
+        lsObjectIDs = objFetcher.fetchObjectIDs()
+        iterFeatures = objInstrumentation.track(objFetcher.readFeatures(lsObjectIDs), "Reading geometries",
+                                                len(lsObjectIDs), "features read")
+    else:
+        iterFeatures = objInstrumentation.track(StreamingGeometryReader.readFeatures(
+            strSource, **_readerOptions(strSource, strTable, strOIDField)), "Reading geometries", strCounter="features read")
+
+    with objInstrumentation.stage("Adjacency graph"):
+        if intWorkers == 1:
+            objEngine = AdjacencyEngineClass.AdjacencyEngineClass(fltTolerance=fltTolerance)
+            objEngine.addFeatures(iterFeatures)
+            dictAdjacency = objEngine.buildAdjacency()
+            del objEngine
+        else:
+            objParallel = ParallelAdjacencyClass.ParallelAdjacencyClass(intWorkers=intWorkers, fltTolerance=fltTolerance)
+            dictAdjacency = objParallel.buildAdjacency(iterFeatures)
+    if objFetcher is not None:
+        objInstrumentation.count("service requests", objFetcher.dictStats["requests"])
+        objInstrumentation.count("service connections", objFetcher.dictStats["connections"])
+        objInstrumentation.count("service bytes", objFetcher.dictStats["bytes"])
+
+    if strGraphFile:
+        with objInstrumentation.stage("Save graph"):
+            CSRAdjacencyClass.CSRAdjacencyClass.fromAdjacencyDict(dictAdjacency, fltTolerance).save(strGraphFile)
+        objInstrumentation.message("Adjacency graph saved to " + strGraphFile)
+
+    dictFieldValues = {}
+    with objInstrumentation.stage("First level adjacency"):
+        dictFieldValues[strFirstLevelAdjacencyFieldName] = dict((intOID, len(lsNeighbors))
+                                                                for intOID, lsNeighbors in dictAdjacency.items())
+    with objInstrumentation.stage("Secondary adjacency"):
+        dictFieldValues[strSecondLevelAdjacencyFieldName] = \
+            SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictAdjacency).secondLevelAdjacency()
+    if blnColor:
+        with objInstrumentation.stage("Map coloring"):
+            dictFieldValues[strColorIndexFieldName] = MapColoringClass.MapColoringClass(dictAdjacency).colorMap()
+        objInstrumentation.message("Colors used: " +
+                                   str(MapColoringClass.MapColoringClass.colorCount(dictFieldValues[strColorIndexFieldName])))
+        lsShortfall = MapColoringClass.MapColoringClass.shortfall(dictFieldValues[strColorIndexFieldName])
+        if lsShortfall:
+            objInstrumentation.message("Features the repair could not bring under 4 colors: " +
+                                       ", ".join(str(intOID) for intOID in lsShortfall[:20]))
+
+    if intKHops:
+        objMetrics = NeighborhoodMetricsClass.NeighborhoodMetricsClass(dictAdjacency)
+        with objInstrumentation.stage("Neighborhood metrics"):
+            dictMetrics = objMetrics.metrics(intK=intKHops)
+        dictReach = dictFieldValues["Reach" + str(intKHops)] = {}
+        dictMaxCommon = dictFieldValues["MaxCommon" + str(intKHops)] = {}
+        dictClique = dictFieldValues["Clique" + str(intKHops)] = {}
+        for intOID, dictValues in dictMetrics.items():
+            dictReach[intOID] = sum(dictValues["reach"])
+            dictMaxCommon[intOID] = dictValues["max_common"]
+            dictClique[intOID] = dictValues["clique"]
+        dictCacheInfo = objMetrics.cacheInfo()["neighbors"]
+        objInstrumentation.count("neighbor cache hits", dictCacheInfo["hits"])
+        objInstrumentation.count("neighbor cache misses", dictCacheInfo["misses"])
+
+    intRowsWritten = 0
+    if objFieldWriter is not None:
+        with objInstrumentation.stage("Write fields"):
+            #Reach grows with the square of the level, so it gets a LONG
+            dictFieldTypes = dict((strFieldName, "LONG" if strFieldName.startswith("Reach") else "SHORT")
+                                  for strFieldName in dictFieldValues)
+            for strFieldName in objFieldWriter.ensureFields(dictFieldTypes):
+                objInstrumentation.message(strFieldName + " field added")
+            intRowsWritten = objFieldWriter.writeFields(dictFieldValues)
+        if getattr(objFieldWriter, "intSkippedRows", 0):
+            objInstrumentation.message("Rows without an OBJECTID left as they were: " + str(objFieldWriter.intSkippedRows))
+        if dictAdjacency and not intRowsWritten:
+            raise ValueError("No rows in " + str(strTarget) + " matched the features read. Check the OBJECTID field name.")
+        objInstrumentation.count("rows written", intRowsWritten)
+
+    dictResults = {"backend": strBackend, "adjacency": dictAdjacency, "rows_written": intRowsWritten}
+    dictResults.update(dictFieldValues)
+    return dictResults
+
+
+def update_adjacency(strSource, strGraphFile, strChangesetFile, strTarget=None, strBackend="auto", strTable=None,
+                     strOIDField=None, objInstrumentation=None):
+    '''Apply the changeset in strChangesetFile to the graph saved in strGraphFile, using the snapping tolerance saved
+    with it. strSource is the layer after the edits. It supplies the features around each edit and any geometry the
+    changeset leaves null. The graph file is saved back. Return a dictionary with the updated graph and
+    {OBJECTID: value} of FirstLevelAdjacency and SecondLevelAdjacency for the rows that may have changed.'''
+    strBackend = selectBackend(strSource, strBackend)
+    if strBackend != "local":
+        raise ValueError("Changesets are applied to files only. Use MaxAdjacencyIncrementalUpdate.py for a feature class.")
+    if objInstrumentation is None:
+        objInstrumentation = InstrumentationClass.InstrumentationClass(fnMessage=lambda strMessage: None)
+    objFieldWriter = createTargetWriter(strTarget, strBackend, strTable, strOIDField) if strTarget else None
+    dictChangeset = IncrementalAdjacencyClass.loadChangeset(strChangesetFile)
+
+    with objInstrumentation.stage("Index current features"):
+        objIndex = IncrementalAdjacencyClass.EnvelopeIndexClass(objInstrumentation.track(StreamingGeometryReader.readFeatures(
+            strSource, **_readerOptions(strSource, strTable, strOIDField)), "Reading geometries", strCounter="features read"))
+    #Fill in geometries the changeset left out from the current file
+    dictCurrent = dict((intOID, lsRings) for intOID, lsRings, tupEnvelope in objIndex.lsFeatures)
+    for strKey in ("inserted", "updated"):
+        for intOID, geometry in dictChangeset[strKey].items():
+            if geometry is None:
+                dictChangeset[strKey][intOID] = dictCurrent.get(intOID)
+
+    with objInstrumentation.stage("Apply changes"):
+        with CSRAdjacencyClass.CSRAdjacencyClass.load(strGraphFile) as objGraph:
+            fltTolerance = objGraph.fltTolerance
+            objIncremental = IncrementalAdjacencyClass.IncrementalAdjacencyClass(objGraph, objIndex, fltTolerance=fltTolerance)
+        dictFirstLevelAdjacency, dictSecondLevelAdjacency = objIncremental.applyChanges(dictChangeset["inserted"],
+                                                                                        dictChangeset["updated"],
+                                                                                        dictChangeset["deleted"])
+    objInstrumentation.message("Features affected: " + str(len(dictSecondLevelAdjacency)))
+    dictAdjacency = objIncremental.adjacency()
+    with objInstrumentation.stage("Save graph"):
+        CSRAdjacencyClass.CSRAdjacencyClass.fromAdjacencyDict(dictAdjacency, fltTolerance).save(strGraphFile)
+    objInstrumentation.message("Adjacency graph saved to " + strGraphFile)
+
+    dictFieldValues = {strFirstLevelAdjacencyFieldName: dictFirstLevelAdjacency,
+                       strSecondLevelAdjacencyFieldName: dictSecondLevelAdjacency}
+    intRowsWritten = 0
+    if objFieldWriter is not None and dictSecondLevelAdjacency:
+        with objInstrumentation.stage("Write fields"):
+            objFieldWriter.ensureFields({strFirstLevelAdjacencyFieldName: "SHORT", strSecondLevelAdjacencyFieldName: "SHORT"})
+            intRowsWritten = objFieldWriter.writeFields(dictFieldValues)
+        objInstrumentation.count("rows written", intRowsWritten)
+
+    dictResults = {"backend": strBackend, "adjacency": dictAdjacency, "rows_written": intRowsWritten}
+    dictResults.update(dictFieldValues)
+    return dictResults
+
+
+def main(lsArguments=None):
+    parser = argparse.ArgumentParser(description="Compute FirstLevelAdjacency and SecondLevelAdjacency for a polygon layer")
+    parser.add_argument("source", help="GeoJSON, GeoPackage or Shapefile path, feature service layer URL, "
+                                           "or a feature class for the arcpy backend")
+    parser.add_argument("--output", help="write the fields to this CSV, GeoJSON, GeoPackage or feature class")
+    parser.add_argument("--in-place", action="store_true", help="write the fields back to the source")
+    parser.add_argument("--backend", default="auto", choices=lsBackends)
+    parser.add_argument("--layer", help="GeoPackage table to read and write")
+    parser.add_argument("--oid-field", help="OBJECTID column or property name")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="snapping tolerance in map units")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes for the adjacency graph")
+    parser.add_argument("--color", action="store_true", help="also compute a ColorIndex field")
+    parser.add_argument("--graph", help="save the adjacency graph as a CSR file")
+    parser.add_argument("--changes", help="apply this changeset JSON to the --graph file instead of recomputing the layer")
+    parser.add_argument("--batch-size", type=int, default=1000, help="OBJECTIDs per feature service query")
+    parser.add_argument("--connections", type=int, default=4, help="concurrent feature service connections")
+    parser.add_argument("--khops", type=int, help="also compute reach, max common neighbors and clique size at this level")
+    parser.add_argument("--summary", help="save a JSON run summary")
+    parser.add_argument("--diagnostics", nargs="*", default=[], choices=InstrumentationClass.lsDiagnostics)
+    parser.add_argument("--quiet", action="store_true", help="print nothing but errors")
+    args = parser.parse_args(lsArguments)
+    if args.output and args.in_place:
+        parser.error("--output and --in-place cannot be combined")
+    if args.changes and not args.graph:
+        parser.error("--changes needs the --graph file to update")
+
+    objInstrumentation = InstrumentationClass.InstrumentationClass(
+        fnMessage=(lambda strMessage: None) if args.quiet else print,
+        blnProfile="cprofile" in args.diagnostics, blnTraceMemory="tracemalloc" in args.diagnostics)
+    strTarget = args.source if args.in_place else args.output
+    try:
+        if args.changes:
+            dictResults = update_adjacency(args.source, args.graph, args.changes, strTarget, args.backend, args.layer,
+                                           args.oid_field, objInstrumentation)
+        else:
+            dictResults = compute_adjacency(args.source, strTarget, args.backend, args.layer, args.oid_field,
+                                            args.tolerance, args.workers, args.color, args.graph, objInstrumentation,
+                                            args.khops, args.batch_size, args.connections)
+    except (ValueError, OSError, RuntimeError) as error:
+        parser.error(str(error))
+    if not args.changes:
+        dictFirstLevelAdjacency = dictResults[strFirstLevelAdjacencyFieldName]
+        objInstrumentation.message("Features processed: " + str(len(dictFirstLevelAdjacency)))
+        objInstrumentation.message("Max Primary Adjacency Count: " + str(max(dictFirstLevelAdjacency.values() or [0])))
+        objInstrumentation.message("Max Secondary Adjacency: " +
+                                   str(max(dictResults[strSecondLevelAdjacencyFieldName].values() or [0])))
+    if args.output or args.in_place:
+        objInstrumentation.message("Rows written: " + str(dictResults["rows_written"]))
+    objInstrumentation.reportSummary()
+    if args.summary:
+        objInstrumentation.writeSummary(args.summary)
+    objInstrumentation.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+###################################
+# Script:  FeatureServiceFetcherClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Reads the polygons of an ArcGIS feature service layer in bulk, instead of one round trip per feature. One
+#           returnIdsOnly query lists the OBJECTIDs. They are then requested in large "OBJECTID IN (...)" batches by a
+#           fixed number of asyncio workers. Each worker keeps one HTTP/1.1 keep-alive connection, so concurrency is
+#           bounded and connections are reused. Queries are POSTed, so long IN lists never hit URL length limits, and
+#           gzip responses are accepted. readFeatures() runs the fetch on a background thread and yields (OBJECTID, rings)
+#           as batches arrive, so AdjacencyEngineClass works on one batch while the next ones download. A batch cut
+#           short by the server's transfer limit is requested again for the missing OBJECTIDs. Standard library only.
+# Inputs:  Feature service layer URL (.../FeatureServer/0 or .../MapServer/0), batch size, connection count, and extra
+#           query parameters such as a token
+# Outputs:  Generator of (OBJECTID, list of rings of (x, y) tuples)
+# Modifications:
+###################################
+import asyncio
+import gzip
+import json
+import queue
+import ssl
+import threading
+import urllib.parse
+import zlib
+
+import AdjacencyEngineClass
+
+strUserAgent = "MaxAdjacency/1.0"
+
+
+class _ConnectionClass(object):
+    '''One keep-alive HTTP/1.1 connection, reopened when the server closes it'''
+    def __init__(self, objFetcher):
+        self.objFetcher = objFetcher
+        self.reader = None
+        self.writer = None
+
+    async def _open(self):
+        objFetcher = self.objFetcher
+        self.reader, self.writer = await asyncio.open_connection(objFetcher.strHost, objFetcher.intPort,
+                                                                 ssl=objFetcher.contextSSL)
+        objFetcher.dictStats["connections"] += 1
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def post(self, dictParameters):
+        '''POST the query parameters and return the decoded JSON response, retrying on a dropped connection'''
+        objFetcher = self.objFetcher
+        bytesBody = urllib.parse.urlencode(dictParameters).encode("ascii")
+        bytesRequest = ("POST " + objFetcher.strQueryPath + " HTTP/1.1\r\n"
+                        "Host: " + objFetcher.strHostHeader + "\r\n"
+                        "User-Agent: " + strUserAgent + "\r\n"
+                        "Accept-Encoding: gzip, deflate\r\n"
+                        "Connection: keep-alive\r\n"
+                        "Content-Type: application/x-www-form-urlencoded\r\n"
+                        "Content-Length: " + str(len(bytesBody)) + "\r\n\r\n").encode("latin-1") + bytesBody
+        intFailures = 0
+        while True:
+            blnReused = self.writer is not None
+            try:
+                if self.writer is None:
+                    await self._open()
+                intStatus, bytesResponse, blnKeepAlive = await asyncio.wait_for(self._exchange(bytesRequest),
+                                                                                objFetcher.fltTimeout)
+            except (OSError, EOFError, asyncio.TimeoutError):
+                self.close()
+                #A kept-alive connection the server has since dropped does not count as a failed attempt
+                if not blnReused:
+                    intFailures += 1
+                    if intFailures > objFetcher.intRetries:
+                        raise
+                continue
+            if not blnKeepAlive:
+                self.close()
+            objFetcher.dictStats["requests"] += 1
+            objFetcher.dictStats["bytes"] += len(bytesResponse)
+            if intStatus != 200:
+                raise RuntimeError("Feature service returned HTTP " + str(intStatus))
+            dictResponse = json.loads(bytesResponse)
+            #ArcGIS reports query errors inside a 200 response
+            if "error" in dictResponse:
+                dictError = dictResponse["error"]
+                raise RuntimeError(" ".join(["Feature service error " + str(dictError.get("code")) + ":",
+                                             str(dictError.get("message"))] + list(dictError.get("details") or [])))
+            return dictResponse
+
+    async def _exchange(self, bytesRequest):
+        reader = self.reader
+        self.writer.write(bytesRequest)
+        await self.writer.drain()
+        bytesStatusLine = await reader.readline()
+        if not bytesStatusLine:
+            raise EOFError("Connection closed before the response")
+        lsStatus = bytesStatusLine.decode("latin-1").split(None, 2)
+        intStatus = int(lsStatus[1])
+        dictHeaders = {}
+        while True:
+            bytesLine = await reader.readline()
+            if bytesLine in (b"\r\n", b"\n", b""):
+                break
+            strName, strValue = bytesLine.decode("latin-1").split(":", 1)
+            dictHeaders[strName.strip().lower()] = strValue.strip()
+
+        blnKeepAlive = lsStatus[0] == "HTTP/1.1" and dictHeaders.get("connection", "").lower() != "close"
+        if "chunked" in dictHeaders.get("transfer-encoding", "").lower():
+            lsChunks = []
+            while True:
+                intSize = int((await reader.readline()).split(b";", 1)[0], 16)
+                if intSize == 0:
+                    #Skip any trailer headers
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                lsChunks.append(await reader.readexactly(intSize))
+                await reader.readexactly(2)
+            bytesResponse = b"".join(lsChunks)
+        elif "content-length" in dictHeaders:
+            bytesResponse = await reader.readexactly(int(dictHeaders["content-length"]))
+        else:
+            bytesResponse = await reader.read()
+            blnKeepAlive = False
+
+        strEncoding = dictHeaders.get("content-encoding", "").lower()
+        if strEncoding == "gzip":
+            bytesResponse = gzip.decompress(bytesResponse)
+        elif strEncoding == "deflate":
+            bytesResponse = zlib.decompress(bytesResponse)
+        return intStatus, bytesResponse, blnKeepAlive
+
+
+class FeatureServiceFetcherClass(object):
+    '''Pages polygon geometries out of a feature service layer with a few reused connections'''
+    def __init__(self, strLayerURL, intBatchSize=1000, intConnections=4, dictParameters=None, strWhereClause="1=1",
+                 fltTimeout=120.0, intRetries=2):
+        tupURL = urllib.parse.urlsplit(strLayerURL)
+        if tupURL.scheme not in ("http", "https"):
+            raise ValueError("Not an http or https URL: " + strLayerURL)
+        self.strHost = tupURL.hostname
+        self.intPort = tupURL.port or (443 if tupURL.scheme == "https" else 80)
+        self.strHostHeader = self.strHost if tupURL.port is None else self.strHost + ":" + str(tupURL.port)
+        self.contextSSL = ssl.create_default_context() if tupURL.scheme == "https" else None
+        self.strQueryPath = tupURL.path.rstrip("/") + "/query"
+        self.intBatchSize = intBatchSize
+        self.intConnections = intConnections
+        self.dictParameters = dict(dictParameters or {})
+        self.strWhereClause = strWhereClause
+        self.fltTimeout = fltTimeout
+        self.intRetries = intRetries
+        self.strOIDField = None
+        self.dictStats = {"requests": 0, "connections": 0, "bytes": 0}
+
+    def _parameters(self, **kwargs):
+        dictParameters = {"f": "json"}
+        dictParameters.update(self.dictParameters)
+        dictParameters.update(kwargs)
+        return dictParameters
+
+    async def _fetchObjectIDs(self, objConnection):
+        dictResponse = await objConnection.post(self._parameters(where=self.strWhereClause, returnIdsOnly="true"))
+        self.strOIDField = dictResponse.get("objectIdFieldName") or "OBJECTID"
+        return sorted(dictResponse.get("objectIds") or [])
+
+    def fetchObjectIDs(self):
+        '''Return the sorted OBJECTIDs matching the where clause'''
+        async def fetch():
+            objConnection = _ConnectionClass(self)
+            try:
+                return await self._fetchObjectIDs(objConnection)
+            finally:
+                objConnection.close()
+        return asyncio.run(fetch())
+
+    async def _fetchBatch(self, objConnection, lsObjectIDs):
+        #Returns [(OBJECTID, rings)]. Asks again for whatever a transfer limit left out.
+        lsFeatures = []
+        while lsObjectIDs:
+            strWhereClause = self.strOIDField + " IN (" + ",".join(str(intOID) for intOID in lsObjectIDs) + ")"
+            dictResponse = await objConnection.post(self._parameters(where=strWhereClause, outFields=self.strOIDField,
+                                                                     returnGeometry="true"))
+            setReturned = set()
+            for dictFeature in dictResponse.get("features") or []:
+                intOID = dictFeature["attributes"][self.strOIDField]
+                setReturned.add(intOID)
+                if dictFeature.get("geometry"):
+                    lsFeatures.append((intOID, AdjacencyEngineClass.ringsFromGeometry(dictFeature["geometry"])))
+            if not dictResponse.get("exceededTransferLimit") or not setReturned:
+                break
+            lsObjectIDs = [intOID for intOID in lsObjectIDs if intOID not in setReturned]
+        return lsFeatures
+
+    async def _fetchAll(self, lsObjectIDs, queueOut, eventStop):
+        loop = asyncio.get_running_loop()
+        lsConnections = [_ConnectionClass(self) for intWorker in range(self.intConnections)]
+        try:
+            if lsObjectIDs is None:
+                lsObjectIDs = await self._fetchObjectIDs(lsConnections[0])
+            elif self.strOIDField is None:
+                await self._fetchObjectIDs(lsConnections[0])
+            queueBatches = asyncio.Queue()
+            for intStart in range(0, len(lsObjectIDs), self.intBatchSize):
+                queueBatches.put_nowait(lsObjectIDs[intStart:intStart + self.intBatchSize])
+
+            def handOff(lsFeatures):
+                #Blocks while the consumer is busy, which holds downloads to a few batches ahead of it
+                while not eventStop.is_set():
+                    try:
+                        queueOut.put(lsFeatures, timeout=0.5)
+                        return
+                    except queue.Full:
+                        pass
+
+            async def worker(objConnection):
+                while not queueBatches.empty() and not eventStop.is_set():
+                    lsFeatures = await self._fetchBatch(objConnection, queueBatches.get_nowait())
+                    await loop.run_in_executor(None, handOff, lsFeatures)
+
+            await asyncio.gather(*[worker(objConnection) for objConnection in lsConnections])
+        finally:
+            for objConnection in lsConnections:
+                objConnection.close()
+
+    def readFeatures(self, lsObjectIDs=None):
+        '''Yield (OBJECTID, rings) for the given OBJECTIDs, or every feature matching the where clause'''
+        queueOut = queue.Queue(maxsize=self.intConnections * 2)
+        eventStop = threading.Event()
+        objDone = object()
+
+        def run():
+            try:
+                asyncio.run(self._fetchAll(lsObjectIDs, queueOut, eventStop))
+                queueOut.put(objDone)
+            except BaseException as error:
+                queueOut.put(error)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = queueOut.get()
+                if item is objDone:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                for tupFeature in item:
+                    yield tupFeature
+        finally:
+            #Release workers waiting on a full queue when the caller stops early
+            eventStop.set()
+            while thread.is_alive():
+                try:
+                    queueOut.get(timeout=0.1)
+                except queue.Empty:
+                    pass
@@ -0,0 +1,273 @@
+###################################
+# Script:  FieldWriterClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Writes per-feature results back to the data in a single streaming pass, instead of one geoprocessing tool
+#           call per feature. Results are accumulated as dictionaries of OBJECTID to value, one per field, and handed
+#           to a writer. Every writer has the same two methods, ensureFields() and writeFields(), so the write stage can
+#           be swapped or benchmarked apart from the computation. ArcpyFieldWriter uses one UpdateCursor ordered by
+#           OID. The CSV, GeoJSON and GeoPackage writers need only the standard library.
+# Inputs:  Dictionary of field name to field type, dictionary of field name to {OBJECTID: value}
+# Outputs:  Edited table, feature class or file
+# Modifications:
+###################################
+import abc
+import csv
+import json
+import os
+import sqlite3
+import tempfile
+
+import StreamingGeometryReader
+
+#Field types follow the arcpy names. The SQLite types are the GeoPackage equivalents.
+dictSQLiteFieldTypes = {"SHORT": "SMALLINT", "LONG": "INTEGER", "FLOAT": "FLOAT", "DOUBLE": "DOUBLE", "TEXT": "TEXT"}
+
+#Above this many rows, one ordered pass over the table is cheaper than a long IN (...) where clause
+intWhereClauseLimit = 1000
+
+
+def _rowValues(dictFieldValues, lsFieldNames, intOID):
+    #None for a field means "leave this field alone" for that row
+    return [dictFieldValues[strFieldName].get(intOID) for strFieldName in lsFieldNames]
+
+
+def _changedOIDs(dictFieldValues):
+    setOIDs = set()
+    for dictValues in dictFieldValues.values():
+        setOIDs.update(dictValues)
+    return setOIDs
+
+
+class FieldWriterClass(abc.ABC):
+    '''Base class for writers that store per-feature results in one pass'''
+    def __init__(self, strTarget):
+        self.strTarget = strTarget
+
+    @abc.abstractmethod
+    def ensureFields(self, dictFieldTypes):
+        '''Add any of the fields that do not exist yet. Return the names of the fields that were added.'''
+
+    @abc.abstractmethod
+    def writeFields(self, dictFieldValues):
+        '''Write {field name: {OBJECTID: value}} in one pass. Return the number of rows written.'''
+
+
+class ArcpyFieldWriter(FieldWriterClass):
+    '''Writes to a feature class or table with a single arcpy.da.UpdateCursor ordered by OID'''
+    def ensureFields(self, dictFieldTypes):
+        import arcpy
+        setExisting = set(field.name.upper() for field in arcpy.ListFields(self.strTarget))
+        lsAdded = []
+        for strFieldName, strFieldType in dictFieldTypes.items():
+            if strFieldName.upper() in setExisting:
+                continue
+            arcpy.AddField_management(in_table=self.strTarget, field_name=strFieldName, field_type=strFieldType)
+            lsAdded.append(strFieldName)
+        return lsAdded
+
+    def writeFields(self, dictFieldValues):
+        import arcpy
+        lsFieldNames = list(dictFieldValues)
+        setOIDs = _changedOIDs(dictFieldValues)
+        if not setOIDs:
+            return 0
+        strOIDField = arcpy.Describe(self.strTarget).OIDFieldName
+        #A small edit only visits its own rows rather than scanning the whole table
+        strWhereClause = None
+        if len(setOIDs) <= intWhereClauseLimit:
+            strWhereClause = strOIDField + " IN (" + ",".join(str(intOID) for intOID in sorted(setOIDs)) + ")"
+        intRows = 0
+        with arcpy.da.UpdateCursor(self.strTarget, ["OID@"] + lsFieldNames, where_clause=strWhereClause,
+                                   sql_clause=(None, "ORDER BY " + strOIDField)) as cursor:
+            for row in cursor:
+                if row[0] not in setOIDs:
+                    continue
+                for intPosition, value in enumerate(_rowValues(dictFieldValues, lsFieldNames, row[0])):
+                    if value is not None:
+                        row[intPosition + 1] = value
+                cursor.updateRow(row)
+                intRows += 1
+        return intRows
+
+
+class CSVFieldWriter(FieldWriterClass):
+    '''Writes to a CSV keyed by an OBJECTID column, merging into the file when it already exists. OBJECTIDs the file
+    does not have yet are appended. Rows with a blank OBJECTID are kept as they are and counted in intSkippedRows.'''
+    def __init__(self, strTarget, strOIDField="OBJECTID"):
+        FieldWriterClass.__init__(self, strTarget)
+        self.strOIDField = strOIDField
+        self.lsPendingFields = []
+        self.intSkippedRows = 0
+
+    def ensureFields(self, dictFieldTypes):
+        #CSV columns are untyped and get created by the next write
+        lsExisting = []
+        if os.path.exists(self.strTarget):
+            with open(self.strTarget, newline="") as fileCSV:
+                lsExisting = next(csv.reader(fileCSV), [])
+        lsAdded = [strFieldName for strFieldName in dictFieldTypes if strFieldName not in lsExisting]
+        self.lsPendingFields.extend(strFieldName for strFieldName in lsAdded if strFieldName not in self.lsPendingFields)
+        return lsAdded
+
+    def writeFields(self, dictFieldValues):
+        lsFieldNames = list(dictFieldValues)
+        if not os.path.exists(self.strTarget):
+            lsPending = [strFieldName for strFieldName in self.lsPendingFields if strFieldName not in lsFieldNames]
+            lsOIDs = sorted(_changedOIDs(dictFieldValues))
+            with open(self.strTarget, "w", newline="") as fileCSV:
+                writer = csv.writer(fileCSV)
+                writer.writerow([self.strOIDField] + lsPending + lsFieldNames)
+                for intOID in lsOIDs:
+                    lsValues = _rowValues(dictFieldValues, lsFieldNames, intOID)
+                    writer.writerow([intOID] + [""] * len(lsPending) + ["" if value is None else value for value in lsValues])
+            self.lsPendingFields = []
+            return len(lsOIDs)
+
+        #Stream the existing file through a temporary copy, replacing values row by row
+        intRows = 0
+        self.intSkippedRows = 0
+        setRemaining = _changedOIDs(dictFieldValues)
+        strDirectory = os.path.dirname(os.path.abspath(self.strTarget))
+        with open(self.strTarget, newline="") as fileIn:
+            reader = csv.reader(fileIn)
+            lsHeader = next(reader)
+            lsHeader.extend(strName for strName in self.lsPendingFields + lsFieldNames if strName not in lsHeader)
+            intOIDColumn = lsHeader.index(self.strOIDField)
+            lsColumns = [lsHeader.index(strFieldName) for strFieldName in lsFieldNames]
+            with tempfile.NamedTemporaryFile("w", newline="", dir=strDirectory, delete=False, suffix=".csv") as fileOut:
+                writer = csv.writer(fileOut)
+                writer.writerow(lsHeader)
+                for lsRow in reader:
+                    lsRow.extend([""] * (len(lsHeader) - len(lsRow)))
+                    if not lsRow[intOIDColumn].strip():
+                        self.intSkippedRows += 1
+                        writer.writerow(lsRow)
+                        continue
+                    intOID = int(lsRow[intOIDColumn])
+                    setRemaining.discard(intOID)
+                    lsValues = _rowValues(dictFieldValues, lsFieldNames, intOID)
+                    if any(value is not None for value in lsValues):
+                        for intColumn, value in zip(lsColumns, lsValues):
+                            if value is not None:
+                                lsRow[intColumn] = value
+                        intRows += 1
+                    writer.writerow(lsRow)
+                #New features, such as inserts since the file was written
+                for intOID in sorted(setRemaining):
+                    lsRow = [""] * len(lsHeader)
+                    lsRow[intOIDColumn] = intOID
+                    for intColumn, value in zip(lsColumns, _rowValues(dictFieldValues, lsFieldNames, intOID)):
+                        if value is not None:
+                            lsRow[intColumn] = value
+                    writer.writerow(lsRow)
+                    intRows += 1
+        os.replace(fileOut.name, self.strTarget)
+        self.lsPendingFields = []
+        return intRows
+
+
+class GeoJSONFieldWriter(FieldWriterClass):
+    '''Writes feature properties of a GeoJSON FeatureCollection. Features are matched on the OBJECTID the
+    StreamingGeometryReader gave them. A missing file is created with one attribute-only feature per OBJECTID.'''
+    def __init__(self, strTarget, strOIDField="OBJECTID"):
+        FieldWriterClass.__init__(self, strTarget)
+        self.strOIDField = strOIDField
+        self.dictFieldDefaults = {}
+
+    def ensureFields(self, dictFieldTypes):
+        #GeoJSON properties are untyped. New fields are added as null on every feature by the next write.
+        self.dictFieldDefaults.update(dict.fromkeys(dictFieldTypes))
+        return list(dictFieldTypes)
+
+    def writeFields(self, dictFieldValues):
+        lsFieldNames = list(dictFieldValues)
+        setOIDs = _changedOIDs(dictFieldValues)
+        if os.path.exists(self.strTarget):
+            with open(self.strTarget) as fileJSON:
+                dictCollection = json.load(fileJSON)
+        else:
+            dictCollection = {"type": "FeatureCollection",
+                              "features": [{"type": "Feature", "properties": {self.strOIDField: intOID}, "geometry": None}
+                                           for intOID in sorted(setOIDs)]}
+        intRows = 0
+        for intPosition, dictFeature in enumerate(dictCollection.get("features", []), 1):
+            dictProperties = dictFeature.setdefault("properties", {}) or {}
+            dictFeature["properties"] = dictProperties
+            for strFieldName in self.dictFieldDefaults:
+                dictProperties.setdefault(strFieldName, None)
+            intOID = StreamingGeometryReader.featureOID(dictFeature, self.strOIDField, intPosition)
+            lsValues = _rowValues(dictFieldValues, lsFieldNames, intOID)
+            if any(value is not None for value in lsValues):
+                for strFieldName, value in zip(lsFieldNames, lsValues):
+                    if value is not None:
+                        dictProperties[strFieldName] = value
+                intRows += 1
+        #Leave the file untouched rather than add a column of nulls when nothing matched
+        if setOIDs and not intRows:
+            raise ValueError("No feature in " + str(self.strTarget) + " matched the OBJECTIDs being written. Check the " +
+                             self.strOIDField + " property.")
+        strDirectory = os.path.dirname(os.path.abspath(self.strTarget))
+        with tempfile.NamedTemporaryFile("w", dir=strDirectory, delete=False, suffix=".geojson") as fileOut:
+            json.dump(dictCollection, fileOut)
+        os.replace(fileOut.name, self.strTarget)
+        self.dictFieldDefaults = {}
+        return intRows
+
+
+class GeoPackageFieldWriter(FieldWriterClass):
+    '''Writes to a GeoPackage feature table with one UPDATE statement batch inside a single transaction'''
+    def __init__(self, strTarget, strTable, strOIDField="fid"):
+        FieldWriterClass.__init__(self, strTarget)
+        self.strTable = strTable
+        self.strOIDField = strOIDField
+
+    def ensureFields(self, dictFieldTypes):
+        connection = sqlite3.connect(self.strTarget)
+        try:
+            setExisting = set(row[1].upper() for row in connection.execute('PRAGMA table_info("' + self.strTable + '")'))
+            lsAdded = []
+            with connection:
+                for strFieldName, strFieldType in dictFieldTypes.items():
+                    if strFieldName.upper() in setExisting:
+                        continue
+                    connection.execute('ALTER TABLE "' + self.strTable + '" ADD COLUMN "' + strFieldName + '" ' +
+                                       dictSQLiteFieldTypes.get(strFieldType.upper(), strFieldType))
+                    lsAdded.append(strFieldName)
+        finally:
+            connection.close()
+        return lsAdded
+
+    def writeFields(self, dictFieldValues):
+        lsFieldNames = list(dictFieldValues)
+        intRows = 0
+        connection = sqlite3.connect(self.strTarget)
+        try:
+            with connection:
+                #One statement per combination of fields present, so a missing value never overwrites a stored one
+                dictStatements = {}
+                for intOID in sorted(_changedOIDs(dictFieldValues)):
+                    lsValues = _rowValues(dictFieldValues, lsFieldNames, intOID)
+                    tupPresent = tuple(strFieldName for strFieldName, value in zip(lsFieldNames, lsValues) if value is not None)
+                    dictStatements.setdefault(tupPresent, []).append([value for value in lsValues if value is not None] + [intOID])
+                for tupPresent, lsRows in dictStatements.items():
+                    if not tupPresent:
+                        continue
+                    strSQL = ('UPDATE "' + self.strTable + '" SET ' + ", ".join('"' + strName + '" = ?' for strName in tupPresent) +
+                              ' WHERE "' + self.strOIDField + '" = ?')
+                    intRows += connection.executemany(strSQL, lsRows).rowcount
+        finally:
+            connection.close()
+        return intRows
+
+
+def createFieldWriter(strTarget, **kwargs):
+    '''Pick a writer from the target's file extension. Anything else is treated as an arcpy table or feature class.'''
+    strExtension = os.path.splitext(str(strTarget))[1].lower()
+    if strExtension == ".csv":
+        return CSVFieldWriter(strTarget, **kwargs)
+    if strExtension in (".geojson", ".json"):
+        return GeoJSONFieldWriter(strTarget, **kwargs)
+    if strExtension == ".gpkg":
+        return GeoPackageFieldWriter(strTarget, **kwargs)
+    return ArcpyFieldWriter(strTarget)
@@ -0,0 +1,148 @@
+###################################
+# Script:  IncrementalAdjacencyClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Updates a persisted adjacency graph for a changeset of inserted, updated and deleted polygons, rather than
+#           recomputing the whole layer. The edges of updated and deleted features are dropped. The new geometries go
+#           through AdjacencyEngineClass together with the existing features inside their envelopes, fetched through a
+#           callable. Only pairs that involve a changed feature are taken back into the graph.
+#           FirstLevelAdjacency can change only at the ends of an added or removed edge. SecondLevelAdjacency of W is
+#           the max over V in N(W) of |N(W) & N(V)|, so it can change only when N(W) changed or when N(V) changed for
+#           one of W's neighbors. That is the ends of changed edges plus their neighbors, before and after the edit.
+#           Only those rows are recomputed and written.
+# Inputs:  Adjacency dictionary or CSRAdjacencyClass, a candidate fetch function, and a changeset, which is a JSON file
+#           or dictionary of {"inserted": {OBJECTID: geometry}, "updated": {OBJECTID: geometry}, "deleted": [OBJECTID]}
+# Outputs:  Updated adjacency dictionary, and FirstLevelAdjacency/SecondLevelAdjacency values for the affected rows
+# Modifications:
+###################################
+import json
+import math
+
+import AdjacencyEngineClass
+import SecondaryAdjacencyClass
+
+
+def _envelope(lsRings):
+    lsX = [tupPoint[0] for lsRing in lsRings for tupPoint in lsRing]
+    lsY = [tupPoint[1] for lsRing in lsRings for tupPoint in lsRing]
+    return (min(lsX), min(lsY), max(lsX), max(lsY))
+
+
+def loadChangeset(strPath):
+    '''Read a changeset JSON file. JSON object keys are strings, so OBJECTIDs are converted back to integers.'''
+    with open(strPath) as fileJSON:
+        dictChangeset = json.load(fileJSON)
+    return {"inserted": dict((int(key), value) for key, value in dictChangeset.get("inserted", {}).items()),
+            "updated": dict((int(key), value) for key, value in dictChangeset.get("updated", {}).items()),
+            "deleted": [int(value) for value in dictChangeset.get("deleted", [])]}
+
+
+class EnvelopeIndexClass(object):
+    '''Grid index over feature envelopes, for fetching candidates from an in-memory layer without arcpy'''
+    def __init__(self, iterFeatures):
+        self.lsFeatures = []
+        for intOID, geometry in iterFeatures:
+            lsRings = AdjacencyEngineClass.ringsFromGeometry(geometry)
+            if lsRings:
+                self.lsFeatures.append((intOID, lsRings, _envelope(lsRings)))
+        fltTotalSize = sum(max(tupEnvelope[2] - tupEnvelope[0], tupEnvelope[3] - tupEnvelope[1])
+                           for intOID, lsRings, tupEnvelope in self.lsFeatures)
+        self.fltCellSize = (fltTotalSize / len(self.lsFeatures) if self.lsFeatures else 0.0) or 1.0
+        self.dictCells = {}
+        for intPosition, (intOID, lsRings, tupEnvelope) in enumerate(self.lsFeatures):
+            for tupCell in self._cells(tupEnvelope):
+                self.dictCells.setdefault(tupCell, []).append(intPosition)
+
+    def _cells(self, tupEnvelope):
+        fltCellSize = self.fltCellSize
+        for intColumn in range(int(math.floor(tupEnvelope[0] / fltCellSize)), int(math.floor(tupEnvelope[2] / fltCellSize)) + 1):
+            for intRow in range(int(math.floor(tupEnvelope[1] / fltCellSize)), int(math.floor(tupEnvelope[3] / fltCellSize)) + 1):
+                yield (intColumn, intRow)
+
+    def __call__(self, tupEnvelope):
+        '''Yield (OBJECTID, rings) for every feature whose envelope touches tupEnvelope'''
+        setSeen = set()
+        for tupCell in self._cells(tupEnvelope):
+            for intPosition in self.dictCells.get(tupCell, []):
+                if intPosition in setSeen:
+                    continue
+                setSeen.add(intPosition)
+                intOID, lsRings, tupFeatureEnvelope = self.lsFeatures[intPosition]
+                if (tupFeatureEnvelope[0] <= tupEnvelope[2] and tupFeatureEnvelope[2] >= tupEnvelope[0] and
+                        tupFeatureEnvelope[1] <= tupEnvelope[3] and tupFeatureEnvelope[3] >= tupEnvelope[1]):
+                    yield (intOID, lsRings)
+
+
+class IncrementalAdjacencyClass(object):
+    '''Applies a changeset of edited polygons to an existing adjacency graph'''
+    def __init__(self, dictAdjacency, fnFetchCandidates, blnCollinearOverlap=True, fltEpsilon=1e-9, fltTolerance=0.0):
+        #fnFetchCandidates(envelope) yields (OBJECTID, geometry) for the current features touching the envelope
+        self.dictGraph = dict((intOID, set(dictAdjacency[intOID])) for intOID in dictAdjacency)
+        self.fnFetchCandidates = fnFetchCandidates
+        self.blnCollinearOverlap = blnCollinearOverlap
+        self.fltEpsilon = fltEpsilon
+        self.fltTolerance = fltTolerance
+
+    def _removeNode(self, intOID, setChangedEdgeEnds):
+        for intNeighborOID in self.dictGraph.get(intOID, ()):
+            self.dictGraph[intNeighborOID].discard(intOID)
+            setChangedEdgeEnds.update((intOID, intNeighborOID))
+        self.dictGraph[intOID] = set()
+
+    def applyChanges(self, dictInserted=None, dictUpdated=None, lsDeleted=None):
+        '''Apply the changeset and return ({OBJECTID: FirstLevelAdjacency}, {OBJECTID: SecondLevelAdjacency}) for the
+        rows whose values may have changed. Deleted features are left out.'''
+        dictNewGeometries = {}
+        dictNewGeometries.update(dictInserted or {})
+        dictNewGeometries.update(dictUpdated or {})
+        setDeleted = set(lsDeleted or [])
+        setChanged = set(dictNewGeometries) | setDeleted
+        setChangedEdgeEnds = set()
+
+        for intOID in setChanged:
+            self._removeNode(intOID, setChangedEdgeEnds)
+        for intOID in setDeleted:
+            del self.dictGraph[intOID]
+
+        objEngine = AdjacencyEngineClass.AdjacencyEngineClass(self.blnCollinearOverlap, self.fltEpsilon, self.fltTolerance)
+        setAdded = set()
+        for intOID, geometry in dictNewGeometries.items():
+            lsRings = AdjacencyEngineClass.ringsFromGeometry(geometry)
+            objEngine.addFeature(intOID, lsRings)
+            setAdded.add(intOID)
+            if not lsRings:
+                continue
+            fltXMin, fltYMin, fltXMax, fltYMax = _envelope(lsRings)
+            fltHalo = self.fltEpsilon * max(1.0, fltXMax - fltXMin, fltYMax - fltYMin) + 2 * self.fltTolerance
+            for intCandidateOID, candidateGeometry in self.fnFetchCandidates((fltXMin - fltHalo, fltYMin - fltHalo,
+                                                                              fltXMax + fltHalo, fltYMax + fltHalo)):
+                #The candidate source may still hold the old geometry of a changed feature
+                if intCandidateOID in setChanged or intCandidateOID in setAdded:
+                    continue
+                objEngine.addFeature(intCandidateOID, candidateGeometry)
+                setAdded.add(intCandidateOID)
+
+        for intOIDA, intOIDB in objEngine.adjacentPairs():
+            if intOIDA not in dictNewGeometries and intOIDB not in dictNewGeometries:
+                continue
+            self.dictGraph.setdefault(intOIDA, set()).add(intOIDB)
+            self.dictGraph.setdefault(intOIDB, set()).add(intOIDA)
+            setChangedEdgeEnds.update((intOIDA, intOIDB))
+        for intOID in dictNewGeometries:
+            self.dictGraph.setdefault(intOID, set())
+
+        setFirstLevel = (setChangedEdgeEnds | set(dictNewGeometries)) - setDeleted
+        #A removed edge's ends are in setChangedEdgeEnds, so their current neighbors cover the neighbors from before too
+        setSecondLevel = set(setFirstLevel)
+        for intOID in setChangedEdgeEnds:
+            setSecondLevel.update(self.dictGraph.get(intOID, ()))
+        setSecondLevel -= setDeleted
+
+        dictFirstLevel = dict((intOID, len(self.dictGraph[intOID])) for intOID in setFirstLevel)
+        objSecondary = SecondaryAdjacencyClass.SecondaryAdjacencyClass(self.dictGraph)
+        dictSecondLevel = objSecondary.secondLevelAdjacencyFor(setSecondLevel)
+        return dictFirstLevel, dictSecondLevel
+
+    def adjacency(self):
+        '''Return the updated graph as a dictionary of OBJECTID to sorted list of adjacent OBJECTIDs'''
+        return dict((intOID, sorted(setNeighbors)) for intOID, setNeighbors in self.dictGraph.items())
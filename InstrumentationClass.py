@@ -0,0 +1,163 @@
+###################################
+# Script:  InstrumentationClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Shows where a run spends its time without flooding the output. Work is wrapped in named stages that
+#           collect wall time and call counts. Counters record how many cursor rows, spatial queries and field writes a
+#           run made. Progress messages go through one function, arcpy.AddMessage or print, and are rate limited so a
+#           million-feature loop prints a line every few seconds, with rate and ETA, instead of one per feature. cProfile
+#           and tracemalloc can be switched on for a run. summary() returns everything as a dictionary, and
+#           writeSummary() saves it as JSON.
+#           Stages run one after another. tracemalloc peaks are reset when a stage starts, so nesting stages would lose
+#           the outer stage's peak.
+# Inputs:  A message function, a progress interval in seconds, and profiling switches
+# Outputs:  Progress and summary messages, and a dictionary or JSON file of stage times, counters and profile results
+# Modifications:
+###################################
+import cProfile
+import contextlib
+import datetime
+import json
+import pstats
+import time
+import tracemalloc
+
+lsDiagnostics = ["cprofile", "tracemalloc"]
+
+
+def formatSeconds(fltSeconds):
+    '''Format a duration as H:MM:SS'''
+    return str(datetime.timedelta(seconds=int(round(fltSeconds))))
+
+
+class InstrumentationClass(object):
+    '''Stage timers, counters, rate-limited progress messages and optional profiling for one run'''
+    def __init__(self, fnMessage=print, fltProgressInterval=5.0, blnProfile=False, blnTraceMemory=False, intProfileRows=25):
+        self.fnMessage = fnMessage
+        self.fltProgressInterval = fltProgressInterval
+        self.intProfileRows = intProfileRows
+        self.fltStart = time.perf_counter()
+        self.dictStages = {}
+        self.dictCounters = {}
+        self.dictProgress = {}
+        self.profile = cProfile.Profile() if blnProfile else None
+        self.blnTraceMemory = blnTraceMemory
+        #Leave tracing alone at close() if someone else started it
+        self.blnStartedTracing = blnTraceMemory and not tracemalloc.is_tracing()
+        if self.blnStartedTracing:
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def stage(self, strStage):
+        '''Time the body of a with block under strStage. Repeated stages add up.'''
+        dictStage = self.dictStages.setdefault(strStage, {"seconds": 0.0, "calls": 0})
+        if self.blnTraceMemory:
+            tracemalloc.reset_peak()
+        if self.profile is not None:
+            self.profile.enable()
+        fltStart = time.perf_counter()
+        try:
+            yield dictStage
+        finally:
+            dictStage["seconds"] += time.perf_counter() - fltStart
+            dictStage["calls"] += 1
+            if self.profile is not None:
+                self.profile.disable()
+            if self.blnTraceMemory:
+                dictStage["peak_bytes"] = max(dictStage.get("peak_bytes", 0), tracemalloc.get_traced_memory()[1])
+            self.dictProgress.pop(strStage, None)
+
+    def count(self, strCounter, intAmount=1):
+        '''Add intAmount to a named counter'''
+        self.dictCounters[strCounter] = self.dictCounters.get(strCounter, 0) + intAmount
+
+    def message(self, strMessage):
+        self.fnMessage(strMessage)
+
+    def progress(self, strStage, intDone, intTotal=None):
+        '''Report intDone of intTotal items for a stage, at most once per progress interval, and always at the end'''
+        fltNow = time.perf_counter()
+        #[time of the first report, time of the last message]
+        lsState = self.dictProgress.get(strStage)
+        if lsState is None:
+            lsState = self.dictProgress[strStage] = [fltNow, fltNow]
+        blnFinished = intTotal is not None and intDone >= intTotal
+        if fltNow - lsState[1] < self.fltProgressInterval and not blnFinished:
+            return
+        lsState[1] = fltNow
+        fltElapsed = fltNow - lsState[0]
+        fltRate = intDone / fltElapsed if fltElapsed > 0 else 0.0
+        strMessage = strStage + ": " + format(intDone, ",")
+        if intTotal:
+            strMessage += " of " + format(intTotal, ",") + " ({:.1f}%)".format(100.0 * intDone / intTotal)
+        if fltRate:
+            strMessage += ", {:,.0f}/s".format(fltRate)
+        if intTotal and fltRate and not blnFinished:
+            strMessage += ", ETA " + formatSeconds((intTotal - intDone) / fltRate)
+        self.fnMessage(strMessage)
+
+    def track(self, iterItems, strStage, intTotal=None, strCounter=None):
+        '''Yield the items of an iterable, reporting progress for strStage and counting them under strCounter'''
+        if intTotal is None and hasattr(iterItems, "__len__"):
+            intTotal = len(iterItems)
+        intDone = 0
+        for item in iterItems:
+            yield item
+            intDone += 1
+            self.progress(strStage, intDone, intTotal)
+        if strCounter:
+            self.count(strCounter, intDone)
+        if intTotal is None or intDone < intTotal:
+            #The end was not reported yet. Report it now, with the count as the total.
+            self.progress(strStage, intDone, intDone)
+
+    def _profileRows(self):
+        dictStats = pstats.Stats(self.profile).stats
+        lsRows = sorted(dictStats.items(), key=lambda item: item[1][3], reverse=True)[:self.intProfileRows]
+        return [{"function": strFunction, "file": strFile, "line": intLine, "calls": intCalls,
+                 "own_seconds": round(fltOwn, 6), "cumulative_seconds": round(fltCumulative, 6)}
+                for (strFile, intLine, strFunction), (intPrimitive, intCalls, fltOwn, fltCumulative, dictCallers) in lsRows]
+
+    def summary(self):
+        '''Return the run as a dictionary: total time, stages, counters, and the profile when enabled'''
+        dictSummary = {"total_seconds": round(time.perf_counter() - self.fltStart, 6),
+                       "stages": dict((strStage, dict(dictStage, seconds=round(dictStage["seconds"], 6)))
+                                      for strStage, dictStage in self.dictStages.items()),
+                       "counters": dict(self.dictCounters)}
+        if self.blnTraceMemory:
+            dictSummary["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        if self.profile is not None:
+            dictSummary["profile"] = self._profileRows()
+        return dictSummary
+
+    def reportSummary(self):
+        '''Send one message per stage and counter'''
+        dictSummary = self.summary()
+        for strStage, dictStage in dictSummary["stages"].items():
+            strMessage = "Stage " + strStage + ": {:.3f} s".format(dictStage["seconds"])
+            if dictStage["calls"] > 1:
+                strMessage += " over " + str(dictStage["calls"]) + " calls"
+            if "peak_bytes" in dictStage:
+                strMessage += ", peak {:.1f} MB".format(dictStage["peak_bytes"] / 1048576.0)
+            self.fnMessage(strMessage)
+        for strCounter, intCount in dictSummary["counters"].items():
+            self.fnMessage(strCounter + ": " + format(intCount, ","))
+        self.fnMessage("Total: {:.3f} s".format(dictSummary["total_seconds"]))
+        return dictSummary
+
+    def writeSummary(self, strPath):
+        '''Save summary() as JSON'''
+        dictSummary = self.summary()
+        with open(strPath, "w") as fileJSON:
+            json.dump(dictSummary, fileJSON, indent=2)
+        return dictSummary
+
+    def dumpProfile(self, strPath):
+        '''Save the raw cProfile statistics, for pstats or snakeviz'''
+        if self.profile is not None:
+            self.profile.dump_stats(strPath)
+
+    def close(self):
+        if self.blnStartedTracing:
+            tracemalloc.stop()
+            self.blnStartedTracing = False
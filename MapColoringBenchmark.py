@@ -0,0 +1,78 @@
+###################################
+# Script:  MapColoringBenchmark.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Compares the coloring strategies in MapColoringClass on synthetic planar maps. Each map is a square grid of
+#           cells where every 2x2 block of cells also touches across one randomly chosen diagonal, which makes a planar
+#           triangulation that generally needs four colors. Reports colors used before and after the Kempe chain repair
+#           and the runtime of each stage. The "left" column counts the vertices the repair could not bring under 4.
+# Inputs:  Command line. --sizes is a list of approximate node counts, --strategies limits the strategies compared,
+#           --seed fixes the diagonals.
+# Outputs:  A table printed to the console
+# Modifications:
+###################################
+import argparse
+import random
+import time
+
+import MapColoringClass
+
+
+def triangulatedGridAdjacency(intSide, intSeed=0):
+    '''Return the adjacency dictionary of an intSide x intSide triangulated grid, keyed from 1 like OBJECTIDs'''
+    objRandom = random.Random(intSeed)
+    dictAdjacency = dict((intOID, []) for intOID in range(1, intSide * intSide + 1))
+
+    def link(intOIDA, intOIDB):
+        dictAdjacency[intOIDA].append(intOIDB)
+        dictAdjacency[intOIDB].append(intOIDA)
+
+    for intRow in range(intSide):
+        for intColumn in range(intSide):
+            intOID = intRow * intSide + intColumn + 1
+            if intColumn + 1 < intSide:
+                link(intOID, intOID + 1)
+            if intRow + 1 < intSide:
+                link(intOID, intOID + intSide)
+            if intColumn + 1 < intSide and intRow + 1 < intSide:
+                if objRandom.random() < 0.5:
+                    link(intOID, intOID + intSide + 1)
+                else:
+                    link(intOID + 1, intOID + intSide)
+    return dictAdjacency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare map coloring strategies on synthetic planar maps")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--strategies", nargs="+", default=MapColoringClass.lsStrategies,
+                        choices=MapColoringClass.lsStrategies)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("{:>9} {:>13} {:>7} {:>7} {:>5} {:>9} {:>9}".format("nodes", "strategy", "colors", "4-fix", "left", "color s",
+                                                              "repair s"))
+    for intSize in args.sizes:
+        intSide = max(2, int(round(intSize ** 0.5)))
+        dictAdjacency = triangulatedGridAdjacency(intSide, args.seed)
+        for strStrategy in args.strategies:
+            objColoring = MapColoringClass.MapColoringClass(dictAdjacency)
+            fltStart = time.perf_counter()
+            dictColorIndex = objColoring.colorMap(strStrategy, blnRepair=False)
+            fltColorSeconds = time.perf_counter() - fltStart
+            intColors = MapColoringClass.MapColoringClass.colorCount(dictColorIndex)
+
+            fltStart = time.perf_counter()
+            dictRepaired = objColoring.reduceColors(dictColorIndex)
+            fltRepairSeconds = time.perf_counter() - fltStart
+            if not MapColoringClass.MapColoringClass.isProperColoring(dictAdjacency, dictRepaired):
+                raise RuntimeError(strStrategy + " produced adjacent polygons with the same color")
+            intRepairedColors = MapColoringClass.MapColoringClass.colorCount(dictRepaired)
+            intLeft = len(MapColoringClass.MapColoringClass.shortfall(dictRepaired))
+            print("{:>9} {:>13} {:>7} {:>7} {:>5} {:>9.3f} {:>9.3f}".format(len(dictAdjacency), strStrategy, intColors,
+                                                                          intRepairedColors, intLeft, fltColorSeconds,
+                                                                          fltRepairSeconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+###################################
+# Script:  MapColoringClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Colors the map. Every polygon gets a color index so that no two polygons sharing a line segment get the same
+#           one. A vertex ordering is colored greedily, each vertex taking the smallest color its colored neighbors are
+#           not using. Orderings: "greedy" (OBJECTID order), "smallestlast" (Matula-Beck bucket queue, linear time, at
+#           most 6 colors on a planar map) and "dsatur" (most saturated vertex next). A Kempe chain repair pass then
+#           tries to move every vertex above the target (4 by default) into the target palette by swapping the two
+#           colors of a chain that does not reach back around the vertex. When no such chain exists, a seeded walk of
+#           random Kempe swaps around the vertex reshuffles its neighborhood and the repair is tried again. Every swap keeps
+#           the coloring proper, so the walk can only help. Vertices still above the target are reported by shortfall().
+# Inputs:  Dictionary of OBJECTID to list of adjacent OBJECTIDs, or a CSRAdjacencyClass
+# Outputs:  Dictionary of OBJECTID to color index, starting at 0
+# Modifications:
+###################################
+import heapq
+import random
+
+lsStrategies = ["greedy", "smallestlast", "dsatur"]
+
+
+class MapColoringClass(object):
+    '''Assigns a color index to every polygon from the adjacency graph'''
+    def __init__(self, dictAdjacency, intMaxChain=2000, intMaxShuffles=500, intSeed=0):
+        self.intMaxChain = intMaxChain
+        self.intMaxShuffles = intMaxShuffles
+        self.intSeed = intSeed
+        self.lsOIDs = sorted(dictAdjacency)
+        dictIndex = dict((intOID, intIndex) for intIndex, intOID in enumerate(self.lsOIDs))
+        #Work on node indexes internally, which is both smaller and faster than OBJECTID keys
+        self.lsNeighbors = [[dictIndex[intNeighborOID] for intNeighborOID in dictAdjacency[intOID]] for intOID in self.lsOIDs]
+
+    def _smallestLastOrder(self):
+        lsNeighbors = self.lsNeighbors
+        intNodes = len(lsNeighbors)
+        lsDegree = [len(lsAdjacent) for lsAdjacent in lsNeighbors]
+        intMaxDegree = max(lsDegree) if lsDegree else 0
+        lsBuckets = [set() for intDegree in range(intMaxDegree + 1)]
+        for intIndex in range(intNodes):
+            lsBuckets[lsDegree[intIndex]].add(intIndex)
+        lsRemoved = [False] * intNodes
+        lsOrder = []
+        intLowest = 0
+        for intStep in range(intNodes):
+            #Removing a vertex lowers its neighbors' degrees by at most one, so the lowest bucket moves back by one
+            intLowest = max(intLowest - 1, 0)
+            while not lsBuckets[intLowest]:
+                intLowest += 1
+            intIndex = lsBuckets[intLowest].pop()
+            lsRemoved[intIndex] = True
+            lsOrder.append(intIndex)
+            for intNeighbor in lsNeighbors[intIndex]:
+                if not lsRemoved[intNeighbor]:
+                    intDegree = lsDegree[intNeighbor]
+                    lsBuckets[intDegree].discard(intNeighbor)
+                    lsBuckets[intDegree - 1].add(intNeighbor)
+                    lsDegree[intNeighbor] = intDegree - 1
+        lsOrder.reverse()
+        return lsOrder
+
+    def _colorInOrder(self, lsOrder):
+        lsNeighbors = self.lsNeighbors
+        lsColors = [-1] * len(lsNeighbors)
+        for intIndex in lsOrder:
+            setUsed = set(lsColors[intNeighbor] for intNeighbor in lsNeighbors[intIndex])
+            intColor = 0
+            while intColor in setUsed:
+                intColor += 1
+            lsColors[intIndex] = intColor
+        return lsColors
+
+    def _colorDSatur(self):
+        lsNeighbors = self.lsNeighbors
+        intNodes = len(lsNeighbors)
+        lsColors = [-1] * intNodes
+        lsNeighborColors = [set() for intIndex in range(intNodes)]
+        #Max-heap on (saturation, degree) with lazy deletion of stale entries
+        lsHeap = [(0, -len(lsNeighbors[intIndex]), intIndex) for intIndex in range(intNodes)]
+        heapq.heapify(lsHeap)
+        while lsHeap:
+            intNegativeSaturation, intNegativeDegree, intIndex = heapq.heappop(lsHeap)
+            if lsColors[intIndex] != -1 or -intNegativeSaturation != len(lsNeighborColors[intIndex]):
+                continue
+            setUsed = lsNeighborColors[intIndex]
+            intColor = 0
+            while intColor in setUsed:
+                intColor += 1
+            lsColors[intIndex] = intColor
+            for intNeighbor in lsNeighbors[intIndex]:
+                if lsColors[intNeighbor] == -1 and intColor not in lsNeighborColors[intNeighbor]:
+                    lsNeighborColors[intNeighbor].add(intColor)
+                    heapq.heappush(lsHeap, (-len(lsNeighborColors[intNeighbor]), -len(lsNeighbors[intNeighbor]), intNeighbor))
+        return lsColors
+
+    def _kempeChain(self, lsColors, intIndex, intStart, intColorA, intColorB, blnBlocked=True):
+        #Grow the A/B chain out of the A-colored neighbor intStart. Give up, returning None, if it reaches a B-colored
+        #   neighbor of the vertex (swapping would only trade one neighbor for another) or grows past intMaxChain.
+        #   Without blnBlocked the chain may take in the vertex's B-colored neighbors.
+        lsNeighbors = self.lsNeighbors
+        setBlocked = set()
+        if blnBlocked:
+            setBlocked = set(intNeighbor for intNeighbor in lsNeighbors[intIndex] if lsColors[intNeighbor] == intColorB)
+        lsChain = [intStart]
+        setChain = set(lsChain)
+        intPosition = 0
+        while intPosition < len(lsChain):
+            for intNext in lsNeighbors[lsChain[intPosition]]:
+                if intNext in setChain or intNext == intIndex:
+                    continue
+                intNextColor = lsColors[intNext]
+                if intNextColor == intColorA or intNextColor == intColorB:
+                    if intNext in setBlocked:
+                        return None
+                    setChain.add(intNext)
+                    lsChain.append(intNext)
+            if len(lsChain) > self.intMaxChain:
+                return None
+            intPosition += 1
+        return lsChain
+
+    def _kempeRecolor(self, lsColors, intIndex, intTarget):
+        '''Try to give the vertex at intIndex a color below intTarget by swapping Kempe chains around it'''
+        lsNeighbors = self.lsNeighbors
+        lsNeighborColors = [lsColors[intNeighbor] for intNeighbor in lsNeighbors[intIndex]]
+        for intColor in range(intTarget):
+            if intColor not in lsNeighborColors:
+                lsColors[intIndex] = intColor
+                return True
+
+        #Try to empty one color from the neighborhood, starting with the colors held by the fewest neighbors. Each
+        #   A-colored neighbor is moved out of A by swapping an A/B chain that stays clear of the vertex's B-colored
+        #   neighbors. Every swap keeps the coloring proper, so a color that cannot be fully emptied costs nothing.
+        for intColorA in sorted(range(intTarget), key=lsNeighborColors.count):
+            for intNeighbor in lsNeighbors[intIndex]:
+                if lsColors[intNeighbor] != intColorA:
+                    continue
+                for intColorB in range(intTarget):
+                    if intColorB == intColorA:
+                        continue
+                    lsChain = self._kempeChain(lsColors, intIndex, intNeighbor, intColorA, intColorB)
+                    if lsChain is not None:
+                        for intChained in lsChain:
+                            lsColors[intChained] = intColorB if lsColors[intChained] == intColorA else intColorA
+                        break
+                else:
+                    break
+            else:
+                lsColors[intIndex] = intColorA
+                return True
+        return False
+
+    def _kempeShuffle(self, lsColors, intIndex, intTarget):
+        '''Swap random Kempe chains through the neighbors of intIndex until _kempeRecolor() succeeds or the attempts
+        run out. The chains may pass through the vertex's other neighbors, which the plain repair never tries.'''
+        lsNeighbors = self.lsNeighbors
+        objRandom = random.Random(self.intSeed * 1000003 + intIndex)
+        for intAttempt in range(self.intMaxShuffles):
+            #Mostly the vertex's own neighbors, sometimes one step further out, so the walk is not confined to the ring
+            intStart = objRandom.choice(lsNeighbors[intIndex])
+            if intAttempt % 3 == 2:
+                intStart = objRandom.choice(lsNeighbors[intStart])
+            intColorA = lsColors[intStart]
+            if intStart == intIndex or intColorA >= intTarget:
+                continue
+            intColorB = objRandom.choice([intColor for intColor in range(intTarget) if intColor != intColorA])
+            lsChain = self._kempeChain(lsColors, intIndex, intStart, intColorA, intColorB, blnBlocked=False)
+            if lsChain is None:
+                continue
+            for intChained in lsChain:
+                lsColors[intChained] = intColorB if lsColors[intChained] == intColorA else intColorA
+            if self._kempeRecolor(lsColors, intIndex, intTarget):
+                return True
+        return False
+
+    def _repair(self, lsColors, intTarget):
+        blnChanged = True
+        while blnChanged:
+            blnChanged = False
+            for intIndex in range(len(lsColors)):
+                if lsColors[intIndex] >= intTarget and self._kempeRecolor(lsColors, intIndex, intTarget):
+                    blnChanged = True
+        #What the direct repair could not place gets the random walk. A walk only ever lowers the color of its own
+        #   vertex, so one pass over the rest is enough.
+        for intIndex in range(len(lsColors)):
+            if lsColors[intIndex] >= intTarget:
+                self._kempeShuffle(lsColors, intIndex, intTarget)
+        return lsColors
+
+    def colorMap(self, strStrategy="smallestlast", intTarget=4, blnRepair=True):
+        '''Return a dictionary of OBJECTID to color index. No two adjacent polygons share a color index.'''
+        if strStrategy == "greedy":
+            lsColors = self._colorInOrder(range(len(self.lsNeighbors)))
+        elif strStrategy == "smallestlast":
+            lsColors = self._colorInOrder(self._smallestLastOrder())
+        elif strStrategy == "dsatur":
+            lsColors = self._colorDSatur()
+        else:
+            raise ValueError("Unknown coloring strategy: " + str(strStrategy) + ". Use one of " + ", ".join(lsStrategies))
+        if blnRepair:
+            self._repair(lsColors, intTarget)
+        return dict(zip(self.lsOIDs, lsColors))
+
+    def reduceColors(self, dictColorIndex, intTarget=4):
+        '''Run the Kempe chain repair on an existing coloring and return the repaired copy'''
+        lsColors = self._repair([dictColorIndex[intOID] for intOID in self.lsOIDs], intTarget)
+        return dict(zip(self.lsOIDs, lsColors))
+
+    @staticmethod
+    def colorCount(dictColorIndex):
+        return len(set(dictColorIndex.values()))
+
+    @staticmethod
+    def shortfall(dictColorIndex, intTarget=4):
+        '''Return the sorted OBJECTIDs whose color index is at or above intTarget, the ones the repair could not place'''
+        return sorted(intOID for intOID, intColor in dictColorIndex.items() if intColor >= intTarget)
+
+    @staticmethod
+    def isProperColoring(dictAdjacency, dictColorIndex):
+        '''Return True when no two adjacent polygons share a color index'''
+        for intOID, lsNeighbors in dictAdjacency.items():
+            for intNeighborOID in lsNeighbors:
+                if dictColorIndex[intOID] == dictColorIndex[intNeighborOID]:
+                    return False
+        return True
@@ -3,134 +3,86 @@
 # Author:  CJuice
 # Date Created:  09/06/2017
 # Purpose:  Determines the maximum adjacency at a primary and secondary level. Primary is all polygons that share a line segment with the feature of focus. Every feature is iterated over and evaluated. A secondary adjacency is determined by examinging the primary adjacent features for each feature of focus. Each secondary feature is iterated over and it is determined how many of the other secondary features are adjacent to the secondary feature of focus. Both values are written to their own unique field, created during the script.
-# Inputs:  Workspace, Scratch Workspace, Feature Layer of Interest
+# Inputs:  Workspace, Scratch Workspace, Feature Layer of Interest, Run Summary File (optional),
+#           Diagnostics (optional: cprofile, tracemalloc)
 # Outputs:  None but messages to the geoprocessing window and an edited feature class.
-# Modifications:
+# Modifications: 10/18/2026 - The full adjacency graph is built once by AdjacencyEngineClass, and SecondLevelAdjacency is
+#                   computed from it by SecondaryAdjacencyClass instead of materializing tempFC for every feature.
+#                   Results are written back by FieldWriterClass in one UpdateCursor pass instead of per-feature CalculateField.
+#                   Fields are only added when missing, so the script can be rerun on the same feature class.
+#                   Progress and per-stage times are reported by InstrumentationClass instead of four messages per
+#                   feature. An optional JSON run summary records stage times, counters and diagnostics.
+#                   The script body is in main() and arcpy is imported there, so the module can be imported without an
+#                   ArcGIS session. ComputeAdjacency.py runs the same stages on files without arcpy.
 ###################################
-import arcpy, sys, os
 import AdjacentSelectionClass
+import InstrumentationClass
+import SecondaryAdjacencyClass
+import FieldWriterClass
 
-arcpy.env.overwriteOutput = True
 
-#Establish Variables
-strFirstLevelAdjacencyFieldName = "FirstLevelAdjacency"
-strSecondLevelAdjacencyFieldName = "SecondLevelAdjacency"
-lsLayerUniqueIDField = ['OBJECTID','OID']
-intFeatureCount = 0
-strWorkspace = arcpy.GetParameter(0)
-strScratchWorkspace = arcpy.GetParameter(1)
-strMasterFeatureClass = arcpy.GetParameter(2)
-arcpy.env.workspace = strWorkspace
+def main():
+    import arcpy
+    arcpy.env.overwriteOutput = True
 
-#Add fields to master feature class
-arcpy.AddField_management(in_table=strMasterFeatureClass,field_name=strFirstLevelAdjacencyFieldName,field_type="SHORT",
-                          field_precision=None,field_scale=None,field_length=None,field_alias=None,
-                          field_is_nullable=None,field_is_required=None,field_domain=None)
-arcpy.AddMessage(strFirstLevelAdjacencyFieldName + " field added")
-arcpy.AddField_management(in_table=strMasterFeatureClass,field_name=strSecondLevelAdjacencyFieldName,field_type="SHORT",
-                          field_precision=None,field_scale=None,field_length=None,field_alias=None,
-                          field_is_nullable=None,field_is_required=None,field_domain=None)
-arcpy.AddMessage(strSecondLevelAdjacencyFieldName + " field added")
+    #Establish Variables
+    strFirstLevelAdjacencyFieldName = "FirstLevelAdjacency"
+    strSecondLevelAdjacencyFieldName = "SecondLevelAdjacency"
+    strWorkspace = arcpy.GetParameter(0)
+    strScratchWorkspace = arcpy.GetParameter(1)
+    strMasterFeatureClass = arcpy.GetParameter(2)
+    strRunSummaryFile = arcpy.GetParameterAsText(3)
+    strDiagnostics = arcpy.GetParameterAsText(4).lower()
+    arcpy.env.workspace = strWorkspace
+    objInstrumentation = InstrumentationClass.InstrumentationClass(arcpy.AddMessage,
+                                                                   blnProfile="cprofile" in strDiagnostics,
+                                                                   blnTraceMemory="tracemalloc" in strDiagnostics)
 
-#Make a feature layer of the master, and make a copy to serve as the duplicate
-lyrMaster = arcpy.MakeFeatureLayer_management(in_features=strMasterFeatureClass,
-                                              out_layer="Master",
-                                              where_clause=None,
-                                              workspace=strScratchWorkspace,
-                                              field_info=None)
-lyrDuplicate = arcpy.MakeFeatureLayer_management(in_features=strMasterFeatureClass,
-                                                 out_layer="Duplicate",
-                                                 where_clause=None,
-                                                 workspace=strScratchWorkspace,
-                                                 field_info=None)
+    #Add any of the fields the master feature class does not have yet. Reruns leave existing fields alone.
+    objFieldWriter = FieldWriterClass.ArcpyFieldWriter(strMasterFeatureClass)
+    for strFieldName in objFieldWriter.ensureFields({strFirstLevelAdjacencyFieldName: "SHORT",
+                                                     strSecondLevelAdjacencyFieldName: "SHORT"}):
+        arcpy.AddMessage(strFieldName + " field added")
 
-#Iterates through features in master, selecting all adjacent, return selection
-lsObjectID = []
-try:
-    with arcpy.da.SearchCursor(lyrMaster, lsLayerUniqueIDField[0]) as cursor:
-        for row in cursor:
-            lsObjectID.append(row[0])
-except:
-    arcpy.AddWarning("(1) Feature layer may not contain the field " + lsLayerUniqueIDField[0])
-    sys.exit()
+    #Make a feature layer of the master
+    lyrMaster = arcpy.MakeFeatureLayer_management(in_features=strMasterFeatureClass,
+                                                  out_layer="Master",
+                                                  where_clause=None,
+                                                  workspace=strScratchWorkspace,
+                                                  field_info=None)
 
-for ID in lsObjectID:
-    intFeatureCount+=1
-    #Select a feature based on its ObjectID
-    featureOfFocus = arcpy.SelectLayerByAttribute_management(in_layer_or_view=lyrMaster,
-                                                             selection_type="NEW_SELECTION",
-                                                             where_clause=(lsLayerUniqueIDField[0] + '=' + str(ID)))
+    #Read every geometry once and build the full shared-edge adjacency graph in a single pass
+    with objInstrumentation.stage("Adjacency graph"):
+        objAdjacencyEngine = AdjacentSelectionClass.AdjacentSelectionClass.buildAdjacencyEngine(lyrMaster,
+                                                                                                objInstrumentation=objInstrumentation)
+        dictAdjacency = objAdjacencyEngine.buildAdjacency()
 
-    #Initiate the object to access the method
-    objPrimaryAdjacencyCheck_1 = AdjacentSelectionClass.AdjacentSelectionClass(featureOfFocus, lyrDuplicate, strFirstLevelAdjacencyFieldName)
+    #The secondary adjacency of every feature comes straight from the graph. No temporary feature classes are needed.
+    with objInstrumentation.stage("Secondary adjacency"):
+        dictSecondLevelAdjacency = SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictAdjacency).secondLevelAdjacency()
 
-    #Run the selectAdjacent() method to return a selection
-    adjacentFeaturesSelection_1 = objPrimaryAdjacencyCheck_1.selectAdjacent()
+    #Accumulate results for every feature and write them back in a single pass at the end. One summary message replaces
+    #   the four messages that were sent for every feature.
+    with objInstrumentation.stage("First level adjacency"):
+        #The number of primary adjacent features is the degree of the feature in the graph
+        dictFirstLevelAdjacency = dict((ID, len(lsNeighbors)) for ID, lsNeighbors in dictAdjacency.items())
+    arcpy.AddMessage("Features processed: " + str(len(dictFirstLevelAdjacency)))
+    arcpy.AddMessage("Max Primary Adjacency Count: " + str(max(dictFirstLevelAdjacency.values() or [0])))
+    arcpy.AddMessage("Max Secondary Adjacency: " + str(max(dictSecondLevelAdjacency.values() or [0])))
 
-    #Count the number of primary adjacent features and write the value to the field
-    intPrimaryAdjacencyCount = arcpy.GetCount_management(adjacentFeaturesSelection_1)
-    arcpy.AddMessage("Primary Adjacency Count: " + str(intPrimaryAdjacencyCount))
-    arcpy.CalculateField_management(in_table=featureOfFocus,
-                                    field=strFirstLevelAdjacencyFieldName,
-                                    expression=intPrimaryAdjacencyCount,
-                                    expression_type="PYTHON",
-                                    code_block=None)
+    #One UpdateCursor pass, ordered by OID, replaces the two CalculateField calls that were made for every feature
+    with objInstrumentation.stage("Write fields"):
+        intRowsWritten = objFieldWriter.writeFields({strFirstLevelAdjacencyFieldName: dictFirstLevelAdjacency,
+                                                     strSecondLevelAdjacencyFieldName: dictSecondLevelAdjacency})
+    objInstrumentation.count("rows written", intRowsWritten)
+    arcpy.AddMessage("Rows written: " + str(intRowsWritten))
 
-    #Capture the selected adjacent features in the duplicate layer and save them as a temporary feature class
-    strTempFCName = "tempFC"
-    arcpy.FeatureClassToFeatureClass_conversion(in_features=adjacentFeaturesSelection_1,
-                                                out_path=arcpy.env.workspace,
-                                                out_name=strTempFCName,
-                                                where_clause=None,
-                                                field_mapping=None,
-                                                config_keyword=None)
+    objInstrumentation.reportSummary()
+    if strRunSummaryFile:
+        objInstrumentation.writeSummary(strRunSummaryFile)
+        arcpy.AddMessage("Run summary saved to " + strRunSummaryFile)
+    objInstrumentation.close()
 
-    if arcpy.Exists("tempFC"):
-        # arcpy.AddMessage("tempFC Exists")
-        lyrAdjacentFeaturesIsolatedMaster = arcpy.MakeFeatureLayer_management(in_features=strTempFCName,
-                                                                              out_layer="SecondLevelMaster",
-                                                                              where_clause=None,
-                                                                              workspace=strScratchWorkspace,
-                                                                              field_info=None)
-        lyrAdjacentFeaturesIsolatedDuplicate = arcpy.MakeFeatureLayer_management(in_features=strTempFCName,
-                                                                                 out_layer="SecondLevelDuplicate",
-                                                                                 where_clause=None,
-                                                                                 workspace=strScratchWorkspace,
-                                                                                 field_info=None)
-    else:
-        arcpy.AddMessage("tempFC Does Not Exist")
-        sys.exit()
 
-    lsObjectID_2 = []
-    try:
-        with arcpy.da.SearchCursor(lyrAdjacentFeaturesIsolatedMaster, lsLayerUniqueIDField[0]) as cursor2:
-            for row in cursor2:
-                lsObjectID_2.append(row[0])
-    except:
-        arcpy.AddWarning("(2) Feature layer may not contain the field " + lsLayerUniqueIDField[0])
-        sys.exit()
-
-    lsSecondarySelectionCounts = []
-    for ID2 in lsObjectID_2:
-        featureOfFocus2 = arcpy.SelectLayerByAttribute_management(in_layer_or_view=lyrAdjacentFeaturesIsolatedMaster,
-                                                                  selection_type="NEW_SELECTION",
-                                                                  where_clause=(lsLayerUniqueIDField[0] + '=' + str(ID2)))
-        objPrimaryAdjacencyCheck_2 = AdjacentSelectionClass.AdjacentSelectionClass(featureOfFocus2,
-                                                                                  lyrAdjacentFeaturesIsolatedDuplicate,
-                                                                                  strSecondLevelAdjacencyFieldName)
-        adjacentFeaturesSelection_2 = objPrimaryAdjacencyCheck_2.selectAdjacent()
-        resultSecondaryAdjacencyCount = arcpy.GetCount_management(adjacentFeaturesSelection_2) #Note: returns a result object, not a value of type number or string
-        strSecondaryAdjacencyCount = str(resultSecondaryAdjacencyCount)
-        intSecondaryAdjacencyCount = int(strSecondaryAdjacencyCount)
-        lsSecondarySelectionCounts.append(intSecondaryAdjacencyCount)
-
-    intSecondaryAdjacencyCountMax = max(lsSecondarySelectionCounts)
-    arcpy.AddMessage("Max Secondary Adjacency: " + str(intSecondaryAdjacencyCountMax))
-    arcpy.CalculateField_management(in_table=featureOfFocus,
-                                    field=strSecondLevelAdjacencyFieldName,
-                                    expression=intSecondaryAdjacencyCountMax,
-                                    expression_type="PYTHON",
-                                    code_block=None)
-    arcpy.AddMessage("Features processed: " + str(intFeatureCount))
-    arcpy.Delete_management(strTempFCName, data_type=None)
-    arcpy.AddMessage("--------")
+if __name__ == "__main__":
+    main()
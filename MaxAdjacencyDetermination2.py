@@ -3,158 +3,118 @@
 # Author:  CJuice
 # Date Created:  09/06/2017
 # Purpose:  Determines the maximum adjacency at a primary and secondary level. Primary is all polygons that share a line segment with the feature of focus. Every feature is iterated over and evaluated. A secondary adjacency is determined by examinging the primary adjacent features for each feature of focus. Each secondary feature is iterated over and it is determined how many of the other secondary features are adjacent to the secondary feature of focus. Both values are written to their own unique field, created during the script.
-# Inputs:  Workspace, Scratch Workspace, Feature Layer of Interest
+# Inputs:  Workspace, Scratch Workspace, Feature Layer of Interest, Adjacency Graph File (optional),
+#           Snapping Tolerance (optional), Run Summary File (optional), Diagnostics (optional: cprofile, tracemalloc)
 # Outputs:  None but messages to the geoprocessing window and an edited feature class.
 # Modifications: Amended the previous version to use in_memory storage for the tempFC rather than writing it to a
 #                   geodatabase. Creating a new feature class is time consumptive.
+#                10/18/2026 - The full shared-edge adjacency graph is built once, in a single pass over the geometries,
+#                   by AdjacencyEngineClass. FirstLevelAdjacency is now the degree of each node rather than the result
+#                   of two SelectLayerByLocation calls per feature. SecondLevelAdjacency is computed from the graph by
+#                   SecondaryAdjacencyClass, so tempFC is no longer written, re-selected and deleted for every feature.
+#                   An optional fourth parameter saves the graph as a CSR adjacency file for later analyses. The map is
+#                   colored from the graph by MapColoringClass. All three fields are written back by FieldWriterClass in
+#                   one UpdateCursor pass instead of two CalculateField calls per feature.
+#                   Fields are only added when missing, so the script can be rerun on the same feature class. Use
+#                   MaxAdjacencyIncrementalUpdate.py to apply a day's edits to the saved graph instead of a full rerun.
+#                   An optional snapping tolerance lets features separated by slivers or digitizing noise count as adjacent.
+#                   Progress is reported every few seconds by InstrumentationClass instead of four messages per feature,
+#                   followed by the time spent in each stage. An optional JSON run summary records stage times and
+#                   counters, and the cProfile or tracemalloc diagnostics when they are switched on.
+#                   The script body is in main() and arcpy is imported there, so the module can be imported without an
+#                   ArcGIS session. ComputeAdjacency.py runs the same stages on files without arcpy.
 ###################################
-import arcpy, sys
 import AdjacentSelectionClass
-
-arcpy.env.overwriteOutput = True
-
-#Establish Variables
-strFirstLevelAdjacencyFieldName = "FirstLevelAdjacency"
-strSecondLevelAdjacencyFieldName = "SecondLevelAdjacency"
-lsLayerUniqueIDField = ['OBJECTID','OID']
-intFeatureCount = 0
-strWorkspace = arcpy.GetParameter(0)
-strScratchWorkspace = arcpy.GetParameter(1)
-strMasterFeatureClass = arcpy.GetParameter(2)
-arcpy.env.workspace = strWorkspace
-
-#Add fields to master feature class
-arcpy.AddField_management(in_table=strMasterFeatureClass,field_name=strFirstLevelAdjacencyFieldName,field_type="SHORT",
-                          field_precision=None,field_scale=None,field_length=None,field_alias=None,
-                          field_is_nullable=None,field_is_required=None,field_domain=None)
-arcpy.AddMessage(strFirstLevelAdjacencyFieldName + " field added")
-arcpy.AddField_management(in_table=strMasterFeatureClass,field_name=strSecondLevelAdjacencyFieldName,field_type="SHORT",
-                          field_precision=None,field_scale=None,field_length=None,field_alias=None,
-                          field_is_nullable=None,field_is_required=None,field_domain=None)
-arcpy.AddMessage(strSecondLevelAdjacencyFieldName + " field added")
-
-#Make a feature layer of the master, and make a copy to serve as the duplicate
-lyrMaster = arcpy.MakeFeatureLayer_management(in_features=strMasterFeatureClass,
-                                              out_layer="Master",
-                                              where_clause=None,
-                                              workspace=strScratchWorkspace,
-                                              field_info=None)
-lyrDuplicate = arcpy.MakeFeatureLayer_management(in_features=strMasterFeatureClass,
-                                                 out_layer="Duplicate",
-                                                 where_clause=None,
-                                                 workspace=strScratchWorkspace,
-                                                 field_info=None)
-
-#Iterates through features in master, selecting all adjacent, return selection
-lsObjectID = []
-try:
-    with arcpy.da.SearchCursor(lyrMaster, lsLayerUniqueIDField[0]) as cursor:
-        for row in cursor:
-            lsObjectID.append(row[0])
-except:
-    arcpy.AddWarning("(1) Feature layer may not contain the field " + lsLayerUniqueIDField[0])
-    sys.exit()
-
-for ID in lsObjectID:
-    intFeatureCount+=1
-    #Select a feature based on its ObjectID
-    featureOfFocus = arcpy.SelectLayerByAttribute_management(in_layer_or_view=lyrMaster,
-                                                             selection_type="NEW_SELECTION",
-                                                             where_clause=(lsLayerUniqueIDField[0] + '=' + str(ID)))
-
-    #Initiate the object to access the method
-    objPrimaryAdjacencyCheck_1 = AdjacentSelectionClass.AdjacentSelectionClass(featureOfFocus, lyrDuplicate, strFirstLevelAdjacencyFieldName)
-
-    #Run the selectAdjacent() method to return a selection
-    adjacentFeaturesSelection_1 = objPrimaryAdjacencyCheck_1.selectAdjacent()
-
-    #Count the number of primary adjacent features and write the value to the field
-    intPrimaryAdjacencyCount = arcpy.GetCount_management(adjacentFeaturesSelection_1)
-    arcpy.AddMessage("Primary Adjacency Count: " + str(intPrimaryAdjacencyCount))
-    arcpy.CalculateField_management(in_table=featureOfFocus,
-                                    field=strFirstLevelAdjacencyFieldName,
-                                    expression=intPrimaryAdjacencyCount,
-                                    expression_type="PYTHON",
-                                    code_block=None)
-
-    #Capture the selected adjacent features in the duplicate layer and save them as a temporary feature class
-    strTempFCName = "tempFC"
-        #Using in_memory, instead of creating a feature class in a gdb, to speed up the process.
-    arcpy.FeatureClassToFeatureClass_conversion(in_features=adjacentFeaturesSelection_1,
-                                                out_path="in_memory",
-                                                out_name=strTempFCName,
-                                                where_clause=None,
-                                                field_mapping=None,
-                                                config_keyword=None)
-
-        #The workspace environment defined at the start creates an issue. Change it to in_memory before running this next part.
-    arcpy.env.workspace = "in_memory"
-    if arcpy.Exists("tempFC"):
-        lyrAdjacentFeaturesIsolatedMaster = arcpy.MakeFeatureLayer_management(in_features=strTempFCName,
-                                                                              out_layer="SecondLevelMaster",
-                                                                              where_clause=None,
-                                                                              workspace=strScratchWorkspace,
-                                                                              field_info=None)
-        lyrAdjacentFeaturesIsolatedDuplicate = arcpy.MakeFeatureLayer_management(in_features=strTempFCName,
-                                                                                 out_layer="SecondLevelDuplicate",
-                                                                                 where_clause=None,
-                                                                                 workspace=strScratchWorkspace,
-                                                                                 field_info=None)
-    else:
-        arcpy.AddMessage("tempFC Does Not Exist")
-        sys.exit()
-
-    #Most feature classes have an 'OBJECTID' field. Some, including in_memory, have 'OID'. The code must account for this difference.
-    desc = arcpy.Describe(strTempFCName)
-    lsFields = desc.fields
-    lsFieldNames = []
-    for field in lsFields:
-        lsFieldNames.append(field.name)
-    strUniqueIDField = ""
-    if lsLayerUniqueIDField[0] in lsFieldNames:
-        strUniqueIDField = lsLayerUniqueIDField[0]
-    elif lsLayerUniqueIDField[1] in lsFieldNames:
-        strUniqueIDField = lsLayerUniqueIDField[1]
-    else:
-        arcpy.AddWarning("Neither OBJECTID nor OID exists.")
-        sys.exit()
-
-    #Make a list of the numeric values in the object ID field for later use in selectlayerbyattribute
-    lsObjectID_2 = []
-    try:
-        with arcpy.da.SearchCursor(lyrAdjacentFeaturesIsolatedMaster, strUniqueIDField) as cursor2:
-            for row in cursor2:
-                lsObjectID_2.append(row[0])
-    except:
-        arcpy.AddWarning("(2) Feature layer may not contain the field " + strUniqueIDField)
-        sys.exit()
-
-    #Step through the list of id's and use them to select the master feature. The, select all that are adjacent. The data in this
-    #   loop is the primary adjacent features, so it's a small subset of the entire feature class.
-    lsSecondarySelectionCounts = []
-    for ID2 in lsObjectID_2:
-        featureOfFocus2 = arcpy.SelectLayerByAttribute_management(in_layer_or_view=lyrAdjacentFeaturesIsolatedMaster,
-                                                                  selection_type="NEW_SELECTION",
-                                                                  where_clause=(strUniqueIDField + '=' + str(ID2)))
-        objPrimaryAdjacencyCheck_2 = AdjacentSelectionClass.AdjacentSelectionClass(featureOfFocus2,
-                                                                                  lyrAdjacentFeaturesIsolatedDuplicate,
-                                                                                  strSecondLevelAdjacencyFieldName)
-        adjacentFeaturesSelection_2 = objPrimaryAdjacencyCheck_2.selectAdjacent()
-        resultSecondaryAdjacencyCount = arcpy.GetCount_management(adjacentFeaturesSelection_2) #Note: returns a result object, not a value of type number or string
-        strSecondaryAdjacencyCount = str(resultSecondaryAdjacencyCount)
-        intSecondaryAdjacencyCount = int(strSecondaryAdjacencyCount)
-        lsSecondarySelectionCounts.append(intSecondaryAdjacencyCount)
-
-    intSecondaryAdjacencyCountMax = max(lsSecondarySelectionCounts)
-    arcpy.AddMessage("Max Secondary Adjacency: " + str(intSecondaryAdjacencyCountMax))
-    arcpy.CalculateField_management(in_table=featureOfFocus,
-                                    field=strSecondLevelAdjacencyFieldName,
-                                    expression=intSecondaryAdjacencyCountMax,
-                                    expression_type="PYTHON",
-                                    code_block=None)
-    arcpy.AddMessage("Feature Count: " + str(intFeatureCount))
-    arcpy.Delete_management("in_memory", data_type=None)
-    arcpy.AddMessage("--------")
-
-
-# TODO: Code breaking down after this point.
+import InstrumentationClass
+import SecondaryAdjacencyClass
+import FieldWriterClass
+import CSRAdjacencyClass
+import MapColoringClass
+
+
+def main():
+    import arcpy
+    arcpy.env.overwriteOutput = True
+
+    #Establish Variables
+    strFirstLevelAdjacencyFieldName = "FirstLevelAdjacency"
+    strSecondLevelAdjacencyFieldName = "SecondLevelAdjacency"
+    strColorIndexFieldName = "ColorIndex"
+    strWorkspace = arcpy.GetParameter(0)
+    strScratchWorkspace = arcpy.GetParameter(1)
+    strMasterFeatureClass = arcpy.GetParameter(2)
+    strAdjacencyGraphFile = arcpy.GetParameterAsText(3)
+    fltSnappingTolerance = float(arcpy.GetParameterAsText(4) or 0)
+    strRunSummaryFile = arcpy.GetParameterAsText(5)
+    strDiagnostics = arcpy.GetParameterAsText(6).lower()
+    arcpy.env.workspace = strWorkspace
+    objInstrumentation = InstrumentationClass.InstrumentationClass(arcpy.AddMessage,
+                                                                   blnProfile="cprofile" in strDiagnostics,
+                                                                   blnTraceMemory="tracemalloc" in strDiagnostics)
+
+    #Add any of the fields the master feature class does not have yet. Reruns leave existing fields alone.
+    objFieldWriter = FieldWriterClass.ArcpyFieldWriter(strMasterFeatureClass)
+    for strFieldName in objFieldWriter.ensureFields({strFirstLevelAdjacencyFieldName: "SHORT",
+                                                     strSecondLevelAdjacencyFieldName: "SHORT",
+                                                     strColorIndexFieldName: "SHORT"}):
+        arcpy.AddMessage(strFieldName + " field added")
+
+    #Make a feature layer of the master
+    lyrMaster = arcpy.MakeFeatureLayer_management(in_features=strMasterFeatureClass,
+                                                  out_layer="Master",
+                                                  where_clause=None,
+                                                  workspace=strScratchWorkspace,
+                                                  field_info=None)
+
+    #Read every geometry once and build the full shared-edge adjacency graph in a single pass
+    with objInstrumentation.stage("Adjacency graph"):
+        objAdjacencyEngine = AdjacentSelectionClass.AdjacentSelectionClass.buildAdjacencyEngine(lyrMaster, fltSnappingTolerance,
+                                                                                                objInstrumentation)
+        dictAdjacency = objAdjacencyEngine.buildAdjacency()
+
+    #Persist the graph so later analyses can memory-map it instead of rediscovering it from geometry
+    if strAdjacencyGraphFile:
+        with objInstrumentation.stage("Save graph"):
+            #The tolerance is saved with the graph, so MaxAdjacencyIncrementalUpdate.py patches it the same way
+            CSRAdjacencyClass.CSRAdjacencyClass.fromAdjacencyDict(dictAdjacency, fltSnappingTolerance).save(strAdjacencyGraphFile)
+        arcpy.AddMessage("Adjacency graph saved to " + strAdjacencyGraphFile)
+
+    #The secondary adjacency of every feature comes straight from the graph. No temporary feature classes are needed.
+    with objInstrumentation.stage("Secondary adjacency"):
+        dictSecondLevelAdjacency = SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictAdjacency).secondLevelAdjacency()
+
+    #Color the map from the graph. No two features sharing a line segment get the same color index.
+    with objInstrumentation.stage("Map coloring"):
+        dictColorIndex = MapColoringClass.MapColoringClass(dictAdjacency).colorMap()
+    arcpy.AddMessage("Colors used: " + str(MapColoringClass.MapColoringClass.colorCount(dictColorIndex)))
+    lsShortfall = MapColoringClass.MapColoringClass.shortfall(dictColorIndex)
+    if lsShortfall:
+        arcpy.AddWarning("Features the repair could not bring under 4 colors: " +
+                         ", ".join(str(ID) for ID in lsShortfall[:20]))
+
+    #Accumulate results for every feature and write them back in a single pass at the end. One summary message replaces
+    #   the four messages that were sent for every feature.
+    with objInstrumentation.stage("First level adjacency"):
+        #The number of primary adjacent features is the degree of the feature in the graph
+        dictFirstLevelAdjacency = dict((ID, len(lsNeighbors)) for ID, lsNeighbors in dictAdjacency.items())
+    arcpy.AddMessage("Features processed: " + str(len(dictFirstLevelAdjacency)))
+    arcpy.AddMessage("Max Primary Adjacency Count: " + str(max(dictFirstLevelAdjacency.values() or [0])))
+    arcpy.AddMessage("Max Secondary Adjacency: " + str(max(dictSecondLevelAdjacency.values() or [0])))
+
+    #One UpdateCursor pass, ordered by OID, replaces the two CalculateField calls that were made for every feature
+    with objInstrumentation.stage("Write fields"):
+        intRowsWritten = objFieldWriter.writeFields({strFirstLevelAdjacencyFieldName: dictFirstLevelAdjacency,
+                                                     strSecondLevelAdjacencyFieldName: dictSecondLevelAdjacency,
+                                                     strColorIndexFieldName: dictColorIndex})
+    objInstrumentation.count("rows written", intRowsWritten)
+    arcpy.AddMessage("Rows written: " + str(intRowsWritten))
+
+    objInstrumentation.reportSummary()
+    if strRunSummaryFile:
+        objInstrumentation.writeSummary(strRunSummaryFile)
+        arcpy.AddMessage("Run summary saved to " + strRunSummaryFile)
+    objInstrumentation.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+###################################
+# Script:  MaxAdjacencyIncrementalUpdate.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Applies a day's edits to the adjacency graph saved by MaxAdjacencyDetermination2.py instead of recomputing
+#           every feature. Only the features near the edits are read, and only the rows whose FirstLevelAdjacency or
+#           SecondLevelAdjacency may have changed are written. The changeset is a JSON file of
+#           {"inserted": {OBJECTID: geometry}, "updated": {OBJECTID: geometry}, "deleted": [OBJECTID]}. A null geometry
+#           means "read the current geometry of this OBJECTID from the feature class". Edits are matched with the
+#           snapping tolerance saved in the graph file, so the patched graph agrees with a full rerun.
+# Inputs:  Feature Layer of Interest, Adjacency Graph File, Changeset File, Run Summary File (optional),
+#           Diagnostics (optional: cprofile, tracemalloc)
+# Outputs:  Messages to the geoprocessing window, an updated graph file and an edited feature class.
+# Modifications: 10/18/2026 - Stage times, spatial queries and rows written are reported by InstrumentationClass, and can
+#                   be saved as a JSON run summary. The script body is in main() and arcpy is imported there.
+#                   Changes are applied with the snapping tolerance stored in the graph file. A changed feature whose
+#                   shape is null is kept with no neighbors.
+###################################
+import AdjacentSelectionClass
+import CSRAdjacencyClass
+import FieldWriterClass
+import IncrementalAdjacencyClass
+import InstrumentationClass
+
+
+def main():
+    import arcpy
+    #Establish Variables
+    strFirstLevelAdjacencyFieldName = "FirstLevelAdjacency"
+    strSecondLevelAdjacencyFieldName = "SecondLevelAdjacency"
+    strMasterFeatureClass = arcpy.GetParameter(0)
+    strAdjacencyGraphFile = arcpy.GetParameterAsText(1)
+    strChangesetFile = arcpy.GetParameterAsText(2)
+    strRunSummaryFile = arcpy.GetParameterAsText(3)
+    strDiagnostics = arcpy.GetParameterAsText(4).lower()
+    objInstrumentation = InstrumentationClass.InstrumentationClass(arcpy.AddMessage,
+                                                                   blnProfile="cprofile" in strDiagnostics,
+                                                                   blnTraceMemory="tracemalloc" in strDiagnostics)
+
+    dictChangeset = IncrementalAdjacencyClass.loadChangeset(strChangesetFile)
+
+    #Fill in geometries the changeset left out from the feature class, in one cursor pass
+    lsMissingIDs = [ID for strKey in ("inserted", "updated") for ID, geometry in dictChangeset[strKey].items() if geometry is None]
+    if lsMissingIDs:
+        strOIDField = arcpy.Describe(strMasterFeatureClass).OIDFieldName
+        strWhereClause = strOIDField + " IN (" + ",".join(str(ID) for ID in lsMissingIDs) + ")"
+        with objInstrumentation.stage("Read changed geometries"):
+            with arcpy.da.SearchCursor(strMasterFeatureClass, ["OID@", "SHAPE@JSON"], where_clause=strWhereClause) as cursor:
+                for row in objInstrumentation.track(cursor, "Read changed geometries", len(lsMissingIDs), "cursor rows read"):
+                    strKey = "inserted" if row[0] in dictChangeset["inserted"] else "updated"
+                    dictChangeset[strKey][row[0]] = AdjacentSelectionClass.geometryFromShapeJSON(row[1])
+
+    with objInstrumentation.stage("Apply changes"):
+        with CSRAdjacencyClass.CSRAdjacencyClass.load(strAdjacencyGraphFile) as objGraph:
+            fltSnappingTolerance = objGraph.fltTolerance
+            objIncremental = IncrementalAdjacencyClass.IncrementalAdjacencyClass(
+                objGraph, AdjacentSelectionClass.AdjacentSelectionClass.candidateFetcher(strMasterFeatureClass, objInstrumentation),
+                fltTolerance=fltSnappingTolerance)
+        dictFirstLevelAdjacency, dictSecondLevelAdjacency = objIncremental.applyChanges(dictChangeset["inserted"],
+                                                                                        dictChangeset["updated"],
+                                                                                        dictChangeset["deleted"])
+    arcpy.AddMessage("Features affected: " + str(len(dictSecondLevelAdjacency)))
+    if fltSnappingTolerance:
+        arcpy.AddMessage("Snapping tolerance from the graph file: " + str(fltSnappingTolerance))
+
+    with objInstrumentation.stage("Save graph"):
+        CSRAdjacencyClass.CSRAdjacencyClass.fromAdjacencyDict(objIncremental.adjacency(), fltSnappingTolerance).save(strAdjacencyGraphFile)
+    arcpy.AddMessage("Adjacency graph saved to " + strAdjacencyGraphFile)
+
+    objFieldWriter = FieldWriterClass.ArcpyFieldWriter(strMasterFeatureClass)
+    for strFieldName in objFieldWriter.ensureFields({strFirstLevelAdjacencyFieldName: "SHORT",
+                                                     strSecondLevelAdjacencyFieldName: "SHORT"}):
+        arcpy.AddMessage(strFieldName + " field added")
+    with objInstrumentation.stage("Write fields"):
+        intRowsWritten = objFieldWriter.writeFields({strFirstLevelAdjacencyFieldName: dictFirstLevelAdjacency,
+                                                     strSecondLevelAdjacencyFieldName: dictSecondLevelAdjacency})
+    objInstrumentation.count("rows written", intRowsWritten)
+    arcpy.AddMessage("Rows written: " + str(intRowsWritten))
+
+    objInstrumentation.reportSummary()
+    if strRunSummaryFile:
+        objInstrumentation.writeSummary(strRunSummaryFile)
+        arcpy.AddMessage("Run summary saved to " + strRunSummaryFile)
+    objInstrumentation.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+###################################
+# Script:  NeighborhoodMetricsClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Generalizes SecondLevelAdjacency past one extra hop. For a feature U and a level k, B(U, k) is the set of
+#           features within k hops of U, U excluded. The metrics are:
+#               reach       - how many features are exactly 1, 2, ... k hops away
+#               max common  - the max, over V in B(U, k), of |B(U, k) & N(V)|. At k = 1 this is SecondLevelAdjacency.
+#               clique size - the largest set of mutually adjacent features among U and B(U, k)
+#           Neighbor sets, pairwise intersection counts and k-hop balls are kept in bounded least recently used caches.
+#           Neighboring features ask for nearly the same sets, so most requests are served from memory, and a
+#           CSRAdjacencyClass file is decoded once per node instead of once per request. The caches keep memory flat
+#           however large the layer or k.
+# Inputs:  Dictionary of OBJECTID to adjacent OBJECTIDs, or a CSRAdjacencyClass, and a level
+# Outputs:  Dictionaries of OBJECTID to metric values
+# Modifications:
+###################################
+import collections
+
+
+class BoundedCacheClass(object):
+    '''Least recently used cache holding at most intMaxSize entries. A size of 0 turns caching off.'''
+    def __init__(self, intMaxSize):
+        self.intMaxSize = intMaxSize
+        self.dictEntries = collections.OrderedDict()
+        self.intHits = 0
+        self.intMisses = 0
+
+    def get(self, key, fnCompute, *args):
+        '''Return the cached value for key, or compute it with fnCompute(*args) and store it'''
+        dictEntries = self.dictEntries
+        if key in dictEntries:
+            self.intHits += 1
+            dictEntries.move_to_end(key)
+            return dictEntries[key]
+        self.intMisses += 1
+        value = fnCompute(*args)
+        if self.intMaxSize > 0:
+            dictEntries[key] = value
+            if len(dictEntries) > self.intMaxSize:
+                dictEntries.popitem(last=False)
+        return value
+
+    def info(self):
+        return {"hits": self.intHits, "misses": self.intMisses, "size": len(self.dictEntries), "max_size": self.intMaxSize}
+
+
+def _maxClique(dictLocal, setCandidates, intSize, intBest):
+    #Branch and bound: grow the clique one candidate at a time and stop once the candidates left cannot beat the best
+    #   size found. Map graphs are planar, so cliques stay at four or fewer and the search is shallow.
+    while setCandidates:
+        if intSize + len(setCandidates) <= intBest:
+            return intBest
+        intNode = setCandidates.pop()
+        intBest = _maxClique(dictLocal, setCandidates & dictLocal[intNode], intSize + 1, intBest)
+    return max(intBest, intSize)
+
+
+class NeighborhoodMetricsClass(object):
+    '''k-hop neighborhood metrics over an adjacency graph, served from bounded caches'''
+    def __init__(self, dictAdjacency, intCacheSize=65536):
+        self.dictAdjacency = dictAdjacency
+        self.cacheNeighbors = BoundedCacheClass(intCacheSize)
+        self.cacheIntersections = BoundedCacheClass(intCacheSize)
+        self.cacheBalls = BoundedCacheClass(intCacheSize)
+
+    def neighbors(self, intOID):
+        '''Return the features sharing a line segment with intOID as a frozenset'''
+        return self.cacheNeighbors.get(intOID, self._readNeighbors, intOID)
+
+    def _readNeighbors(self, intOID):
+        return frozenset(self.dictAdjacency[intOID])
+
+    def commonNeighborCount(self, intOIDA, intOIDB):
+        '''Return how many features are adjacent to both features. The count is cached once per pair.'''
+        tupKey = (intOIDA, intOIDB) if intOIDA < intOIDB else (intOIDB, intOIDA)
+        return self.cacheIntersections.get(tupKey, self._countCommon, intOIDA, intOIDB)
+
+    def _countCommon(self, intOIDA, intOIDB):
+        return len(self.neighbors(intOIDA) & self.neighbors(intOIDB))
+
+    def _ball(self, intOID, intK):
+        #(features within intK hops, count of features at each hop distance), by breadth first search
+        setBall = set()
+        setFrontier = {intOID}
+        lsLevelCounts = []
+        for intLevel in range(intK):
+            setNext = set()
+            for intFrontierOID in setFrontier:
+                setNext.update(self.neighbors(intFrontierOID))
+            setNext.difference_update(setBall)
+            setNext.discard(intOID)
+            if not setNext:
+                break
+            setBall.update(setNext)
+            lsLevelCounts.append(len(setNext))
+            setFrontier = setNext
+        lsLevelCounts.extend([0] * (intK - len(lsLevelCounts)))
+        return frozenset(setBall), tuple(lsLevelCounts)
+
+    def khopNeighbors(self, intOID, intK=1):
+        '''Return the features within intK hops of intOID, intOID excluded'''
+        if intK == 1:
+            return self.neighbors(intOID)
+        return self.cacheBalls.get((intOID, intK), self._ball, intOID, intK)[0]
+
+    def reachCounts(self, intOID, intK=2):
+        '''Return how many features are exactly 1, 2, ... intK hops from intOID'''
+        return self.cacheBalls.get((intOID, intK), self._ball, intOID, intK)[1]
+
+    def maxCommonNeighbors(self, intOID, intK=1):
+        '''Return the largest number of neighbors any feature within intK hops has inside that same neighborhood'''
+        if intK == 1:
+            #Served from the pairwise cache, so each shared edge is intersected once for both of its features
+            return max([self.commonNeighborCount(intOID, intNeighborOID) for intNeighborOID in self.neighbors(intOID)] or [0])
+        setBall = self.khopNeighbors(intOID, intK)
+        return max([len(self.neighbors(intBallOID) & setBall) for intBallOID in setBall] or [0])
+
+    def cliqueSize(self, intOID, intK=1):
+        '''Return the size of the largest clique among intOID and the features within intK hops of it'''
+        setNodes = self.khopNeighbors(intOID, intK) | {intOID}
+        #The neighborhood is small, so the search runs on its own induced subgraph rather than through the caches
+        dictLocal = dict((intNode, self.neighbors(intNode) & setNodes) for intNode in setNodes)
+        return _maxClique(dictLocal, set(setNodes), 0, 0)
+
+    def metrics(self, iterOIDs=None, intK=2):
+        '''Return {OBJECTID: {"reach": [...], "max_common": n, "clique": n}} for the given features, or all of them'''
+        if iterOIDs is None:
+            iterOIDs = iter(self.dictAdjacency)
+        dictMetrics = {}
+        for intOID in iterOIDs:
+            dictMetrics[intOID] = {"reach": list(self.reachCounts(intOID, intK)),
+                                   "max_common": self.maxCommonNeighbors(intOID, intK),
+                                   "clique": self.cliqueSize(intOID, intK)}
+        return dictMetrics
+
+    def cacheInfo(self):
+        '''Return hit and miss counts of each cache'''
+        return {"neighbors": self.cacheNeighbors.info(), "intersections": self.cacheIntersections.info(),
+                "balls": self.cacheBalls.info()}
@@ -0,0 +1,102 @@
+###################################
+# Script:  ParallelAdjacencyClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Builds the shared-edge adjacency graph of a very large layer across worker processes. The layer extent is
+#           cut into a grid of tiles. A feature goes to every tile its envelope touches, after the tile is grown by a
+#           halo, so each tile's engine sees the whole geometry of every feature near it. Each worker runs
+#           AdjacencyEngineClass on one tile and returns the adjacent pairs. The collinear overlap search is limited to
+#           segments touching the tile. Within that area, "no exact partner" means the same thing as it does over the
+#           whole layer. The pair sets are merged, duplicates dropped, and expanded into the same dictionary the serial
+#           engine returns, so the result is identical to AdjacencyEngineClass.buildAdjacency().
+# Inputs:  (OBJECTID, geometry) pairs in any form AdjacencyEngineClass accepts
+# Outputs:  Dictionary of OBJECTID to sorted list of adjacent OBJECTIDs
+# Modifications:
+###################################
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import AdjacencyEngineClass
+
+
+def _tileAdjacentPairs(lsTileFeatures, tupEnvelope, blnCollinearOverlap, fltEpsilon, fltTolerance):
+    #Runs in a worker process. Features arrive already normalized to rings.
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass(blnCollinearOverlap, fltEpsilon, fltTolerance)
+    objEngine.addFeatures(lsTileFeatures)
+    return objEngine.adjacentPairs(tupEnvelope)
+
+
+def _ringsEnvelope(lsRings):
+    lsX = [tupPoint[0] for lsRing in lsRings for tupPoint in lsRing]
+    lsY = [tupPoint[1] for lsRing in lsRings for tupPoint in lsRing]
+    return (min(lsX), min(lsY), max(lsX), max(lsY))
+
+
+class ParallelAdjacencyClass(object):
+    '''Computes the shared-edge adjacency graph tile by tile in a pool of worker processes'''
+    def __init__(self, intWorkers=None, intTilesPerSide=None, fltHalo=None, blnCollinearOverlap=True, fltEpsilon=1e-9,
+                 fltTolerance=0.0):
+        self.intWorkers = intWorkers or os.cpu_count() or 1
+        #A few tiles per worker keeps the pool busy when some tiles are much denser than others
+        self.intTilesPerSide = intTilesPerSide or max(1, int(math.ceil(math.sqrt(self.intWorkers * 4))))
+        self.fltHalo = fltHalo
+        self.blnCollinearOverlap = blnCollinearOverlap
+        self.fltEpsilon = fltEpsilon
+        self.fltTolerance = fltTolerance
+
+    def tileFeatures(self, lsFeatures):
+        '''Return a list of (tile envelope, [(OBJECTID, rings), ...]) for every tile holding at least one feature'''
+        lsEnvelopes = [_ringsEnvelope(lsRings) if lsRings else None for intOID, lsRings in lsFeatures]
+        lsKnown = [tupEnvelope for tupEnvelope in lsEnvelopes if tupEnvelope is not None]
+        if not lsKnown:
+            return []
+        fltXMin = min(tupEnvelope[0] for tupEnvelope in lsKnown)
+        fltYMin = min(tupEnvelope[1] for tupEnvelope in lsKnown)
+        fltXMax = max(tupEnvelope[2] for tupEnvelope in lsKnown)
+        fltYMax = max(tupEnvelope[3] for tupEnvelope in lsKnown)
+        intSide = self.intTilesPerSide
+        fltTileWidth = ((fltXMax - fltXMin) / intSide) or 1.0
+        fltTileHeight = ((fltYMax - fltYMin) / intSide) or 1.0
+        fltHalo = self.fltHalo
+        if fltHalo is None:
+            #Enough to absorb rounding at tile edges, plus two snapping steps so snapped near-misses share a tile
+            fltHalo = self.fltEpsilon * max(1.0, fltXMax - fltXMin, fltYMax - fltYMin) + 2 * self.fltTolerance
+
+        dictTiles = {}
+        for (intOID, lsRings), tupEnvelope in zip(lsFeatures, lsEnvelopes):
+            if tupEnvelope is None:
+                continue
+            intColumnMin = max(0, int(math.floor((tupEnvelope[0] - fltHalo - fltXMin) / fltTileWidth)))
+            intColumnMax = min(intSide - 1, int(math.floor((tupEnvelope[2] + fltHalo - fltXMin) / fltTileWidth)))
+            intRowMin = max(0, int(math.floor((tupEnvelope[1] - fltHalo - fltYMin) / fltTileHeight)))
+            intRowMax = min(intSide - 1, int(math.floor((tupEnvelope[3] + fltHalo - fltYMin) / fltTileHeight)))
+            for intColumn in range(intColumnMin, intColumnMax + 1):
+                for intRow in range(intRowMin, intRowMax + 1):
+                    dictTiles.setdefault((intColumn, intRow), []).append((intOID, lsRings))
+
+        lsTiles = []
+        for (intColumn, intRow), lsTileFeatures in sorted(dictTiles.items()):
+            tupEnvelope = (fltXMin + intColumn * fltTileWidth - fltHalo, fltYMin + intRow * fltTileHeight - fltHalo,
+                           fltXMin + (intColumn + 1) * fltTileWidth + fltHalo, fltYMin + (intRow + 1) * fltTileHeight + fltHalo)
+            lsTiles.append((tupEnvelope, lsTileFeatures))
+        return lsTiles
+
+    def buildAdjacency(self, iterFeatures):
+        '''Return a dictionary of OBJECTID to the sorted list of OBJECTIDs sharing a line segment with it'''
+        lsFeatures = [(intOID, AdjacencyEngineClass.ringsFromGeometry(geometry)) for intOID, geometry in iterFeatures]
+        lsTiles = self.tileFeatures(lsFeatures)
+        setPairs = set()
+        if self.intWorkers == 1 or len(lsTiles) < 2:
+            for tupEnvelope, lsTileFeatures in lsTiles:
+                setPairs.update(_tileAdjacentPairs(lsTileFeatures, tupEnvelope, self.blnCollinearOverlap, self.fltEpsilon,
+                                                   self.fltTolerance))
+        else:
+            with ProcessPoolExecutor(max_workers=self.intWorkers) as executor:
+                lsFutures = [executor.submit(_tileAdjacentPairs, lsTileFeatures, tupEnvelope, self.blnCollinearOverlap,
+                                             self.fltEpsilon, self.fltTolerance) for tupEnvelope, lsTileFeatures in lsTiles]
+                for future in lsFutures:
+                    #Cross-tile edges come back from every tile that holds both features. The set keeps one copy.
+                    setPairs.update(future.result())
+        return AdjacencyEngineClass.AdjacencyEngineClass.adjacencyFromPairs([intOID for intOID, lsRings in lsFeatures],
+                                                                             setPairs)
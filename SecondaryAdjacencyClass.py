@@ -0,0 +1,50 @@
+###################################
+# Script:  SecondaryAdjacencyClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Determines the secondary (second level) adjacency of every feature from an adjacency structure alone, with
+#           no geometry I/O. For a feature of focus U with primary adjacent set N(U), each primary neighbor V is adjacent
+#           to |N(U) & N(V)| of the other primary neighbors, which is exactly what the per-feature tempFC loop counted.
+#           The secondary adjacency of U is the maximum of that count over its primary neighbors. The count is
+#           symmetric, so each shared edge is intersected once and credited to both of its features.
+# Inputs:  Dictionary of OBJECTID to list of adjacent OBJECTIDs, such as AdjacencyEngineClass.buildAdjacency() returns
+# Outputs:  Dictionary of OBJECTID to secondary adjacency count
+# Modifications:
+###################################
+class SecondaryAdjacencyClass(object):
+    '''Computes the secondary adjacency of every feature from the in-memory adjacency graph'''
+    def __init__(self, dictAdjacency):
+        self.dictAdjacency = dictAdjacency
+
+    def commonNeighborCount(self, intOIDA, intOIDB):
+        '''Return how many features are adjacent to both features'''
+        return len(set(self.dictAdjacency[intOIDA]).intersection(self.dictAdjacency[intOIDB]))
+
+    def secondLevelAdjacency(self):
+        '''Return a dictionary of OBJECTID to the max, over its primary neighbors, of their shared neighbor count'''
+        dictAdjacency = self.dictAdjacency
+        dictNeighborSets = dict((intOID, frozenset(lsNeighbors)) for intOID, lsNeighbors in dictAdjacency.items())
+        dictSecondLevel = dict.fromkeys(dictAdjacency, 0)
+        for intOID, setNeighbors in dictNeighborSets.items():
+            intBest = dictSecondLevel[intOID]
+            for intNeighborOID in dictAdjacency[intOID]:
+                #Visit each edge once, from its lesser end, and credit the count to both ends
+                if intNeighborOID <= intOID:
+                    continue
+                intCommon = len(setNeighbors & dictNeighborSets[intNeighborOID])
+                if intCommon > intBest:
+                    intBest = intCommon
+                if intCommon > dictSecondLevel[intNeighborOID]:
+                    dictSecondLevel[intNeighborOID] = intCommon
+            dictSecondLevel[intOID] = intBest
+        return dictSecondLevel
+
+    def secondLevelAdjacencyFor(self, iterOIDs):
+        '''Return the secondary adjacency of just the given features, for updating a few rows after an edit'''
+        dictAdjacency = self.dictAdjacency
+        dictSecondLevel = {}
+        for intOID in iterOIDs:
+            setNeighbors = frozenset(dictAdjacency[intOID])
+            dictSecondLevel[intOID] = max([len(setNeighbors.intersection(dictAdjacency[intNeighborOID]))
+                                           for intNeighborOID in setNeighbors] or [0])
+        return dictSecondLevel
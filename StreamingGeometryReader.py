@@ -0,0 +1,250 @@
+###################################
+# Script:  StreamingGeometryReader.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Generators that read polygon features one record at a time and yield (OBJECTID, rings). They feed
+#           AdjacencyEngineClass.addFeatures() directly, so a layer is never held in memory as a whole. With a
+#           snapping tolerance the engine keeps only its edge table, which lets layers larger than RAM be processed.
+#           Formats: GeoJSON FeatureCollections, read incrementally out of the "features" array; newline-delimited
+#           GeoJSON; WKB records from any source; GeoPackage tables; and Shapefiles, read from the .shp alone.
+# Inputs:  File paths, or an iterable of (OBJECTID, WKB bytes) for readWKBFeatures()
+# Outputs:  Generators of (OBJECTID, list of rings of (x, y) tuples)
+# Modifications: 10/18/2026 - GeoJSON files are parsed member by member, so only the top-level "features" array
+#                   is streamed, and newline-delimited files are recognized by the type of their first record.
+###################################
+import json
+import sqlite3
+import struct
+
+import AdjacencyEngineClass
+
+intChunkSize = 1 << 20
+decoderJSON = json.JSONDecoder()
+
+
+def featureOID(dictFeature, strOIDField, intPosition):
+    '''Return the OBJECTID of a GeoJSON feature: the strOIDField property, then the feature id, then intPosition, the
+    1-based position of the feature in the file. An id that is not an integer, such as "c1", falls back to the position.
+    FieldWriterClass.GeoJSONFieldWriter matches features the same way.'''
+    dictProperties = dictFeature.get("properties") or {}
+    if dictProperties.get(strOIDField) is not None:
+        return int(dictProperties[strOIDField])
+    try:
+        return int(dictFeature["id"])
+    except (KeyError, TypeError, ValueError):
+        return intPosition
+
+
+class _JSONBufferClass(object):
+    '''Decodes JSON values one at a time from a text file, holding about one chunk of text plus the value being read'''
+    #Record separators start each record of a GeoJSON text sequence (RFC 8142), so they are skipped like whitespace
+    strWhitespace = " \t\r\n\x1e"
+
+    def __init__(self, fileJSON):
+        self.fileJSON = fileJSON
+        self.strBuffer = ""
+        self.intPosition = 0
+        self.blnEndOfFile = False
+
+    def _fill(self):
+        #Drop what has been parsed and read another chunk. Return False at the end of the file.
+        strChunk = self.fileJSON.read(intChunkSize)
+        self.strBuffer = self.strBuffer[self.intPosition:] + strChunk
+        self.intPosition = 0
+        self.blnEndOfFile = not strChunk
+        return not self.blnEndOfFile
+
+    def peek(self):
+        '''Skip whitespace and return the next character, or "" at the end of the file'''
+        while True:
+            while self.intPosition < len(self.strBuffer) and self.strBuffer[self.intPosition] in self.strWhitespace:
+                self.intPosition += 1
+            if self.intPosition < len(self.strBuffer):
+                return self.strBuffer[self.intPosition]
+            if not self._fill():
+                return ""
+
+    def take(self, strExpected):
+        '''Consume the next character, which must be strExpected'''
+        strNext = self.peek()
+        if strNext != strExpected:
+            raise ValueError("Expected " + repr(strExpected) + " in GeoJSON, found " + repr(strNext or "end of file"))
+        self.intPosition += 1
+
+    def decode(self):
+        '''Decode and return the next JSON value, reading more text when the value runs past the buffer'''
+        self.peek()
+        while True:
+            try:
+                value, intEnd = decoderJSON.raw_decode(self.strBuffer, self.intPosition)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            #A number at the very end of the buffer may continue in the next chunk
+            if intEnd == len(self.strBuffer) and not self.blnEndOfFile and self._fill():
+                continue
+            self.intPosition = intEnd
+            if self.intPosition > intChunkSize:
+                self.strBuffer = self.strBuffer[self.intPosition:]
+                self.intPosition = 0
+            return value
+
+
+def _iterGeoJSONFeatures(fileJSON):
+    #Walk the members of the top-level object. Only its own "features" member is streamed, one feature at a time, so
+    #   a "features" key inside another member is never mistaken for it. Other members are decoded whole.
+    objBuffer = _JSONBufferClass(fileJSON)
+    if not objBuffer.peek():
+        return
+    objBuffer.take("{")
+    dictMembers = {}
+    while objBuffer.peek() != "}":
+        strKey = objBuffer.decode()
+        objBuffer.take(":")
+        if strKey == "features":
+            objBuffer.take("[")
+            while objBuffer.peek() != "]":
+                yield objBuffer.decode()
+                if objBuffer.peek() == ",":
+                    objBuffer.take(",")
+            return
+        dictMembers[strKey] = objBuffer.decode()
+        if objBuffer.peek() == ",":
+            objBuffer.take(",")
+    objBuffer.take("}")
+    #A top-level Feature is a single-feature file or the first record of newline-delimited GeoJSON. Any further
+    #   records follow it.
+    if dictMembers.get("type") != "Feature":
+        return
+    yield dictMembers
+    while objBuffer.peek():
+        yield objBuffer.decode()
+
+
+def readGeoJSONFeatures(strPath, strOIDField="OBJECTID"):
+    '''Yield (OBJECTID, rings) from a GeoJSON FeatureCollection, a single Feature, or a newline-delimited GeoJSON
+    file, told apart by the type of the first top-level object'''
+    with open(strPath) as fileJSON:
+        for intPosition, dictFeature in enumerate(_iterGeoJSONFeatures(fileJSON), 1):
+            if dictFeature.get("geometry") is None:
+                continue
+            yield (featureOID(dictFeature, strOIDField, intPosition), AdjacencyEngineClass.ringsFromGeometry(dictFeature))
+
+
+def ringsFromWKB(bytesWKB):
+    '''Parse a WKB or EWKB Polygon/MultiPolygon into a list of rings of (x, y) tuples, dropping Z and M'''
+    lsRings = []
+    _readWKBGeometry(memoryview(bytesWKB), 0, lsRings)
+    return lsRings
+
+
+def _readWKBGeometry(viewWKB, intOffset, lsRings):
+    strByteOrder = "<" if viewWKB[intOffset] == 1 else ">"
+    intType = struct.unpack_from(strByteOrder + "I", viewWKB, intOffset + 1)[0]
+    intOffset += 5
+    #EWKB flags Z, M and an SRID in the high bits. ISO WKB adds 1000/2000/3000 to the type instead.
+    intDimensions = 2
+    if intType & 0x80000000:
+        intDimensions += 1
+    if intType & 0x40000000:
+        intDimensions += 1
+    if intType & 0x20000000:
+        intOffset += 4
+    intType &= 0x0FFFFFFF
+    if intType >= 1000:
+        intDimensions += {1: 1, 2: 1, 3: 2}[intType // 1000]
+        intType %= 1000
+    if intType == 3:
+        intRings = struct.unpack_from(strByteOrder + "I", viewWKB, intOffset)[0]
+        intOffset += 4
+        strPoint = strByteOrder + "d" * intDimensions
+        intPointSize = 8 * intDimensions
+        for intRing in range(intRings):
+            intPoints = struct.unpack_from(strByteOrder + "I", viewWKB, intOffset)[0]
+            intOffset += 4
+            lsRing = []
+            for intPoint in range(intPoints):
+                tupValues = struct.unpack_from(strPoint, viewWKB, intOffset)
+                lsRing.append((tupValues[0], tupValues[1]))
+                intOffset += intPointSize
+            lsRings.append(lsRing)
+        return intOffset
+    if intType == 6:
+        intPolygons = struct.unpack_from(strByteOrder + "I", viewWKB, intOffset)[0]
+        intOffset += 4
+        for intPolygon in range(intPolygons):
+            intOffset = _readWKBGeometry(viewWKB, intOffset, lsRings)
+        return intOffset
+    raise ValueError("Unsupported WKB geometry type: " + str(intType))
+
+
+def readWKBFeatures(iterRecords):
+    '''Yield (OBJECTID, rings) from an iterable of (OBJECTID, WKB bytes), such as a database cursor'''
+    for intOID, bytesWKB in iterRecords:
+        if bytesWKB is None:
+            continue
+        yield (intOID, ringsFromWKB(bytesWKB))
+
+
+def ringsFromGeoPackageBlob(bytesBlob):
+    '''Parse a GeoPackage geometry blob: a "GP" header with an optional envelope, followed by standard WKB'''
+    viewBlob = memoryview(bytesBlob)
+    if bytes(viewBlob[0:2]) != b"GP":
+        raise ValueError("Not a GeoPackage geometry blob")
+    intFlags = viewBlob[3]
+    intEnvelopeSize = {0: 0, 1: 32, 2: 48, 3: 48, 4: 64}[(intFlags >> 1) & 0x07]
+    return ringsFromWKB(viewBlob[8 + intEnvelopeSize:])
+
+
+def readGeoPackageFeatures(strPath, strTable, strOIDField="fid", strGeometryField="geom"):
+    '''Yield (OBJECTID, rings) from a GeoPackage feature table, one row at a time'''
+    connection = sqlite3.connect(strPath)
+    try:
+        cursor = connection.execute('SELECT "' + strOIDField + '", "' + strGeometryField + '" FROM "' + strTable +
+                                    '" ORDER BY "' + strOIDField + '"')
+        for intOID, bytesBlob in cursor:
+            if bytesBlob is None:
+                continue
+            yield (intOID, ringsFromGeoPackageBlob(bytesBlob))
+    finally:
+        connection.close()
+
+
+def readShapefileFeatures(strPath):
+    '''Yield (FID, rings) from the polygon records of a .shp file. FIDs start at 0, as they do in arcpy.'''
+    with open(strPath, "rb") as fileShape:
+        bytesHeader = fileShape.read(100)
+        if struct.unpack(">i", bytesHeader[0:4])[0] != 9994:
+            raise ValueError(strPath + " is not a shapefile")
+        while True:
+            bytesRecordHeader = fileShape.read(8)
+            if len(bytesRecordHeader) < 8:
+                return
+            intRecordNumber, intContentWords = struct.unpack(">ii", bytesRecordHeader)
+            bytesContent = fileShape.read(2 * intContentWords)
+            intShapeType = struct.unpack("<i", bytesContent[0:4])[0]
+            if intShapeType == 0:
+                continue
+            if intShapeType not in (5, 15, 25):
+                raise ValueError("Shape type " + str(intShapeType) + " is not a polygon")
+            #Shape type, bounding box, part and point counts. Z and M values follow the points and are skipped.
+            intParts, intPoints = struct.unpack_from("<ii", bytesContent, 36)
+            lsPartStarts = list(struct.unpack_from("<" + "i" * intParts, bytesContent, 44)) + [intPoints]
+            intPointsStart = 44 + 4 * intParts
+            tupCoordinates = struct.unpack_from("<" + "d" * (2 * intPoints), bytesContent, intPointsStart)
+            lsRings = []
+            for intPart in range(intParts):
+                lsRings.append([(tupCoordinates[2 * intPoint], tupCoordinates[2 * intPoint + 1])
+                                for intPoint in range(lsPartStarts[intPart], lsPartStarts[intPart + 1])])
+            yield (intRecordNumber - 1, lsRings)
+
+
+def readFeatures(strPath, **kwargs):
+    '''Pick a reader from the file extension'''
+    strLowerPath = strPath.lower()
+    if strLowerPath.endswith(".shp"):
+        return readShapefileFeatures(strPath)
+    if strLowerPath.endswith(".gpkg"):
+        return readGeoPackageFeatures(strPath, **kwargs)
+    return readGeoJSONFeatures(strPath, **kwargs)
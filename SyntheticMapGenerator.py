@@ -0,0 +1,190 @@
+###################################
+# Script:  SyntheticMapGenerator.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Generates synthetic polygon maps for benchmarking, with a known structure and any number of features. Each
+#           generator yields (OBJECTID, rings) row by row without storing the map, so a million-feature map costs no
+#           more memory to generate than a thousand-feature one. Random choices come from a hash of the grid position
+#           and seed, not from a shared random stream, so two cells always agree on the vertices they share.
+#               square   - a square grid, every shared edge identical on both sides
+#               hex      - a hexagonal grid, up to six neighbors per feature
+#               voronoi  - Voronoi cells of jittered sites. Shared vertices are computed separately in each cell, so
+#                          they match only to floating point precision.
+#               county   - a jittered grid with wiggly, densified boundaries and some cells merged with their east
+#                          neighbor, giving irregular shapes and varied degrees
+# Inputs:  Approximate feature count and a seed
+# Outputs:  Generators of (OBJECTID, list of rings of (x, y) tuples)
+# Modifications:
+###################################
+import math
+
+fltRoot3 = math.sqrt(3.0)
+
+
+def _unitHash(intA, intB, intC, intSeed):
+    #Deterministic value in [0, 1) for a grid position, so neighboring cells can recompute each other's choices
+    intValue = (intA * 73856093) ^ (intB * 19349663) ^ (intC * 83492791) ^ (intSeed * 2654435761)
+    intValue = (intValue * 0x9E3779B1) & 0xFFFFFFFF
+    intValue ^= intValue >> 15
+    intValue = (intValue * 0x85EBCA77) & 0xFFFFFFFF
+    intValue ^= intValue >> 13
+    return intValue / 4294967296.0
+
+
+def _gridShape(intFeatures):
+    intColumns = max(1, int(math.ceil(math.sqrt(intFeatures))))
+    intRows = max(1, int(math.ceil(intFeatures / float(intColumns))))
+    return intColumns, intRows
+
+
+def squareGridMap(intFeatures, intSeed=0):
+    '''Yield a square grid of intFeatures unit cells, filled row by row'''
+    intColumns, intRows = _gridShape(intFeatures)
+    intOID = 0
+    for intRow in range(intRows):
+        for intColumn in range(intColumns):
+            if intOID == intFeatures:
+                return
+            intOID += 1
+            yield (intOID, [[(intColumn, intRow), (intColumn + 1, intRow), (intColumn + 1, intRow + 1),
+                             (intColumn, intRow + 1), (intColumn, intRow)]])
+
+
+def hexGridMap(intFeatures, intSeed=0):
+    '''Yield a pointy-top hexagonal grid. Odd rows shift half a cell east.'''
+    intColumns, intRows = _gridShape(intFeatures)
+    intOID = 0
+    for intRow in range(intRows):
+        for intColumn in range(intColumns):
+            if intOID == intFeatures:
+                return
+            intOID += 1
+            #x is kept as an exact count of half cell widths, so cells sharing a vertex compute the same float
+            fltHalfUnits = 2 * intColumn + (intRow & 1)
+            fltY = 1.5 * intRow
+            lsRing = [(fltRoot3 * (fltHalfUnits + 1) / 2, fltY - 0.5), (fltRoot3 * (fltHalfUnits + 1) / 2, fltY + 0.5),
+                      (fltRoot3 * fltHalfUnits / 2, fltY + 1.0), (fltRoot3 * (fltHalfUnits - 1) / 2, fltY + 0.5),
+                      (fltRoot3 * (fltHalfUnits - 1) / 2, fltY - 0.5), (fltRoot3 * fltHalfUnits / 2, fltY - 1.0)]
+            lsRing.append(lsRing[0])
+            yield (intOID, [lsRing])
+
+
+def _voronoiSite(intColumn, intRow, intSeed):
+    return (intColumn + 0.5 + 0.8 * (_unitHash(intColumn, intRow, 1, intSeed) - 0.5),
+            intRow + 0.5 + 0.8 * (_unitHash(intColumn, intRow, 2, intSeed) - 0.5))
+
+
+def _clipHalfPlane(lsPolygon, tupSite, tupOther):
+    #Keep the part of the polygon closer to tupSite than to tupOther (Sutherland-Hodgman against the bisector)
+    fltNX = tupOther[0] - tupSite[0]
+    fltNY = tupOther[1] - tupSite[1]
+    fltLimit = (fltNX * (tupOther[0] + tupSite[0]) + fltNY * (tupOther[1] + tupSite[1])) / 2.0
+    lsClipped = []
+    intPoints = len(lsPolygon)
+    for intIndex in range(intPoints):
+        tupCurrent = lsPolygon[intIndex]
+        tupNext = lsPolygon[(intIndex + 1) % intPoints]
+        fltCurrent = fltNX * tupCurrent[0] + fltNY * tupCurrent[1] - fltLimit
+        fltNext = fltNX * tupNext[0] + fltNY * tupNext[1] - fltLimit
+        if fltCurrent <= 0:
+            lsClipped.append(tupCurrent)
+        if (fltCurrent < 0 < fltNext) or (fltNext < 0 < fltCurrent):
+            fltT = fltCurrent / (fltCurrent - fltNext)
+            lsClipped.append((tupCurrent[0] + fltT * (tupNext[0] - tupCurrent[0]),
+                              tupCurrent[1] + fltT * (tupNext[1] - tupCurrent[1])))
+    return lsClipped
+
+
+def voronoiMap(intFeatures, intSeed=0):
+    '''Yield the Voronoi cells of one jittered site per grid cell, clipped to the grid extent'''
+    intColumns, intRows = _gridShape(intFeatures)
+    intOID = 0
+    for intRow in range(intRows):
+        for intColumn in range(intColumns):
+            if intOID == intFeatures:
+                return
+            intOID += 1
+            tupSite = _voronoiSite(intColumn, intRow, intSeed)
+            #With jitter under half a cell, every Voronoi neighbor lies within two cells of the site
+            lsPolygon = [(max(0, intColumn - 2), max(0, intRow - 2)), (min(intColumns, intColumn + 3), max(0, intRow - 2)),
+                         (min(intColumns, intColumn + 3), min(intRows, intRow + 3)), (max(0, intColumn - 2), min(intRows, intRow + 3))]
+            for intOtherRow in range(max(0, intRow - 2), min(intRows, intRow + 3)):
+                for intOtherColumn in range(max(0, intColumn - 2), min(intColumns, intColumn + 3)):
+                    if (intOtherColumn, intOtherRow) == (intColumn, intRow):
+                        continue
+                    #Sites past the last partial row were never generated
+                    if intOtherRow * intColumns + intOtherColumn >= intFeatures:
+                        continue
+                    lsPolygon = _clipHalfPlane(lsPolygon, tupSite, _voronoiSite(intOtherColumn, intOtherRow, intSeed))
+            yield (intOID, [lsPolygon + [lsPolygon[0]]])
+
+
+def _countyVertex(intColumn, intRow, intColumns, intRows, intSeed):
+    #Interior lattice vertices are jittered. Vertices on the map edge stay on it so the outline is a rectangle.
+    fltX = float(intColumn)
+    fltY = float(intRow)
+    if 0 < intColumn < intColumns:
+        fltX += 0.6 * (_unitHash(intColumn, intRow, 3, intSeed) - 0.5)
+    if 0 < intRow < intRows:
+        fltY += 0.6 * (_unitHash(intColumn, intRow, 4, intSeed) - 0.5)
+    return (fltX, fltY)
+
+
+def _countyEdge(tupStart, tupEnd, intKeyA, intKeyB, intKeyC, intSeed):
+    #Up to three extra vertices bend a lattice edge. The same key gives the same bend from either side.
+    intExtra = int(_unitHash(intKeyA, intKeyB, intKeyC, intSeed) * 4)
+    lsPoints = []
+    for intStep in range(1, intExtra + 1):
+        fltT = intStep / float(intExtra + 1)
+        fltOffset = 0.15 * (_unitHash(intKeyA, intKeyB, intKeyC * 8 + intStep, intSeed) - 0.5)
+        lsPoints.append((tupStart[0] + fltT * (tupEnd[0] - tupStart[0]) - fltOffset * (tupEnd[1] - tupStart[1]),
+                         tupStart[1] + fltT * (tupEnd[1] - tupStart[1]) + fltOffset * (tupEnd[0] - tupStart[0])))
+    return lsPoints
+
+
+def _countyPath(lsLattice, intColumns, intRows, intSeed):
+    #Walk lattice points, densifying each step. Horizontal edges key on 5, vertical on 6, so both sides agree.
+    lsPath = []
+    for intIndex in range(len(lsLattice) - 1):
+        (intColumnA, intRowA), (intColumnB, intRowB) = lsLattice[intIndex], lsLattice[intIndex + 1]
+        tupStart = _countyVertex(intColumnA, intRowA, intColumns, intRows, intSeed)
+        tupEnd = _countyVertex(intColumnB, intRowB, intColumns, intRows, intSeed)
+        lsPath.append(tupStart)
+        blnBoundary = (intRowA == intRowB and intRowA in (0, intRows)) or (intColumnA == intColumnB and intColumnA in (0, intColumns))
+        if blnBoundary:
+            continue
+        intKeyC = 5 if intRowA == intRowB else 6
+        tupLow = min((intColumnA, intRowA), (intColumnB, intRowB))
+        lsBend = _countyEdge(_countyVertex(tupLow[0], tupLow[1], intColumns, intRows, intSeed),
+                             _countyVertex(tupLow[0] + (intKeyC == 5), tupLow[1] + (intKeyC == 6), intColumns, intRows, intSeed),
+                             tupLow[0], tupLow[1], intKeyC, intSeed)
+        if (intColumnA, intRowA) != tupLow:
+            lsBend.reverse()
+        lsPath.extend(lsBend)
+    lsPath.append(lsPath[0])
+    return lsPath
+
+
+def countyMap(intFeatures, intSeed=0):
+    '''Yield an irregular, county-like map of roughly intFeatures polygons'''
+    #One feature in five covers two cells, so the lattice needs about 1.2 cells per feature
+    intColumns, intRows = _gridShape(int(intFeatures * 1.25) + 1)
+    intOID = 0
+    for intRow in range(intRows):
+        intColumn = 0
+        while intColumn < intColumns:
+            if intOID == intFeatures:
+                return
+            intOID += 1
+            blnMerge = intColumn + 1 < intColumns and _unitHash(intColumn, intRow, 7, intSeed) < 0.2
+            intEast = intColumn + (2 if blnMerge else 1)
+            #Counterclockwise around the lattice cells. A merged cell keeps the middle lattice vertices, so it shares a
+            #   separate edge with each of the two cells above and below it.
+            lsLattice = [(intColumnStep, intRow) for intColumnStep in range(intColumn, intEast + 1)]
+            lsLattice += [(intColumnStep, intRow + 1) for intColumnStep in range(intEast, intColumn - 1, -1)]
+            lsLattice.append((intColumn, intRow))
+            yield (intOID, [_countyPath(lsLattice, intColumns, intRows, intSeed)])
+            intColumn = intEast
+
+
+dictGenerators = {"square": squareGridMap, "hex": hexGridMap, "voronoi": voronoiMap, "county": countyMap}
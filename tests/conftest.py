@@ -0,0 +1,16 @@
+###################################
+# Script:  conftest.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Puts the repository root on the import path, so the tests import the flat modules the same way the
+#           scripts do. Run the tests from the repository root with: python -m pytest -q tests
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import os
+import sys
+
+strRepositoryRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if strRepositoryRoot not in sys.path:
+    sys.path.insert(0, strRepositoryRoot)
@@ -0,0 +1,107 @@
+###################################
+# Script:  arcpy/__init__.py (test stand-in)
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  The small part of arcpy the scripts use, backed by in-memory tables, so the arcpy backend and the
+#           geoprocessing scripts run on a machine without ArcGIS. Tests put tests/fakearcpy at the front of sys.path,
+#           load a feature class with registerFeatureClass() and set the script parameters in lsParameters.
+# Inputs:  Features as (OBJECTID, Esri JSON geometry) pairs
+# Outputs:  Edited in-memory tables and the messages in lsMessages
+# Modifications:
+###################################
+import json
+import re
+
+from . import da
+
+dictTables = {}
+dictLayers = {}
+lsParameters = []
+lsMessages = []
+
+
+class _Env(object):
+    overwriteOutput = False
+    workspace = None
+
+
+env = _Env()
+
+
+class _Field(object):
+    def __init__(self, strName, strType):
+        self.name = strName
+        self.type = strType
+
+
+class _Describe(object):
+    def __init__(self, strOIDField):
+        self.OIDFieldName = strOIDField
+
+
+class Extent(object):
+    def __init__(self, XMin, YMin, XMax, YMax):
+        self.XMin, self.YMin, self.XMax, self.YMax = XMin, YMin, XMax, YMax
+
+
+def registerFeatureClass(strName, iterFeatures, strOIDField="OBJECTID"):
+    '''Create or replace an in-memory feature class from (OBJECTID, Esri JSON geometry) pairs. A None geometry is a
+    null shape.'''
+    dictRows = dict((intOID, {"SHAPE@JSON": None if dictGeometry is None else json.dumps(dictGeometry)})
+                    for intOID, dictGeometry in iterFeatures)
+    dictTables[strName] = {"oid_field": strOIDField, "fields": [_Field(strOIDField, "OID"), _Field("Shape", "Geometry")],
+                           "rows": dictRows}
+    return strName
+
+
+def _table(source):
+    strName = str(source)
+    return dictTables[dictLayers.get(strName, strName)]
+
+
+def _whereOIDs(dictTable, strWhereClause):
+    #Only the "<OID field> IN (...)" clauses the scripts build are understood
+    if not strWhereClause:
+        return None
+    objMatch = re.match(r"\s*(\w+)\s+IN\s*\(([^)]*)\)\s*$", strWhereClause, re.IGNORECASE)
+    if objMatch is None or objMatch.group(1).upper() != dictTable["oid_field"].upper():
+        raise ValueError("Unsupported where clause: " + strWhereClause)
+    return set(int(strOID) for strOID in objMatch.group(2).split(",") if strOID.strip())
+
+
+def GetParameter(intIndex):
+    return lsParameters[intIndex] if intIndex < len(lsParameters) else None
+
+
+def GetParameterAsText(intIndex):
+    value = GetParameter(intIndex)
+    return "" if value is None else str(value)
+
+
+def AddMessage(strMessage):
+    lsMessages.append(strMessage)
+
+
+AddWarning = AddMessage
+
+
+def Describe(source):
+    return _Describe(_table(source)["oid_field"])
+
+
+def ListFields(source):
+    return list(_table(source)["fields"])
+
+
+def GetCount_management(source):
+    return [str(len(_table(source)["rows"]))]
+
+
+def AddField_management(in_table, field_name, field_type, **kwargs):
+    _table(in_table)["fields"].append(_Field(field_name, field_type))
+
+
+def MakeFeatureLayer_management(in_features, out_layer, where_clause=None, workspace=None, field_info=None):
+    _table(in_features)
+    dictLayers[out_layer] = dictLayers.get(str(in_features), str(in_features))
+    return out_layer
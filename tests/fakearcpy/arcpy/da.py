@@ -0,0 +1,66 @@
+###################################
+# Script:  arcpy/da.py (test stand-in)
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  SearchCursor and UpdateCursor over the in-memory tables of the stand-in arcpy. Rows come back in OBJECTID
+#           order. Fields may be "OID@", "SHAPE@JSON" or any added field. A where clause may list OBJECTIDs, and an
+#           Extent spatial filter keeps the features whose envelope touches it.
+# Inputs:  Table or layer name, field names, optional where clause and spatial filter
+# Outputs:  Rows as lists
+# Modifications:
+###################################
+import json
+
+
+def _envelope(dictGeometry):
+    lsPoints = [tupPoint for lsRing in dictGeometry.get("rings", []) for tupPoint in lsRing]
+    return (min(tupPoint[0] for tupPoint in lsPoints), min(tupPoint[1] for tupPoint in lsPoints),
+            max(tupPoint[0] for tupPoint in lsPoints), max(tupPoint[1] for tupPoint in lsPoints))
+
+
+class _Cursor(object):
+    def __init__(self, in_table, field_names, where_clause=None, spatial_filter=None, spatial_relationship=None,
+                 sql_clause=None):
+        import arcpy
+        self.dictTable = arcpy._table(in_table)
+        self.lsFields = [field_names] if isinstance(field_names, str) else list(field_names)
+        setOIDs = arcpy._whereOIDs(self.dictTable, where_clause)
+        self.lsOIDs = [intOID for intOID in sorted(self.dictTable["rows"]) if setOIDs is None or intOID in setOIDs]
+        if spatial_filter is not None:
+            self.lsOIDs = [intOID for intOID in self.lsOIDs if self._touches(intOID, spatial_filter)]
+        self.intCurrent = None
+
+    def _touches(self, intOID, extent):
+        #A null shape has no envelope and never matches a spatial filter
+        if self.dictTable["rows"][intOID]["SHAPE@JSON"] is None:
+            return False
+        fltXMin, fltYMin, fltXMax, fltYMax = _envelope(json.loads(self.dictTable["rows"][intOID]["SHAPE@JSON"]))
+        return fltXMin <= extent.XMax and fltXMax >= extent.XMin and fltYMin <= extent.YMax and fltYMax >= extent.YMin
+
+    def _value(self, intOID, strField):
+        if strField in ("OID@", self.dictTable["oid_field"]):
+            return intOID
+        return self.dictTable["rows"][intOID].get(strField)
+
+    def __iter__(self):
+        for intOID in self.lsOIDs:
+            self.intCurrent = intOID
+            yield [self._value(intOID, strField) for strField in self.lsFields]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.intCurrent = None
+
+
+class SearchCursor(_Cursor):
+    pass
+
+
+class UpdateCursor(_Cursor):
+    def updateRow(self, row):
+        dictRow = self.dictTable["rows"][self.intCurrent]
+        for strField, value in zip(self.lsFields, row):
+            if strField not in ("OID@", "SHAPE@JSON", self.dictTable["oid_field"]):
+                dictRow[strField] = value
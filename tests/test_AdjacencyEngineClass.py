@@ -0,0 +1,54 @@
+###################################
+# Script:  test_AdjacencyEngineClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Known-answer checks of the shared-edge engine on tiny hand-drawn maps: a 2x2 grid, a T-junction and
+#           features that only touch at a corner, with rings given both closed and open.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import pytest
+
+import AdjacencyEngineClass
+
+
+def _square(fltX, fltY, fltWidth=1.0, fltHeight=1.0):
+    return [(fltX, fltY), (fltX + fltWidth, fltY), (fltX + fltWidth, fltY + fltHeight), (fltX, fltY + fltHeight), (fltX, fltY)]
+
+
+def _adjacency(dictRings, blnOpen=False, fltTolerance=0.0):
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass(fltTolerance=fltTolerance)
+    for intOID, lsRing in dictRings.items():
+        objEngine.addFeature(intOID, [lsRing[:-1] if blnOpen else lsRing])
+    return objEngine.buildAdjacency()
+
+
+@pytest.mark.parametrize("blnOpen", [False, True], ids=["closed", "open"])
+@pytest.mark.parametrize("fltTolerance", [0.0, 1e-6])
+def test_two_by_two_grid(blnOpen, fltTolerance):
+    #3 4
+    #1 2   Diagonal cells only meet at the center point
+    dictRings = {1: _square(0, 0), 2: _square(1, 0), 3: _square(0, 1), 4: _square(1, 1)}
+    assert _adjacency(dictRings, blnOpen, fltTolerance) == {1: [2, 3], 2: [1, 4], 3: [1, 4], 4: [2, 3]}
+
+
+@pytest.mark.parametrize("blnOpen", [False, True], ids=["closed", "open"])
+def test_t_junction(blnOpen):
+    #One wide feature over two narrow ones. Its bottom edge has no exact partner and is matched by collinear overlap.
+    dictRings = {1: _square(0, 0, 2.0), 2: _square(0, -1), 3: _square(1, -1)}
+    assert _adjacency(dictRings, blnOpen) == {1: [2, 3], 2: [1, 3], 3: [1, 2]}
+
+
+@pytest.mark.parametrize("blnOpen", [False, True], ids=["closed", "open"])
+def test_corner_contact_is_not_adjacent(blnOpen):
+    dictRings = {1: _square(0, 0), 2: _square(1, 1), 3: _square(2, 0)}
+    assert _adjacency(dictRings, blnOpen) == {1: [], 2: [], 3: []}
+
+
+def test_open_ring_keeps_its_closing_edge():
+    #The shared edge of 1 is its last, from (0, 1) back to (0, 0), which only exists once the ring is closed
+    lsSegments = list(AdjacencyEngineClass.segmentsFromRings([[(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]]))
+    assert ((0.0, 0.0), (0.0, 1.0)) in lsSegments
+    assert len(lsSegments) == 4
+    assert _adjacency({1: [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)], 2: _square(-1, 0)}) == {1: [2], 2: [1]}
@@ -0,0 +1,135 @@
+###################################
+# Script:  test_ArcpyBackend.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Runs the arcpy backend of compute_adjacency() and the geoprocessing scripts against the stand-in arcpy in
+#           tests/fakearcpy, and checks them against the standard library path on the same synthetic map.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import json
+import os
+import sys
+
+import pytest
+
+import AdjacencyEngineClass
+import AdjacentSelectionClass
+import CSRAdjacencyClass
+import ComputeAdjacency
+import SyntheticMapGenerator
+
+strFakeArcpyPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fakearcpy")
+fltTolerance = 1e-7
+
+
+@pytest.fixture
+def arcpy():
+    sys.path.insert(0, strFakeArcpyPath)
+    try:
+        import arcpy
+        arcpy.dictTables.clear()
+        arcpy.dictLayers.clear()
+        del arcpy.lsParameters[:]
+        del arcpy.lsMessages[:]
+        lsFeatures = [(intOID, {"rings": [[list(tupPoint) for tupPoint in lsRing] for lsRing in lsRings]})
+                      for intOID, lsRings in SyntheticMapGenerator.countyMap(400, 2)]
+        arcpy.registerFeatureClass("fc", lsFeatures)
+        yield arcpy
+    finally:
+        sys.path.remove(strFakeArcpyPath)
+        for strModule in ("arcpy", "arcpy.da"):
+            sys.modules.pop(strModule, None)
+
+
+def _localResults(arcpy):
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass(fltTolerance=fltTolerance)
+    objEngine.addFeatures((intOID, json.loads(dictRow["SHAPE@JSON"])) for intOID, dictRow in arcpy.dictTables["fc"]["rows"].items())
+    return objEngine.buildAdjacency()
+
+
+def _fieldValues(arcpy, strFieldName):
+    return dict((intOID, dictRow.get(strFieldName)) for intOID, dictRow in arcpy.dictTables["fc"]["rows"].items())
+
+
+def test_compute_adjacency_arcpy_backend(arcpy):
+    dictAdjacency = _localResults(arcpy)
+    dictResults = ComputeAdjacency.compute_adjacency("fc", "fc", strBackend="arcpy", fltTolerance=fltTolerance, blnColor=True)
+    assert dictResults["backend"] == "arcpy"
+    assert dictResults["adjacency"] == dictAdjacency
+    assert dictResults["rows_written"] == len(dictAdjacency)
+    assert _fieldValues(arcpy, "FirstLevelAdjacency") == dict((intOID, len(lsNeighbors))
+                                                              for intOID, lsNeighbors in dictAdjacency.items())
+    assert _fieldValues(arcpy, "SecondLevelAdjacency") == dictResults["SecondLevelAdjacency"]
+    dictColorIndex = _fieldValues(arcpy, "ColorIndex")
+    assert all(dictColorIndex[intOID] != dictColorIndex[intNeighborOID]
+               for intOID, lsNeighbors in dictAdjacency.items() for intNeighborOID in lsNeighbors)
+
+
+def test_determination_2_and_incremental_update(arcpy, tmp_path):
+    import MaxAdjacencyDetermination2
+    import MaxAdjacencyIncrementalUpdate
+    strGraphFile = str(tmp_path / "graph.csr")
+    dictAdjacency = _localResults(arcpy)
+    arcpy.lsParameters[:] = ["workspace", "scratch", "fc", strGraphFile, str(fltTolerance), str(tmp_path / "run.json"), ""]
+    MaxAdjacencyDetermination2.main()
+    assert _fieldValues(arcpy, "FirstLevelAdjacency") == dict((intOID, len(lsNeighbors))
+                                                              for intOID, lsNeighbors in dictAdjacency.items())
+    assert "Rows written: " + str(len(dictAdjacency)) in arcpy.lsMessages
+    with CSRAdjacencyClass.CSRAdjacencyClass.load(strGraphFile) as objGraph:
+        assert objGraph.fltTolerance == fltTolerance
+        assert objGraph.toAdjacencyDict() == dictAdjacency
+    with open(str(tmp_path / "run.json")) as fileJSON:
+        assert "Adjacency graph" in json.load(fileJSON)["stages"]
+
+    #Delete the feature with the most neighbors and patch the saved graph
+    intDeletedOID = max(dictAdjacency, key=lambda intOID: len(dictAdjacency[intOID]))
+    del arcpy.dictTables["fc"]["rows"][intDeletedOID]
+    strChangesetFile = str(tmp_path / "changes.json")
+    with open(strChangesetFile, "w") as fileJSON:
+        json.dump({"inserted": {}, "updated": {}, "deleted": [intDeletedOID]}, fileJSON)
+    arcpy.lsParameters[:] = ["fc", strGraphFile, strChangesetFile, "", ""]
+    MaxAdjacencyIncrementalUpdate.main()
+    dictExpected = _localResults(arcpy)
+    with CSRAdjacencyClass.CSRAdjacencyClass.load(strGraphFile) as objGraph:
+        assert objGraph.toAdjacencyDict() == dictExpected
+    assert all(_fieldValues(arcpy, "FirstLevelAdjacency")[intOID] == len(dictExpected[intOID])
+               for intOID in dictAdjacency[intDeletedOID])
+
+
+def test_null_shapes_stay_in_the_graph(arcpy):
+    dictRows = arcpy.dictTables["fc"]["rows"]
+    dictRows[9001] = {"SHAPE@JSON": None}
+    objEngine = AdjacentSelectionClass.AdjacentSelectionClass.buildAdjacencyEngine("fc")
+    dictAdjacency = objEngine.buildAdjacency()
+    assert dictAdjacency[9001] == []
+    assert len(dictAdjacency) == len(dictRows)
+
+    fnFetchCandidates = AdjacentSelectionClass.AdjacentSelectionClass.candidateFetcher("fc")
+    lsCandidates = list(fnFetchCandidates((-1e9, -1e9, 1e9, 1e9)))
+    assert len(lsCandidates) == len(dictRows) - 1
+
+
+def test_null_shapes_in_compute_and_update(arcpy, tmp_path):
+    dictAdjacency = _localResults(arcpy)
+    dictRows = arcpy.dictTables["fc"]["rows"]
+    dictRows[9001] = {"SHAPE@JSON": None}
+    dictResults = ComputeAdjacency.compute_adjacency("fc", "fc", strBackend="arcpy", fltTolerance=fltTolerance)
+    assert dictResults["adjacency"][9001] == []
+    assert _fieldValues(arcpy, "FirstLevelAdjacency")[9001] == 0
+
+    #Null out the shape of a feature and patch a saved graph, with its geometry read from the feature class
+    import MaxAdjacencyIncrementalUpdate
+    strGraphFile = str(tmp_path / "graph.csr")
+    CSRAdjacencyClass.CSRAdjacencyClass.fromAdjacencyDict(dictResults["adjacency"], fltTolerance).save(strGraphFile)
+    intNulledOID = max(dictAdjacency, key=lambda intOID: len(dictAdjacency[intOID]))
+    dictRows[intNulledOID]["SHAPE@JSON"] = None
+    strChangesetFile = str(tmp_path / "changes.json")
+    with open(strChangesetFile, "w") as fileJSON:
+        json.dump({"inserted": {}, "updated": {str(intNulledOID): None}, "deleted": []}, fileJSON)
+    arcpy.lsParameters[:] = ["fc", strGraphFile, strChangesetFile, "", ""]
+    MaxAdjacencyIncrementalUpdate.main()
+    assert _fieldValues(arcpy, "FirstLevelAdjacency")[intNulledOID] == 0
+    assert all(_fieldValues(arcpy, "FirstLevelAdjacency")[intOID] == len(dictAdjacency[intOID]) - 1
+               for intOID in dictAdjacency[intNulledOID])
@@ -0,0 +1,39 @@
+###################################
+# Script:  test_CSRAdjacencyClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Checks that a saved graph loads back unchanged with its snapping tolerance, and that version 1 files, which
+#           have no tolerance, still load.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import array
+
+import pytest
+
+import CSRAdjacencyClass
+
+dictAdjacency = {3: [7, 9], 7: [3], 9: [3], 12: []}
+
+
+@pytest.mark.parametrize("blnMemoryMap", [True, False])
+def test_tolerance_round_trip(tmp_path, blnMemoryMap):
+    strPath = str(tmp_path / "graph.csr")
+    CSRAdjacencyClass.CSRAdjacencyClass.fromAdjacencyDict(dictAdjacency, 0.25).save(strPath)
+    with CSRAdjacencyClass.CSRAdjacencyClass.load(strPath, blnMemoryMap) as objGraph:
+        assert objGraph.fltTolerance == 0.25
+        assert objGraph.toAdjacencyDict() == dictAdjacency
+
+
+def test_version_1_loads_with_zero_tolerance(tmp_path):
+    strPath = str(tmp_path / "graph.csr")
+    objGraph = CSRAdjacencyClass.CSRAdjacencyClass.fromAdjacencyDict(dictAdjacency)
+    with open(strPath, "wb") as fileHandle:
+        fileHandle.write(CSRAdjacencyClass.structHeaderVersion1.pack(CSRAdjacencyClass.strMagic, 1, 0, len(objGraph.oids),
+                                                                     len(objGraph.neighbors)))
+        for values in (objGraph.oids, objGraph.offsets, objGraph.neighbors):
+            array.array(values.typecode, values).tofile(fileHandle)
+    with CSRAdjacencyClass.CSRAdjacencyClass.load(strPath) as objLoaded:
+        assert objLoaded.fltTolerance == 0.0
+        assert objLoaded.toAdjacencyDict() == dictAdjacency
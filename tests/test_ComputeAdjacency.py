@@ -0,0 +1,77 @@
+###################################
+# Script:  test_ComputeAdjacency.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Runs compute_adjacency() and the command line on small synthetic GeoJSON layers. Checks that fields written
+#           to GeoJSON land on the features the reader numbered, whichever way the layer identifies them.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import json
+
+import pytest
+
+import ComputeAdjacency
+import SyntheticMapGenerator
+
+
+def _writeCollection(strPath, fnFeatureKeys):
+    #fnFeatureKeys(OBJECTID) returns the extra keys of each feature: an id, properties, or nothing
+    lsFeatures = []
+    for intOID, lsRings in SyntheticMapGenerator.squareGridMap(16):
+        dictFeature = {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [[list(tupPoint) for tupPoint in lsRing]
+                                                                                          for lsRing in lsRings]}}
+        dictFeature.update(fnFeatureKeys(intOID))
+        lsFeatures.append(dictFeature)
+    with open(strPath, "w") as fileJSON:
+        json.dump({"type": "FeatureCollection", "features": lsFeatures}, fileJSON)
+
+
+def _readProperties(strPath):
+    with open(strPath) as fileJSON:
+        return [dictFeature["properties"] for dictFeature in json.load(fileJSON)["features"]]
+
+
+@pytest.mark.parametrize("fnFeatureKeys", [lambda intOID: {"properties": {"OBJECTID": intOID}},
+                                           lambda intOID: {"id": str(intOID)},
+                                           lambda intOID: {"id": "c" + str(intOID)},
+                                           lambda intOID: {}],
+                         ids=["property", "string id", "text id", "position"])
+def test_in_place_geojson(tmp_path, fnFeatureKeys):
+    strPath = str(tmp_path / "grid.geojson")
+    _writeCollection(strPath, fnFeatureKeys)
+    dictResults = ComputeAdjacency.compute_adjacency(strPath, strPath)
+    assert dictResults["rows_written"] == 16
+    lsProperties = _readProperties(strPath)
+    #Square grid cells are numbered from 1, row by row, in file order
+    assert [dictProperties["FirstLevelAdjacency"] for dictProperties in lsProperties] == \
+        [dictResults["FirstLevelAdjacency"][intOID] for intOID in range(1, 17)]
+    assert lsProperties[5]["FirstLevelAdjacency"] == 4
+
+
+def test_new_geojson_target(tmp_path):
+    strSource = str(tmp_path / "grid.geojson")
+    strTarget = str(tmp_path / "fields.geojson")
+    _writeCollection(strSource, lambda intOID: {"properties": {"OBJECTID": intOID}})
+    ComputeAdjacency.main([strSource, "--output", strTarget, "--quiet"])
+    dictWritten = dict((dictProperties["OBJECTID"], dictProperties) for dictProperties in _readProperties(strTarget))
+    assert sorted(dictWritten) == list(range(1, 17))
+    assert dictWritten[6]["FirstLevelAdjacency"] == 4
+
+
+def test_unmatched_target_fails(tmp_path):
+    strSource = str(tmp_path / "grid.geojson")
+    strTarget = str(tmp_path / "other.geojson")
+    _writeCollection(strSource, lambda intOID: {"properties": {"OBJECTID": intOID}})
+    _writeCollection(strTarget, lambda intOID: {"properties": {"OBJECTID": intOID + 1000}})
+    with pytest.raises(ValueError):
+        ComputeAdjacency.compute_adjacency(strSource, strTarget)
+    assert "FirstLevelAdjacency" not in _readProperties(strTarget)[0]
+
+
+def test_missing_geopackage_target_fails_up_front(tmp_path):
+    strSource = str(tmp_path / "grid.geojson")
+    _writeCollection(strSource, lambda intOID: {"properties": {"OBJECTID": intOID}})
+    with pytest.raises(ValueError):
+        ComputeAdjacency.createTargetWriter(str(tmp_path / "missing.gpkg"), "local", "grid")
@@ -0,0 +1,161 @@
+###################################
+# Script:  test_FeatureServiceFetcherClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Runs FeatureServiceFetcherClass against a stand-in feature service: an http.server on 127.0.0.1 that answers
+#           returnIdsOnly and "OBJECTID IN (...)" queries in Esri JSON. The stand-in gzips its responses, can cap them
+#           with a transfer limit, and can end kept-alive connections with or without saying so.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import gzip
+import json
+import re
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import AdjacencyEngineClass
+import FeatureServiceFetcherClass
+import SyntheticMapGenerator
+
+strLayerPath = "/arcgis/rest/services/Counties/FeatureServer/0"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        with self.server.lockStats:
+            self.server.dictStats["connections"] += 1
+
+    def log_message(self, strFormat, *args):
+        pass
+
+    def do_POST(self):
+        objServer = self.server
+        dictQuery = dict(urllib.parse.parse_qsl(self.rfile.read(int(self.headers["Content-Length"])).decode("ascii")))
+        with objServer.lockStats:
+            objServer.dictStats["requests"] += 1
+            intResponse = objServer.dictStats["requests"]
+        if self.path != strLayerPath + "/query":
+            dictResponse = {"error": {"code": 400, "message": "Invalid URL", "details": []}}
+        elif dictQuery.get("returnIdsOnly") == "true":
+            dictResponse = {"objectIdFieldName": "OBJECTID", "objectIds": sorted(objServer.dictFeatures, reverse=True)}
+        else:
+            lsOIDs = [int(strOID) for strOID in re.match(r"OBJECTID IN \(([\d,]*)\)$", dictQuery["where"]).group(1).split(",")]
+            lsOIDs = [intOID for intOID in lsOIDs if intOID in objServer.dictFeatures]
+            dictResponse = {"objectIdFieldName": "OBJECTID",
+                            "features": [{"attributes": {"OBJECTID": intOID}, "geometry": objServer.dictFeatures[intOID]}
+                                         for intOID in lsOIDs[:objServer.intMaxRecords]]}
+            if len(lsOIDs) > objServer.intMaxRecords:
+                dictResponse["exceededTransferLimit"] = True
+
+        bytesBody = json.dumps(dictResponse).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            bytesBody = gzip.compress(bytesBody)
+            self.send_header("Content-Encoding", "gzip")
+            with objServer.lockStats:
+                objServer.dictStats["gzip"] += 1
+        if intResponse in objServer.setCloseAfter:
+            self.send_header("Connection", "close")
+        self.send_header("Content-Length", str(len(bytesBody)))
+        self.end_headers()
+        self.wfile.write(bytesBody)
+        #Announced closes, and silent ones like an idle timeout the client only finds out about on its next request
+        if intResponse in objServer.setCloseAfter or intResponse in objServer.setDropAfter:
+            self.close_connection = True
+
+
+@pytest.fixture
+def service():
+    dictFeatures = dict((intOID, {"rings": [[list(tupPoint) for tupPoint in lsRing] for lsRing in lsRings]})
+                        for intOID, lsRings in SyntheticMapGenerator.voronoiMap(300, 4))
+    objServer = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    objServer.daemon_threads = True
+    objServer.lockStats = threading.Lock()
+    objServer.dictStats = {"requests": 0, "connections": 0, "gzip": 0}
+    objServer.dictFeatures = dictFeatures
+    objServer.intMaxRecords = 1000
+    objServer.setCloseAfter = set()
+    objServer.setDropAfter = set()
+    objServer.strLayerURL = "http://127.0.0.1:" + str(objServer.server_address[1]) + strLayerPath
+    thread = threading.Thread(target=objServer.serve_forever, daemon=True)
+    thread.start()
+    yield objServer
+    objServer.shutdown()
+    objServer.server_close()
+
+
+def _expectedRings(service, intOID):
+    return AdjacencyEngineClass.ringsFromGeometry(service.dictFeatures[intOID])
+
+
+def test_transfer_limit_gzip_and_dropped_connections(service):
+    #Batches of 100 against a 70 record limit take two queries each: 1 OBJECTID query plus 3 x 2 feature queries
+    service.intMaxRecords = 70
+    #Response 3 announces a close. Response 5 is followed by a silent drop, found when request 6 is sent.
+    service.setCloseAfter = {3}
+    service.setDropAfter = {5}
+    objFetcher = FeatureServiceFetcherClass.FeatureServiceFetcherClass(service.strLayerURL, intBatchSize=100, intConnections=1)
+    lsFeatures = list(objFetcher.readFeatures())
+
+    assert sorted(intOID for intOID, lsRings in lsFeatures) == sorted(service.dictFeatures)
+    assert all(lsRings == _expectedRings(service, intOID) for intOID, lsRings in lsFeatures)
+    assert objFetcher.strOIDField == "OBJECTID"
+    assert objFetcher.dictStats["requests"] == 7
+    assert objFetcher.dictStats["connections"] == 3
+    assert objFetcher.dictStats["bytes"] > 0
+    #The request sent on the silently dropped connection never got a response, so it is not counted here
+    assert service.dictStats["requests"] == 7
+    assert service.dictStats["gzip"] == 7
+    assert service.dictStats["connections"] == 3
+
+
+def test_connections_are_reused(service):
+    objFetcher = FeatureServiceFetcherClass.FeatureServiceFetcherClass(service.strLayerURL, intBatchSize=20, intConnections=4)
+    lsObjectIDs = objFetcher.fetchObjectIDs()
+    assert lsObjectIDs == sorted(service.dictFeatures)
+    dictFeatures = dict(objFetcher.readFeatures(lsObjectIDs))
+
+    assert sorted(dictFeatures) == lsObjectIDs
+    assert dictFeatures[150] == _expectedRings(service, 150)
+    #15 batches over 4 kept-alive connections, after the OBJECTID query on a connection of its own
+    assert objFetcher.dictStats["requests"] == 16
+    assert objFetcher.dictStats["connections"] == 5
+    assert service.dictStats["connections"] == 5
+
+
+def test_graph_matches_local_engine(service):
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass()
+    objEngine.addFeatures(service.dictFeatures.items())
+    dictExpected = objEngine.buildAdjacency()
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass()
+    objEngine.addFeatures(FeatureServiceFetcherClass.FeatureServiceFetcherClass(service.strLayerURL, intBatchSize=64).readFeatures())
+    assert objEngine.buildAdjacency() == dictExpected
+
+
+def test_closing_early_stops_the_fetch(service):
+    objFetcher = FeatureServiceFetcherClass.FeatureServiceFetcherClass(service.strLayerURL, intBatchSize=5, intConnections=2)
+    iterFeatures = objFetcher.readFeatures()
+    lsFirst = [next(iterFeatures) for intFeature in range(12)]
+    iterFeatures.close()
+
+    assert all(lsRings == _expectedRings(service, intOID) for intOID, lsRings in lsFirst)
+    #The generator waits for the fetch thread, so the counts are final once close() returns
+    intRequests = objFetcher.dictStats["requests"]
+    assert intRequests < 1 + 300 // 5
+    assert service.dictStats["requests"] == intRequests
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("asyncio")]
+
+
+def test_service_error_is_raised(service):
+    objFetcher = FeatureServiceFetcherClass.FeatureServiceFetcherClass(service.strLayerURL + "x")
+    with pytest.raises(RuntimeError, match="Invalid URL"):
+        list(objFetcher.readFeatures())
@@ -0,0 +1,76 @@
+###################################
+# Script:  test_FieldWriterClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Checks the CSV and GeoPackage writers: new files, merging into existing rows, appending new OBJECTIDs,
+#           leaving rows without an OBJECTID alone, and None values that must not overwrite stored ones.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import csv
+import sqlite3
+
+import pytest
+
+import FieldWriterClass
+
+
+def _readCSV(strPath):
+    with open(strPath, newline="") as fileCSV:
+        return list(csv.reader(fileCSV))
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        FieldWriterClass.FieldWriterClass("target")
+
+
+def test_csv_new_file(tmp_path):
+    strPath = str(tmp_path / "fields.csv")
+    objWriter = FieldWriterClass.createFieldWriter(strPath)
+    assert objWriter.ensureFields({"FirstLevelAdjacency": "SHORT", "ColorIndex": "SHORT"}) == ["FirstLevelAdjacency",
+                                                                                             "ColorIndex"]
+    assert objWriter.writeFields({"FirstLevelAdjacency": {2: 3, 1: 1}}) == 2
+    assert _readCSV(strPath) == [["OBJECTID", "ColorIndex", "FirstLevelAdjacency"], ["1", "", "1"], ["2", "", "3"]]
+
+
+def test_csv_merge_appends_new_oids_and_keeps_blank_rows(tmp_path):
+    strPath = str(tmp_path / "fields.csv")
+    with open(strPath, "w", newline="") as fileCSV:
+        csv.writer(fileCSV).writerows([["OBJECTID", "Name", "FirstLevelAdjacency"], ["1", "a", "5"], ["", "orphan", ""],
+                                       ["2", "b", "6"]])
+    objWriter = FieldWriterClass.CSVFieldWriter(strPath)
+    assert objWriter.ensureFields({"FirstLevelAdjacency": "SHORT", "SecondLevelAdjacency": "SHORT"}) == ["SecondLevelAdjacency"]
+    #2 gets nothing, so it is left alone. 7 is new and is appended.
+    intRows = objWriter.writeFields({"FirstLevelAdjacency": {1: 2, 7: 4}, "SecondLevelAdjacency": {1: 1, 7: None}})
+    assert intRows == 2
+    assert objWriter.intSkippedRows == 1
+    assert _readCSV(strPath) == [["OBJECTID", "Name", "FirstLevelAdjacency", "SecondLevelAdjacency"],
+                                 ["1", "a", "2", "1"], ["", "orphan", "", ""], ["2", "b", "6", ""], ["7", "", "4", ""]]
+
+
+def test_geopackage(tmp_path):
+    strPath = str(tmp_path / "layer.gpkg")
+    connection = sqlite3.connect(strPath)
+    with connection:
+        connection.execute('CREATE TABLE "parcels" (fid INTEGER PRIMARY KEY, "SecondLevelAdjacency" SMALLINT)')
+        connection.executemany('INSERT INTO "parcels" VALUES (?, ?)', [(1, 9), (2, 9), (3, 9)])
+    connection.close()
+
+    objWriter = FieldWriterClass.createFieldWriter(strPath, strTable="parcels")
+    assert objWriter.ensureFields({"FirstLevelAdjacency": "SHORT", "SecondLevelAdjacency": "SHORT"}) == ["FirstLevelAdjacency"]
+    #A second call finds the column it just added
+    assert objWriter.ensureFields({"FirstLevelAdjacency": "SHORT"}) == []
+    #None leaves the stored value, and OBJECTID 8 is not in the table
+    intRows = objWriter.writeFields({"FirstLevelAdjacency": {1: 2, 2: 3, 8: 1}, "SecondLevelAdjacency": {1: 1, 2: None}})
+    assert intRows == 2
+
+    connection = sqlite3.connect(strPath)
+    try:
+        lsRows = connection.execute('SELECT fid, "FirstLevelAdjacency", "SecondLevelAdjacency" FROM "parcels" ORDER BY fid').fetchall()
+        lsColumns = [row[1:3] for row in connection.execute('PRAGMA table_info("parcels")')]
+    finally:
+        connection.close()
+    assert lsRows == [(1, 2, 1), (2, 3, 9), (3, None, 9)]
+    assert ("FirstLevelAdjacency", "SMALLINT") in lsColumns
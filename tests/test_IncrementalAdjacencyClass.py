@@ -0,0 +1,129 @@
+###################################
+# Script:  test_IncrementalAdjacencyClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Checks that applying a changeset of inserts, updates and deletes to a saved graph gives the same graph,
+#           FirstLevelAdjacency and SecondLevelAdjacency as recomputing the edited layer, both through
+#           IncrementalAdjacencyClass with an EnvelopeIndexClass and through the ComputeAdjacency command line.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import csv
+import json
+import random
+
+import pytest
+
+import AdjacencyEngineClass
+import ComputeAdjacency
+import CSRAdjacencyClass
+import IncrementalAdjacencyClass
+import SecondaryAdjacencyClass
+import SyntheticMapGenerator
+
+
+def _shrink(lsRings):
+    #Half size about the envelope center. A shrunk Voronoi cell sits inside its old outline and touches nothing.
+    lsX = [tupPoint[0] for tupPoint in lsRings[0]]
+    lsY = [tupPoint[1] for tupPoint in lsRings[0]]
+    fltX = (min(lsX) + max(lsX)) / 2.0
+    fltY = (min(lsY) + max(lsY)) / 2.0
+    return [[(fltX + (tupPoint[0] - fltX) / 2.0, fltY + (tupPoint[1] - fltY) / 2.0) for tupPoint in lsRing] for lsRing in lsRings]
+
+
+def _graph(dictFeatures):
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass()
+    objEngine.addFeatures(dictFeatures.items())
+    return objEngine.buildAdjacency()
+
+
+def _edits(intSeed):
+    #Returns (layer before, changeset, layer after). The changeset inserts features missing from the first layer,
+    #   restores shrunk ones, shrinks others and deletes a few.
+    dictFinal = dict(SyntheticMapGenerator.voronoiMap(600, 8))
+    objRandom = random.Random(intSeed)
+    lsOIDs = sorted(dictFinal)
+    objRandom.shuffle(lsOIDs)
+    lsInserted, lsRestored, lsShrunk, lsDeleted = lsOIDs[:15], lsOIDs[15:30], lsOIDs[30:45], lsOIDs[45:55]
+    dictBefore = dict(dictFinal)
+    for intOID in lsInserted:
+        del dictBefore[intOID]
+    for intOID in lsRestored:
+        dictBefore[intOID] = _shrink(dictFinal[intOID])
+    for intOID in lsShrunk:
+        dictFinal[intOID] = _shrink(dictFinal[intOID])
+    for intOID in lsDeleted:
+        del dictFinal[intOID]
+    dictChangeset = {"inserted": dict((intOID, dictFinal[intOID]) for intOID in lsInserted),
+                     "updated": dict((intOID, dictFinal[intOID]) for intOID in lsRestored + lsShrunk),
+                     "deleted": lsDeleted}
+    return dictBefore, dictChangeset, dictFinal
+
+
+@pytest.mark.parametrize("intSeed", [1, 2, 3])
+def test_changeset_matches_full_recompute(intSeed):
+    dictBefore, dictChangeset, dictFinal = _edits(intSeed)
+    dictAdjacencyBefore = _graph(dictBefore)
+    objIncremental = IncrementalAdjacencyClass.IncrementalAdjacencyClass(
+        dictAdjacencyBefore, IncrementalAdjacencyClass.EnvelopeIndexClass(dictFinal.items()))
+    dictFirstLevel, dictSecondLevel = objIncremental.applyChanges(dictChangeset["inserted"], dictChangeset["updated"],
+                                                                  dictChangeset["deleted"])
+
+    dictExpected = _graph(dictFinal)
+    assert objIncremental.adjacency() == dictExpected
+    dictExpectedSecondLevel = SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictExpected).secondLevelAdjacency()
+    assert dictFirstLevel == dict((intOID, len(dictExpected[intOID])) for intOID in dictFirstLevel)
+    assert dictSecondLevel == dict((intOID, dictExpectedSecondLevel[intOID]) for intOID in dictSecondLevel)
+    #Every row whose value moved is among the rows returned, and deleted features are not
+    dictSecondLevelBefore = SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictAdjacencyBefore).secondLevelAdjacency()
+    for intOID in dictExpected:
+        if len(dictExpected[intOID]) != len(dictAdjacencyBefore.get(intOID, [])):
+            assert intOID in dictFirstLevel
+        if dictExpectedSecondLevel[intOID] != dictSecondLevelBefore.get(intOID):
+            assert intOID in dictSecondLevel
+    assert not set(dictChangeset["deleted"]) & set(dictSecondLevel)
+
+
+def test_envelope_index_returns_touching_features():
+    dictFeatures = {1: [[(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]], 2: [[(5, 5), (6, 5), (6, 6), (5, 6), (5, 5)]]}
+    objIndex = IncrementalAdjacencyClass.EnvelopeIndexClass(dictFeatures.items())
+    assert [intOID for intOID, lsRings in objIndex((0.5, 0.5, 2, 2))] == [1]
+    assert sorted(intOID for intOID, lsRings in objIndex((1, 1, 5, 5))) == [1, 2]
+    assert list(objIndex((2, 2, 3, 3))) == []
+
+
+def _writeGeoJSON(strPath, dictFeatures):
+    with open(strPath, "w") as fileJSON:
+        json.dump({"type": "FeatureCollection", "features": [
+            {"type": "Feature", "properties": {"OBJECTID": intOID},
+             "geometry": {"type": "Polygon", "coordinates": [[list(tupPoint) for tupPoint in lsRing] for lsRing in lsRings]}}
+            for intOID, lsRings in sorted(dictFeatures.items())]}, fileJSON)
+
+
+def test_command_line_changeset(tmp_path):
+    dictBefore, dictChangeset, dictFinal = _edits(4)
+    strSource = str(tmp_path / "layer.geojson")
+    strGraphFile = str(tmp_path / "graph.csr")
+    strTarget = str(tmp_path / "fields.csv")
+    strChangesetFile = str(tmp_path / "changes.json")
+    _writeGeoJSON(strSource, dictBefore)
+    ComputeAdjacency.main([strSource, "--output", strTarget, "--graph", strGraphFile, "--tolerance", "1e-9", "--quiet"])
+
+    #The edited layer replaces the file. Updated geometries are left null, to be read from it.
+    _writeGeoJSON(strSource, dictFinal)
+    dictChangeset["updated"] = dict.fromkeys(dictChangeset["updated"])
+    with open(strChangesetFile, "w") as fileJSON:
+        json.dump(dictChangeset, fileJSON)
+    ComputeAdjacency.main([strSource, "--output", strTarget, "--graph", strGraphFile, "--changes", strChangesetFile, "--quiet"])
+
+    dictExpected = _graph(dictFinal)
+    with CSRAdjacencyClass.CSRAdjacencyClass.load(strGraphFile) as objGraph:
+        assert objGraph.fltTolerance == 1e-9
+        assert objGraph.toAdjacencyDict() == dictExpected
+    dictExpectedSecondLevel = SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictExpected).secondLevelAdjacency()
+    with open(strTarget, newline="") as fileCSV:
+        dictRows = dict((int(dictRow["OBJECTID"]), dictRow) for dictRow in csv.DictReader(fileCSV))
+    for intOID, lsNeighbors in dictExpected.items():
+        assert int(dictRows[intOID]["FirstLevelAdjacency"]) == len(lsNeighbors)
+        assert int(dictRows[intOID]["SecondLevelAdjacency"]) == dictExpectedSecondLevel[intOID]
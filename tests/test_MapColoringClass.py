@@ -0,0 +1,54 @@
+###################################
+# Script:  test_MapColoringClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Checks that every coloring strategy, after the Kempe chain repair, colors the synthetic maps properly with
+#           at most four colors.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import functools
+
+import pytest
+
+import AdjacencyEngineClass
+import MapColoringBenchmark
+import MapColoringClass
+import SyntheticMapGenerator
+
+
+@functools.lru_cache(maxsize=None)
+def _mapAdjacency(strMap, intFeatures, intSeed):
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass()
+    objEngine.addFeatures(SyntheticMapGenerator.dictGenerators[strMap](intFeatures, intSeed))
+    return objEngine.buildAdjacency()
+
+
+def _checkFourColors(dictAdjacency, strStrategy):
+    dictColorIndex = MapColoringClass.MapColoringClass(dictAdjacency).colorMap(strStrategy)
+    assert MapColoringClass.MapColoringClass.isProperColoring(dictAdjacency, dictColorIndex)
+    assert MapColoringClass.MapColoringClass.shortfall(dictColorIndex) == []
+    assert MapColoringClass.MapColoringClass.colorCount(dictColorIndex) <= 4
+
+
+@pytest.mark.parametrize("strStrategy", MapColoringClass.lsStrategies)
+@pytest.mark.parametrize("intSeed", [0, 1, 2])
+def test_triangulated_grid(strStrategy, intSeed):
+    #Greedy and DSATUR leave several vertices at a fifth color on these grids before the repair
+    _checkFourColors(MapColoringBenchmark.triangulatedGridAdjacency(200, intSeed), strStrategy)
+
+
+@pytest.mark.parametrize("strStrategy", MapColoringClass.lsStrategies)
+def test_voronoi_map(strStrategy):
+    #Smallest-last alone leaves one degree-6 cell at a fifth color on this map
+    _checkFourColors(_mapAdjacency("voronoi", 20000, 0), strStrategy)
+
+
+@pytest.mark.parametrize("strMap", ["square", "hex", "county"])
+def test_other_maps(strMap):
+    _checkFourColors(_mapAdjacency(strMap, 5000, 1), "smallestlast")
+
+
+def test_shortfall_lists_vertices_above_the_target():
+    assert MapColoringClass.MapColoringClass.shortfall({1: 0, 2: 4, 3: 5, 4: 3}) == [2, 3]
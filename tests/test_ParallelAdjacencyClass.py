@@ -0,0 +1,35 @@
+###################################
+# Script:  test_ParallelAdjacencyClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Checks that the tiled, multi-process graph is identical to the serial AdjacencyEngineClass graph, in both
+#           contents and key order, on shuffled synthetic maps.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import random
+
+import pytest
+
+import AdjacencyEngineClass
+import ParallelAdjacencyClass
+import SyntheticMapGenerator
+
+
+@pytest.mark.parametrize("strMap, fltTolerance", [("voronoi", 0.0), ("county", 0.0), ("county", 1e-7)])
+def test_parallel_matches_serial(strMap, fltTolerance):
+    lsFeatures = list(SyntheticMapGenerator.dictGenerators[strMap](1500, 3))
+    random.Random(11).shuffle(lsFeatures)
+
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass(fltTolerance=fltTolerance)
+    objEngine.addFeatures(lsFeatures)
+    dictSerial = objEngine.buildAdjacency()
+    objParallel = ParallelAdjacencyClass.ParallelAdjacencyClass(intWorkers=3, fltTolerance=fltTolerance)
+    #More than one tile, so the work really goes through the process pool
+    assert len(objParallel.tileFeatures(lsFeatures)) > 1
+    dictParallel = objParallel.buildAdjacency(lsFeatures)
+
+    assert list(dictParallel) == list(dictSerial)
+    assert dictParallel == dictSerial
+    assert sum(len(lsNeighbors) for lsNeighbors in dictSerial.values()) > 0
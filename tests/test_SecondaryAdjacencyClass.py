@@ -0,0 +1,59 @@
+###################################
+# Script:  test_SecondaryAdjacencyClass.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Hand-computed secondary adjacency on small maps, and agreement between the whole-layer and per-feature
+#           methods.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import AdjacencyEngineClass
+import SecondaryAdjacencyClass
+import SyntheticMapGenerator
+
+
+def _square(fltX, fltY, fltWidth=1.0):
+    return [[(fltX, fltY), (fltX + fltWidth, fltY), (fltX + fltWidth, fltY + 1.0), (fltX, fltY + 1.0), (fltX, fltY)]]
+
+
+def _graph(dictRings):
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass()
+    objEngine.addFeatures(dictRings.items())
+    return objEngine.buildAdjacency()
+
+
+def _checkBothMethods(dictAdjacency, dictExpected):
+    objSecondary = SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictAdjacency)
+    assert objSecondary.secondLevelAdjacency() == dictExpected
+    assert objSecondary.secondLevelAdjacencyFor(dictAdjacency) == dictExpected
+
+
+def test_three_by_three_grid():
+    #7 8 9
+    #4 5 6   A grid has no three mutually adjacent cells, so no neighbor shares a neighbor with the feature of focus
+    #1 2 3
+    dictAdjacency = _graph(dict((intRow * 3 + intColumn + 1, _square(intColumn, intRow))
+                                for intRow in range(3) for intColumn in range(3)))
+    assert dictAdjacency[5] == [2, 4, 6, 8]
+    assert [len(dictAdjacency[intOID]) for intOID in range(1, 10)] == [2, 3, 2, 3, 4, 3, 2, 3, 2]
+    _checkBothMethods(dictAdjacency, dict.fromkeys(range(1, 10), 0))
+
+
+def test_t_junctions():
+    #  4 4 4    4 touches 1, 2 and 3 along its bottom edge, through T-junctions at x = 1 and x = 2
+    #  1 2 3    Neighbor 2 of feature 4 is adjacent to 1 and 3, both also neighbors of 4, so 4 scores 2.
+    dictAdjacency = _graph({1: _square(0, 0), 2: _square(1, 0), 3: _square(2, 0), 4: _square(0, 1, 3.0)})
+    assert dictAdjacency == {1: [2, 4], 2: [1, 3, 4], 3: [2, 4], 4: [1, 2, 3]}
+    _checkBothMethods(dictAdjacency, {1: 1, 2: 2, 3: 1, 4: 2})
+
+
+def test_methods_agree_on_every_node():
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass()
+    objEngine.addFeatures(SyntheticMapGenerator.voronoiMap(500, 6))
+    dictAdjacency = objEngine.buildAdjacency()
+    objSecondary = SecondaryAdjacencyClass.SecondaryAdjacencyClass(dictAdjacency)
+    dictSecondLevel = objSecondary.secondLevelAdjacency()
+    assert objSecondary.secondLevelAdjacencyFor(dictAdjacency) == dictSecondLevel
+    #A Voronoi map is a triangulation, so every feature with a neighbor shares at least one more
+    assert min(dictSecondLevel.values()) >= 1
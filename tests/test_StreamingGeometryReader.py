@@ -0,0 +1,84 @@
+###################################
+# Script:  test_StreamingGeometryReader.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Checks the streaming GeoJSON reader: only the top-level "features" array is read, wherever it sits among
+#           the other members, newline-delimited files and single Features are recognized by their type, and features
+#           that cross chunk boundaries come through whole.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import json
+
+import pytest
+
+import StreamingGeometryReader
+
+
+def _feature(intOID, fltX=0.0):
+    return {"type": "Feature", "properties": {"OBJECTID": intOID},
+            "geometry": {"type": "Polygon", "coordinates": [[[fltX, 0.0], [fltX + 1.0, 0.0], [fltX + 1.0, 1.0],
+                                                             [fltX, 1.0], [fltX, 0.0]]]}}
+
+
+def _read(tmp_path, strText):
+    strPath = str(tmp_path / "features.geojson")
+    with open(strPath, "w") as fileJSON:
+        fileJSON.write(strText)
+    return list(StreamingGeometryReader.readGeoJSONFeatures(strPath))
+
+
+def test_nested_features_key_is_not_the_array(tmp_path):
+    strText = ('{"metadata": {"features": [1, 2]}, "type": "FeatureCollection", "features": ' +
+               json.dumps([_feature(1), _feature(2, 1.0)]) + '}')
+    lsFeatures = _read(tmp_path, strText)
+    assert [intOID for intOID, lsRings in lsFeatures] == [1, 2]
+    assert lsFeatures[1][1][0][0] == (1.0, 0.0)
+
+
+def test_features_after_other_members(tmp_path):
+    dictCollection = {"type": "FeatureCollection", "name": "features", "crs": {"properties": {"name": "features"}},
+                      "features": [_feature(5), _feature(6, 1.0)]}
+    assert [intOID for intOID, lsRings in _read(tmp_path, json.dumps(dictCollection))] == [5, 6]
+
+
+def test_newline_delimited(tmp_path):
+    strText = "\n".join(json.dumps(_feature(intOID, intOID)) for intOID in (3, 4, 7)) + "\n"
+    assert [intOID for intOID, lsRings in _read(tmp_path, strText)] == [3, 4, 7]
+
+
+def test_geojson_text_sequence(tmp_path):
+    strText = "".join("\x1e" + json.dumps(_feature(intOID, intOID)) + "\n" for intOID in (1, 2))
+    assert [intOID for intOID, lsRings in _read(tmp_path, strText)] == [1, 2]
+
+
+def test_single_feature(tmp_path):
+    assert [intOID for intOID, lsRings in _read(tmp_path, json.dumps(_feature(9)))] == [9]
+
+
+def test_null_geometry_keeps_positions(tmp_path):
+    dictNull = {"type": "Feature", "properties": {}, "geometry": None}
+    dictPlain = _feature(1)
+    del dictPlain["properties"]["OBJECTID"]
+    dictCollection = {"type": "FeatureCollection", "features": [dictNull, dictPlain]}
+    assert [intOID for intOID, lsRings in _read(tmp_path, json.dumps(dictCollection))] == [2]
+
+
+def test_other_json_is_not_read_as_features(tmp_path):
+    assert _read(tmp_path, '{"type": "Topology", "objects": {"features": [1]}}') == []
+    with pytest.raises(ValueError):
+        _read(tmp_path, '[1, 2]')
+
+
+@pytest.mark.parametrize("intChunkSize", [1, 7, 64])
+def test_small_chunks(tmp_path, monkeypatch, intChunkSize):
+    monkeypatch.setattr(StreamingGeometryReader, "intChunkSize", intChunkSize)
+    lsExpected = [_feature(intOID, intOID * 1.25) for intOID in range(1, 21)]
+    dictCollection = {"metadata": {"features": [1, 2]}, "type": "FeatureCollection", "features": lsExpected}
+    lsFeatures = _read(tmp_path, json.dumps(dictCollection, indent=1))
+    assert [intOID for intOID, lsRings in lsFeatures] == list(range(1, 21))
+    #Numbers split across chunks must be read whole
+    assert [lsRings[0][0] for intOID, lsRings in lsFeatures] == [(intOID * 1.25, 0.0) for intOID in range(1, 21)]
+    strText = "\n".join(json.dumps(dictFeature) for dictFeature in lsExpected)
+    assert len(_read(tmp_path, strText)) == 20
@@ -0,0 +1,35 @@
+###################################
+# Script:  test_SyntheticMapGenerator.py
+# Author:  CJuice
+# Date Created:  10/18/2026
+# Purpose:  Checks the synthetic maps: every ring is closed, OBJECTIDs run from 1, and the adjacency of fixed maps
+#           matches known pair counts.
+# Inputs:  None
+# Outputs:  None
+# Modifications:
+###################################
+import pytest
+
+import AdjacencyEngineClass
+import SyntheticMapGenerator
+
+
+@pytest.mark.parametrize("strMap", sorted(SyntheticMapGenerator.dictGenerators))
+def test_rings_are_closed(strMap):
+    lsFeatures = list(SyntheticMapGenerator.dictGenerators[strMap](400, 2))
+    assert [intOID for intOID, lsRings in lsFeatures] == list(range(1, 401))
+    for intOID, lsRings in lsFeatures:
+        for lsRing in lsRings:
+            assert len(lsRing) >= 4
+            assert lsRing[0] == lsRing[-1]
+
+
+@pytest.mark.parametrize("strMap, intFeatures, intSeed, intPairs", [
+    ("square", 16, 0, 24),
+    ("square", 400, 2, 760),
+    ("county", 400, 2, 820),
+])
+def test_known_pair_counts(strMap, intFeatures, intSeed, intPairs):
+    objEngine = AdjacencyEngineClass.AdjacencyEngineClass()
+    objEngine.addFeatures(SyntheticMapGenerator.dictGenerators[strMap](intFeatures, intSeed))
+    assert len(list(objEngine.adjacentPairs())) == intPairs